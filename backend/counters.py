@@ -0,0 +1,67 @@
+"""
+Write-behind counters: increments are aggregated in memory and flushed periodically
+"""
+import asyncio
+import logging
+from collections import defaultdict
+from typing import Awaitable, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+class CounterBuffer:
+    """Aggregates per-key increments and hands them to flush_fn in one batch.
+
+    At most flush_interval seconds of increments are lost if the process dies;
+    stop() flushes whatever is pending on a clean shutdown.
+    """
+
+    def __init__(self, flush_fn: Callable[[Dict[str, int]], Awaitable[int]], flush_interval: float = 5.0):
+        self.flush_fn = flush_fn
+        self.flush_interval = flush_interval
+        self.pending: Dict[str, int] = defaultdict(int)
+        self._task: Optional[asyncio.Task] = None
+        self._flush_lock = asyncio.Lock()
+
+    def increment(self, key: str, amount: int = 1):
+        self.pending[key] += amount
+
+    async def flush(self) -> int:
+        """Write out pending increments; on failure they are merged back for the next attempt"""
+        async with self._flush_lock:
+            if not self.pending:
+                return 0
+            batch, self.pending = self.pending, defaultdict(int)
+            try:
+                await self.flush_fn(dict(batch))
+            except Exception:
+                for key, amount in batch.items():
+                    self.pending[key] += amount
+                raise
+            return sum(batch.values())
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"Error flushing counters: {str(e)}")
+
+    @property
+    def task(self) -> Optional[asyncio.Task]:
+        """The background task, for health checks"""
+        return self._task
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
@@ -1,23 +1,224 @@
 from motor.motor_asyncio import AsyncIOMotorClient
-from typing import List, Optional, Dict, Any
+from pymongo import ASCENDING, DESCENDING, TEXT, IndexModel, ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+from pymongo import monitoring
+from bson import ObjectId, json_util
+from bson.codec_options import CodecOptions
+from bson.json_util import RELAXED_JSON_OPTIONS
+from bson.raw_bson import RawBSONDocument
+from typing import List, Optional, Dict, Any, Callable, AsyncIterator
+import asyncio
+import base64
 import os
-from datetime import datetime
+import re
+import threading
+import time
+import uuid
+from collections import defaultdict
+from datetime import datetime, timedelta
 import logging
 from pathlib import Path
 from dotenv import load_dotenv
 
+try:
+    # C extension converting BSON bytes straight to JSON text
+    import bsonjs
+except ImportError:
+    bsonjs = None
+
 # Load environment variables
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
 logger = logging.getLogger(__name__)
 
+# Seconds an estimated collection total is reused before asking MongoDB again
+COUNT_CACHE_TTL = float(os.environ.get('COUNT_CACHE_TTL', '30'))
+# Seconds a resource's download URL is served from memory
+DOWNLOAD_INFO_TTL = float(os.environ.get('DOWNLOAD_INFO_TTL', '300'))
+# Seconds an Idempotency-Key is remembered; MongoDB's TTL monitor removes older records
+IDEMPOTENCY_KEY_TTL = int(os.environ.get('IDEMPOTENCY_KEY_TTL', '86400'))
+# Lease on a key being processed; a worker that dies mid-request blocks retries for at most this long
+IDEMPOTENCY_LOCK_SECONDS = float(os.environ.get('IDEMPOTENCY_LOCK_SECONDS', '30'))
+
+# "mongo" (default) or "memory" for a process-local store with no MongoDB server
+STORAGE_BACKEND = os.environ.get('STORAGE_BACKEND', 'mongo').lower()
+
+# MongoClient options read from the environment; unset variables keep the driver defaults
+MONGO_CLIENT_OPTIONS = {
+    'maxPoolSize': ('MONGO_MAX_POOL_SIZE', int),
+    'minPoolSize': ('MONGO_MIN_POOL_SIZE', int),
+    'maxIdleTimeMS': ('MONGO_MAX_IDLE_TIME_MS', int),
+    'waitQueueTimeoutMS': ('MONGO_WAIT_QUEUE_TIMEOUT_MS', int),
+    'serverSelectionTimeoutMS': ('MONGO_SERVER_SELECTION_TIMEOUT_MS', int),
+    'connectTimeoutMS': ('MONGO_CONNECT_TIMEOUT_MS', int),
+    'compressors': ('MONGO_COMPRESSORS', str),
+    'readPreference': ('MONGO_READ_PREFERENCE', str),
+}
+
+def mongo_client_options() -> Dict[str, Any]:
+    """Collect MongoClient keyword arguments from MONGO_* environment variables"""
+    options = {}
+    for option, (env_name, cast) in MONGO_CLIENT_OPTIONS.items():
+        value = os.environ.get(env_name)
+        if value:
+            options[option] = cast(value)
+    return options
+
+class PoolMonitor(monitoring.ConnectionPoolListener):
+    """Connection pool listener tracking checkouts, wait time and connection churn.
+
+    Motor runs pymongo in executor threads and a checkout starts and finishes
+    on the same thread, so the start time is kept in a thread-local.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.checked_out = 0
+        self.max_checked_out = 0
+        self.open_connections = 0
+        self.connections_created = 0
+        self.connections_closed = 0
+        self.checkouts = 0
+        self.checkout_failures = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "checkedOut": self.checked_out,
+                "maxCheckedOut": self.max_checked_out,
+                "openConnections": self.open_connections,
+                "connectionsCreated": self.connections_created,
+                "connectionsClosed": self.connections_closed,
+                "checkouts": self.checkouts,
+                "checkoutFailures": self.checkout_failures,
+                "waitSecondsTotal": round(self.wait_seconds_total, 6),
+                "waitSecondsMax": round(self.wait_seconds_max, 6),
+                "waitSecondsAvg": round(self.wait_seconds_total / self.checkouts, 6) if self.checkouts else 0.0,
+            }
+
+    def _waited(self) -> float:
+        started = getattr(self._local, 'started', None)
+        self._local.started = None
+        return time.perf_counter() - started if started is not None else 0.0
+
+    def connection_check_out_started(self, event):
+        self._local.started = time.perf_counter()
+
+    def connection_checked_out(self, event):
+        waited = self._waited()
+        with self._lock:
+            self.checked_out += 1
+            self.max_checked_out = max(self.max_checked_out, self.checked_out)
+            self.checkouts += 1
+            self.wait_seconds_total += waited
+            self.wait_seconds_max = max(self.wait_seconds_max, waited)
+
+    def connection_check_out_failed(self, event):
+        self._waited()
+        with self._lock:
+            self.checkout_failures += 1
+
+    def connection_checked_in(self, event):
+        with self._lock:
+            self.checked_out -= 1
+
+    def connection_created(self, event):
+        with self._lock:
+            self.open_connections += 1
+            self.connections_created += 1
+
+    def connection_closed(self, event):
+        with self._lock:
+            self.open_connections -= 1
+            self.connections_closed += 1
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        pass
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_ready(self, event):
+        pass
+
+# Callbacks receiving (collection, operation, seconds, succeeded) for every MongoDB command
+command_listeners: List[Callable[[str, str, float, bool], None]] = []
+
+class CommandMonitor(monitoring.CommandListener):
+    """Command listener reporting each command's duration to command_listeners.
+
+    The collection name is only present on the started event, so it is held
+    per (connection, request id) until the command completes.
+    """
+
+    def __init__(self):
+        self._collections: Dict[Any, str] = {}
+
+    def started(self, event):
+        if not command_listeners:
+            return
+        target = event.command.get(event.command_name)
+        self._collections[(event.connection_id, event.request_id)] = target if isinstance(target, str) else ""
+
+    def _finished(self, event, succeeded: bool):
+        collection = self._collections.pop((event.connection_id, event.request_id), None)
+        if collection is None:
+            return
+        seconds = event.duration_micros / 1_000_000
+        for listener in command_listeners:
+            listener(collection, event.command_name, seconds, succeeded)
+
+    def succeeded(self, event):
+        self._finished(event, True)
+
+    def failed(self, event):
+        self._finished(event, False)
+
 class Database:
     def __init__(self):
         mongo_url = os.environ.get('MONGO_URL', 'mongodb://localhost:27017')
         db_name = os.environ.get('DB_NAME', 'test_database')
-        self.client = AsyncIOMotorClient(mongo_url)
+        self.options = mongo_client_options()
+        self.pool_monitor = PoolMonitor()
+        self.command_monitor = CommandMonitor()
+        if STORAGE_BACKEND == 'memory':
+            try:
+                from memory_store import MemoryClient
+            except ImportError:  # imported as backend.database
+                from backend.memory_store import MemoryClient
+            self.client = MemoryClient()
+        elif STORAGE_BACKEND == 'mongo':
+            self.client = AsyncIOMotorClient(
+                mongo_url, event_listeners=[self.pool_monitor, self.command_monitor], **self.options
+            )
+        else:
+            raise ValueError(f"Unknown STORAGE_BACKEND: {STORAGE_BACKEND}")
         self.db = self.client[db_name]
+
+    async def warm_up(self) -> int:
+        """Open minPoolSize connections up front so early requests skip the handshake"""
+        connections = max(self.options.get('minPoolSize', 0), 1)
+        # Concurrent pings force concurrent checkouts, each needing its own connection
+        await asyncio.gather(*(self.client.admin.command('ping') for _ in range(connections)))
+        return self.pool_monitor.stats()["openConnections"]
+
+    def pool_stats(self) -> Dict[str, Any]:
+        """Connection pool counters plus the configured limits"""
+        return {
+            **self.pool_monitor.stats(),
+            "maxPoolSize": self.options.get('maxPoolSize', 100),  # driver default
+            "minPoolSize": self.options.get('minPoolSize', 0),
+        }
         
     async def close_connection(self):
         self.client.close()
@@ -25,11 +226,155 @@ class Database:
 # Database instance
 database = Database()
 
+# Sorting and keyset pagination helpers
+def sort_spec(sort_by: str, sort_order: int) -> List[tuple]:
+    """Sort specification with 'id' as tie-breaker so keyset pages are stable"""
+    if sort_by in ("_id", "id"):
+        return [(sort_by, sort_order)]
+    return [(sort_by, sort_order), ("id", sort_order)]
+
+def encode_cursor(doc: dict, sort_by: str, page: int, total: Optional[int] = None) -> str:
+    """Encode the sort position of a raw document (and the first page's total) as an opaque token"""
+    position = {"k": doc.get(sort_by), "id": doc.get("id"), "p": page}
+    if total is not None:
+        position["t"] = total
+    return base64.urlsafe_b64encode(json_util.dumps(position).encode()).decode()
+
+def decode_cursor(token: str) -> dict:
+    """Decode a token produced by encode_cursor; raises ValueError when malformed"""
+    try:
+        position = json_util.loads(base64.urlsafe_b64decode(token.encode()))
+    except Exception:
+        raise ValueError("Invalid pagination cursor")
+    if not isinstance(position, dict) or not {"k", "id", "p"} <= position.keys():
+        raise ValueError("Invalid pagination cursor")
+    # bool is an int subclass but never a valid page number or total
+    for field in ("p", "t"):
+        value = position.get(field, 0)
+        if not isinstance(value, int) or isinstance(value, bool) or value < 0:
+            raise ValueError("Invalid pagination cursor")
+    return position
+
+def keyset_filter(sort_by: str, sort_order: int, position: dict) -> dict:
+    """Range query selecting documents strictly after the cursor position"""
+    op = "$gt" if sort_order == 1 else "$lt"
+    if sort_by in ("_id", "id"):
+        return {sort_by: {op: position["k"]}}
+    return {"$or": [
+        {sort_by: {op: position["k"]}},
+        {sort_by: position["k"], "id": {op: position["id"]}}
+    ]}
+
+def id_filter(doc_id: str) -> dict:
+    """Match a document by 'id', or also by '_id' when the value is shaped like an ObjectId"""
+    if len(doc_id) == 24 and ObjectId.is_valid(doc_id):  # MongoDB ObjectId length
+        return {"$or": [{"id": doc_id}, {"_id": ObjectId(doc_id)}]}
+    return {"id": doc_id}
+
+# Raw BSON pass-through: documents stay as undecoded bytes until rendered as JSON
+RAW_CODEC_OPTIONS = CodecOptions(document_class=RawBSONDocument)
+
+def raw_documents_json(docs: List[RawBSONDocument]) -> bytes:
+    """Render raw BSON documents as a relaxed Extended JSON array.
+
+    With python-bsonjs installed the conversion happens in C on the BSON bytes;
+    otherwise json_util produces the same output through Python objects.
+    """
+    if bsonjs is not None:
+        parts = [bsonjs.dumps(doc.raw, mode=bsonjs.RELAXED).encode() for doc in docs]
+    else:
+        parts = [json_util.dumps(doc, json_options=RELAXED_JSON_OPTIONS).encode() for doc in docs]
+    return b"[" + b",".join(parts) + b"]"
+
+# Every collection is addressed by its application-level 'id' field
+# Partial so documents written without an application id (legacy rows, raw
+# inserts) do not collide on a missing value
+ID_INDEX = IndexModel([("id", ASCENDING)], unique=True, partialFilterExpression={"id": {"$exists": True}})
+
+# Index options that change what an index enforces or which documents it holds
+INDEX_OPTIONS = ("unique", "sparse", "partialFilterExpression", "expireAfterSeconds")
+
+# Callbacks invoked with the collection name after every write through a CRUD instance
+change_listeners: List[Callable[[str], None]] = []
+
+# Per-collection write counters shared by all workers through VersionSync, as
+# last seen by this worker; ETags are built from VersionSync.stamp()
+collection_versions: Dict[str, int] = defaultdict(int)
+# Marks stamps of this process's writes that are not yet counted in collection_versions
+WORKER_ID = uuid.uuid4().hex[:12]
+# Seconds between reads of the shared counters; another worker's write reaches this one's ETags and caches within it
+VERSION_SYNC_INTERVAL = float(os.environ.get('VERSION_SYNC_INTERVAL', '1'))
+
+def index_matches(declared: dict, existing: dict) -> bool:
+    """Whether an index_information() entry has the keys and options of an IndexModel document"""
+    if "weights" in declared or "textIndexVersion" in existing:
+        # Text indexes are stored with _fts/_ftsx keys; the weights identify them
+        return dict(declared.get("weights") or {}) == dict(existing.get("weights") or {})
+    declared_key = [(field, direction) for field, direction in declared["key"].items()]
+    existing_key = [(field, int(direction) if isinstance(direction, float) else direction)
+                    for field, direction in existing["key"]]
+    if declared_key != existing_key:
+        return False
+    # Missing and false are equivalent for the boolean options
+    return all((declared.get(option) or None) == (existing.get(option) or None) for option in INDEX_OPTIONS)
+
+def text_index(weights: Dict[str, int]) -> IndexModel:
+    """Weighted text index backing CRUDBase.search"""
+    return IndexModel([(field, TEXT) for field in weights], weights=weights, name="text_search")
+
 # Generic CRUD operations
 class CRUDBase:
+    # Indexes declared by each collection, reconciled by ensure_indexes() at startup
+    indexes: List[IndexModel] = [ID_INDEX]
+    # Fields returned by list routes; None returns whole documents
+    summary_fields: Optional[List[str]] = None
+    # Text-indexed fields and their relevance weights; None falls back to a regex scan
+    search_fields: Optional[Dict[str, int]] = None
+
     def __init__(self, collection_name: str):
         self.collection_name = collection_name
         self.collection = database.db[collection_name]
+        # (expires_at, count) for the unfiltered total
+        self._count_cache: Optional[tuple] = None
+
+    def _changed(self):
+        """Invalidate derived state after a write through this CRUD instance"""
+        self._count_cache = None
+        self._notify()
+
+    def _notify(self):
+        """Change the collection's version stamp and tell change listeners"""
+        version_sync.record_write(self.collection_name)
+        for listener in change_listeners:
+            listener(self.collection_name)
+
+    async def ensure_indexes(self) -> Dict[str, List[str]]:
+        """Create missing declared indexes and report undeclared and conflicting ones.
+
+        An existing index whose keys or options differ from its declaration is
+        reported as conflicting rather than rebuilt; dropping it is left to an operator.
+        """
+        existing = await self.collection.index_information()
+        declared = {index.document["name"]: index for index in self.indexes}
+
+        missing = [name for name in declared if name not in existing]
+        extra = [name for name in existing if name != "_id_" and name not in declared]
+        conflicting = [name for name in declared
+                       if name in existing and not index_matches(declared[name].document, existing[name])]
+
+        if missing:
+            await self.collection.create_indexes([declared[name] for name in missing])
+        return {"missing": missing, "extra": extra, "conflicting": conflicting}
+
+    def projection(self, fields: Optional[List[str]] = None, view: str = "summary") -> Optional[dict]:
+        """Build a find() projection from a sparse fieldset or the named view ('summary' or 'full')"""
+        if not fields:
+            fields = self.summary_fields if view == "summary" else None
+        if not fields:
+            return None
+        projection = {field: 1 for field in fields}
+        projection["id"] = 1
+        return projection
 
     async def create(self, data: dict) -> dict:
         """Create a new document"""
@@ -38,56 +383,161 @@ class CRUDBase:
         
         # Ensure we have an 'id' field - use existing or generate UUID
         if 'id' not in data:
-            import uuid
             data['id'] = str(uuid.uuid4())
         
         result = await self.collection.insert_one(data)
+        self._changed()
         data['_id'] = str(result.inserted_id)
         return data
 
-    async def get_by_id(self, doc_id: str) -> Optional[dict]:
-        """Get document by ID"""
-        # Try both 'id' and '_id' fields for compatibility
-        doc = await self.collection.find_one({"id": doc_id})
-        if not doc:
-            # Try with ObjectId if it looks like one
+    async def create_many(self, docs: List[dict]) -> Dict[str, Any]:
+        """Create documents in bulk; an unordered insert keeps going past individual failures"""
+        now = datetime.utcnow()
+        for data in docs:
+            data['createdAt'] = now
+            data['updatedAt'] = now
+            if 'id' not in data:
+                data['id'] = str(uuid.uuid4())
+
+        errors = []
+        if docs:
             try:
-                from bson import ObjectId
-                if len(doc_id) == 24:  # MongoDB ObjectId length
-                    doc = await self.collection.find_one({"_id": ObjectId(doc_id)})
-            except:
-                pass
-        
+                await self.collection.insert_many(docs, ordered=False)
+            except BulkWriteError as e:
+                errors = [
+                    {"index": error["index"], "message": error["errmsg"]}
+                    for error in e.details.get("writeErrors", [])
+                ]
+            self._changed()
+
+        failed = {error["index"] for error in errors}
+        ids = [data['id'] for index, data in enumerate(docs) if index not in failed]
+        return {"inserted": len(ids), "ids": ids, "errors": errors}
+
+    async def get_by_id(self, doc_id: str, projection: Optional[dict] = None) -> Optional[dict]:
+        """Get document by ID"""
+        doc = await self.collection.find_one(id_filter(doc_id), projection)
         if doc:
             doc['id'] = doc.get('id', str(doc['_id']))
             doc['_id'] = str(doc['_id'])
         return doc
 
+    async def iter_documents(self, filter_dict: dict = None, projection: Optional[dict] = None,
+                             batch_size: int = 1000) -> AsyncIterator[dict]:
+        """Stream every matching document from a cursor, batch_size documents per round trip"""
+        cursor = self.collection.find(filter_dict or {}, projection, batch_size=batch_size)
+        async for doc in cursor:
+            yield self._prepare(doc)
+
+    async def get_many(self, ids: List[str], projection: Optional[dict] = None) -> List[dict]:
+        """Get several documents in one query, returned in the order of 'ids'; missing ones are skipped"""
+        ids = list(dict.fromkeys(ids))
+        object_ids = [ObjectId(doc_id) for doc_id in ids if len(doc_id) == 24 and ObjectId.is_valid(doc_id)]
+        filter_dict = {"id": {"$in": ids}}
+        if object_ids:
+            filter_dict = {"$or": [filter_dict, {"_id": {"$in": object_ids}}]}
+
+        docs = await self.collection.find(filter_dict, projection).to_list(length=None)
+        by_id = {}
+        for doc in docs:
+            doc = self._prepare(doc)
+            by_id[doc['_id']] = doc
+            by_id[doc['id']] = doc
+        return [by_id[doc_id] for doc_id in ids if doc_id in by_id]
+
     async def get_all(self, 
                       filter_dict: dict = None, 
                       skip: int = 0, 
                       limit: int = 100,
                       sort_by: str = "_id",
-                      sort_order: int = -1) -> List[dict]:
-        """Get all documents with optional filtering and pagination"""
+                      sort_order: int = -1,
+                      projection: Optional[dict] = None) -> List[dict]:
+        """Get all documents with optional filtering, pagination and projection"""
+        docs = await self._find(filter_dict, skip, limit, sort_by, sort_order, projection)
+        return [self._prepare(doc) for doc in docs]
+
+    async def get_page(self,
+                       filter_dict: dict = None,
+                       limit: int = 10,
+                       sort_by: str = "_id",
+                       sort_order: int = -1,
+                       after: Optional[str] = None,
+                       projection: Optional[dict] = None) -> dict:
+        """Get one keyset-paginated page; 'after' is the nextCursor of the previous page"""
         if filter_dict is None:
             filter_dict = {}
-            
-        # Simple find without complex sorting first
-        cursor = self.collection.find(filter_dict).skip(skip).limit(limit)
-        
-        docs = await cursor.to_list(length=limit)
-        for doc in docs:
-            # Ensure all docs have both id and _id fields
-            doc['id'] = doc.get('id', str(doc['_id']))
-            doc['_id'] = str(doc['_id'])
-            
-            # Convert datetime objects to ISO strings for JSON serialization
-            for key, value in doc.items():
-                if hasattr(value, 'isoformat'):  # Check if it's a datetime object
-                    doc[key] = value.isoformat()
-                    
-        return docs
+
+        page = 1
+        query = filter_dict
+        total = None
+        if after:
+            position = decode_cursor(after)
+            page = position["p"] + 1
+            total = position.get("t")
+            query = {"$and": [filter_dict, keyset_filter(sort_by, sort_order, position)]}
+
+        # The total is counted for the first page only and carried in the cursor;
+        # unfiltered totals come from collection metadata instead of a scan
+        if total is None:
+            counting = self.count(filter_dict) if filter_dict else self.estimated_count()
+        else:
+            counting = asyncio.sleep(0, total)
+        # Fetch one extra document to learn whether another page exists
+        docs, total = await asyncio.gather(
+            self._find(query, 0, limit + 1, sort_by, sort_order, projection),
+            counting
+        )
+
+        next_cursor = None
+        if len(docs) > limit:
+            docs = docs[:limit]
+            next_cursor = encode_cursor(docs[-1], sort_by, page, total)
+
+        return {
+            "items": [self._prepare(doc) for doc in docs],
+            "total": total,
+            "page": page,
+            "limit": limit,
+            "totalPages": (total + limit - 1) // limit,
+            "nextCursor": next_cursor
+        }
+
+    async def get_all_raw(self,
+                          filter_dict: dict = None,
+                          skip: int = 0,
+                          limit: int = 100,
+                          sort_by: str = "_id",
+                          sort_order: int = -1,
+                          projection: Optional[dict] = None) -> bytes:
+        """Opt-in pass-through read: a JSON array built from undecoded BSON documents"""
+        docs = await self._find(filter_dict, skip, limit, sort_by, sort_order, projection, raw=True)
+        return raw_documents_json(docs)
+
+    async def _find(self, filter_dict: Optional[dict], skip: int, limit: int,
+                    sort_by: str, sort_order: int, projection: Optional[dict] = None,
+                    raw: bool = False) -> List[dict]:
+        """Run a sorted find and return the raw documents"""
+        if filter_dict is None:
+            filter_dict = {}
+        if projection is not None:
+            # The sort key must survive projection so a cursor can be built from it
+            projection = {**projection, sort_by: 1}
+
+        collection = self.collection.with_options(codec_options=RAW_CODEC_OPTIONS) if raw else self.collection
+        cursor = collection.find(filter_dict, projection).sort(sort_spec(sort_by, sort_order))
+        if skip:
+            cursor = cursor.skip(skip)
+        cursor = cursor.limit(limit)
+        return await cursor.to_list(length=limit)
+
+    @staticmethod
+    def _prepare(doc: dict) -> dict:
+        """Normalize a raw document for JSON responses"""
+        # Ensure all docs have both id and _id fields; datetimes are left to
+        # the response serializer so documents are walked only once
+        doc['id'] = doc.get('id', str(doc['_id']))
+        doc['_id'] = str(doc['_id'])
+        return doc
 
     async def count(self, filter_dict: dict = None) -> int:
         """Count documents with optional filtering"""
@@ -95,92 +545,104 @@ class CRUDBase:
             filter_dict = {}
         return await self.collection.count_documents(filter_dict)
 
+    async def estimated_count(self) -> int:
+        """Unfiltered total from collection metadata, cached for COUNT_CACHE_TTL seconds"""
+        now = time.monotonic()
+        if self._count_cache and self._count_cache[0] > now:
+            return self._count_cache[1]
+        count = await self.collection.estimated_document_count()
+        self._count_cache = (now + COUNT_CACHE_TTL, count)
+        return count
+
     async def update(self, doc_id: str, update_data: dict) -> Optional[dict]:
         """Update document by ID"""
         update_data['updatedAt'] = datetime.utcnow()
         
-        # Try to update by 'id' field first
         result = await self.collection.find_one_and_update(
-            {"id": doc_id},
+            id_filter(doc_id),
             {"$set": update_data},
             return_document=True
         )
         
-        # If not found, try by ObjectId
-        if not result:
-            try:
-                from bson import ObjectId
-                if len(doc_id) == 24:  # MongoDB ObjectId length
-                    result = await self.collection.find_one_and_update(
-                        {"_id": ObjectId(doc_id)},
-                        {"$set": update_data},
-                        return_document=True
-                    )
-            except:
-                pass
-        
         if result:
+            self._changed()
             result['id'] = result.get('id', str(result['_id']))
             result['_id'] = str(result['_id'])
         return result
 
     async def delete(self, doc_id: str) -> bool:
         """Delete document by ID"""
-        # Try to delete by 'id' field first
-        result = await self.collection.delete_one({"id": doc_id})
-        
-        # If not found, try by ObjectId
-        if result.deleted_count == 0:
-            try:
-                from bson import ObjectId
-                if len(doc_id) == 24:  # MongoDB ObjectId length
-                    result = await self.collection.delete_one({"_id": ObjectId(doc_id)})
-            except:
-                pass
-        
+        result = await self.collection.delete_one(id_filter(doc_id))
+        if result.deleted_count:
+            self._changed()
         return result.deleted_count > 0
 
-    async def search(self, query: str, fields: List[str], 
+    async def search(self, query: str, fields: Optional[List[str]] = None,
                     skip: int = 0, limit: int = 100) -> List[dict]:
-        """Search documents by text in specified fields"""
-        search_conditions = []
-        for field in fields:
-            search_conditions.append({field: {"$regex": query, "$options": "i"}})
-        
-        filter_dict = {"$or": search_conditions} if search_conditions else {}
-        
-        cursor = self.collection.find(filter_dict)
+        """Search documents by text, ranked by relevance when the collection has a text index"""
+        if self.search_fields:
+            cursor = self.collection.find(
+                {"$text": {"$search": query}},
+                {"score": {"$meta": "textScore"}}
+            ).sort([("score", {"$meta": "textScore"})])
+        else:
+            pattern = re.escape(query)
+            search_conditions = [{field: {"$regex": pattern, "$options": "i"}} for field in fields or []]
+            filter_dict = {"$or": search_conditions} if search_conditions else {}
+            cursor = self.collection.find(filter_dict)
         cursor = cursor.skip(skip).limit(limit)
         
         docs = await cursor.to_list(length=limit)
-        for doc in docs:
-            doc['_id'] = str(doc['_id'])
-        return docs
+        return [self._prepare(doc) for doc in docs]
+
+    async def search_count(self, query: str) -> int:
+        """Count documents matching a text search"""
+        if not self.search_fields:
+            return 0
+        return await self.count({"$text": {"$search": query}})
 
 # Collection-specific CRUD classes
 class NewsArticlesCRUD(CRUDBase):
+    search_fields = {"title": 10, "excerpt": 5, "tags": 5, "content": 1}
+    indexes = [
+        ID_INDEX,
+        IndexModel([("publishedDate", DESCENDING), ("id", DESCENDING)]),
+        IndexModel([("status", ASCENDING), ("publishedDate", DESCENDING), ("id", DESCENDING)]),
+        IndexModel([("category", ASCENDING), ("status", ASCENDING), ("publishedDate", DESCENDING), ("id", DESCENDING)]),
+        text_index(search_fields),
+    ]
+    summary_fields = ["title", "excerpt", "author", "publishedDate", "category", "imageUrl", "tags", "status"]
+
     def __init__(self):
         super().__init__("news_articles")
 
-    async def get_published(self, skip: int = 0, limit: int = 100) -> List[dict]:
+    async def get_published(self, skip: int = 0, limit: int = 100,
+                            projection: Optional[dict] = None) -> List[dict]:
         """Get published articles only"""
         return await self.get_all(
             filter_dict={"status": "published"},
             skip=skip,
             limit=limit,
-            sort_by="publishedDate"
+            sort_by="publishedDate",
+            projection=projection
         )
 
-    async def get_by_category(self, category: str, skip: int = 0, limit: int = 100) -> List[dict]:
+    async def get_by_category(self, category: str, skip: int = 0, limit: int = 100,
+                              projection: Optional[dict] = None) -> List[dict]:
         """Get articles by category"""
         return await self.get_all(
             filter_dict={"category": category, "status": "published"},
             skip=skip,
             limit=limit,
-            sort_by="publishedDate"
+            sort_by="publishedDate",
+            projection=projection
         )
 
 class TeamMembersCRUD(CRUDBase):
+    search_fields = {"name": 10, "position": 5, "bio": 1}
+    indexes = [ID_INDEX, IndexModel([("isActive", ASCENDING)]), text_index(search_fields)]
+    summary_fields = ["name", "position", "email", "image", "bio", "isActive"]
+
     def __init__(self):
         super().__init__("team_members")
 
@@ -189,14 +651,23 @@ class TeamMembersCRUD(CRUDBase):
         return await self.get_all(filter_dict={"isActive": True})
 
 class ResearchProjectsCRUD(CRUDBase):
+    search_fields = {"title": 10, "description": 3, "results": 1}
+    indexes = [ID_INDEX, IndexModel([("status", ASCENDING)]), text_index(search_fields)]
+    summary_fields = ["title", "description", "status", "startDate", "endDate", "team", "category", "results",
+                      "technologies"]
+
     def __init__(self):
         super().__init__("research_projects")
 
-    async def get_by_status(self, status: str) -> List[dict]:
+    async def get_by_status(self, status: str, projection: Optional[dict] = None) -> List[dict]:
         """Get projects by status"""
-        return await self.get_all(filter_dict={"status": status})
+        return await self.get_all(filter_dict={"status": status}, projection=projection)
 
 class PartnersCRUD(CRUDBase):
+    search_fields = {"name": 10, "description": 1}
+    indexes = [ID_INDEX, IndexModel([("isActive", ASCENDING)]), text_index(search_fields)]
+    summary_fields = ["name", "logo", "description", "website"]
+
     def __init__(self):
         super().__init__("partners")
 
@@ -205,21 +676,50 @@ class PartnersCRUD(CRUDBase):
         return await self.get_all(filter_dict={"isActive": True})
 
 class ResourcesCRUD(CRUDBase):
+    search_fields = {"title": 10, "description": 1}
+    indexes = [ID_INDEX, text_index(search_fields)]
+    summary_fields = ["title", "type", "description", "publishedDate", "fileType", "downloadCount"]
+
     def __init__(self):
         super().__init__("resources")
-
-    async def increment_download_count(self, resource_id: str) -> Optional[dict]:
-        """Increment download count for a resource"""
-        result = await self.collection.find_one_and_update(
-            {"id": resource_id},
-            {"$inc": {"downloadCount": 1}, "$set": {"updatedAt": datetime.utcnow()}},
-            return_document=True
-        )
-        if result:
-            result['_id'] = str(result['_id'])
-        return result
+        # resource_id -> (expires_at, {"downloadUrl", "title"})
+        self._download_info_cache: Dict[str, tuple] = {}
+
+    def _changed(self):
+        super()._changed()
+        self._download_info_cache.clear()
+
+    async def get_download_info(self, resource_id: str) -> Optional[dict]:
+        """Download URL and title for a resource, cached for DOWNLOAD_INFO_TTL seconds"""
+        now = time.monotonic()
+        cached = self._download_info_cache.get(resource_id)
+        if cached and cached[0] > now:
+            return cached[1]
+        
+        resource = await self.get_by_id(resource_id, {"downloadUrl": 1, "title": 1})
+        if not resource:
+            return None
+        info = {"id": resource["id"], "downloadUrl": resource["downloadUrl"], "title": resource["title"]}
+        self._download_info_cache[resource_id] = (now + DOWNLOAD_INFO_TTL, info)
+        return info
+
+    async def add_download_counts(self, counts: Dict[str, int]) -> int:
+        """Apply aggregated download increments with a single bulk write"""
+        now = datetime.utcnow()
+        result = await self.collection.bulk_write([
+            UpdateOne(id_filter(resource_id), {"$inc": {"downloadCount": amount}, "$set": {"updatedAt": now}})
+            for resource_id, amount in counts.items()
+        ], ordered=False)
+        # Download counts do not affect the cached download URLs, so skip _changed()
+        self._notify()
+        return result.modified_count
 
 class JobOpeningsCRUD(CRUDBase):
+    search_fields = {"title": 10, "department": 5, "description": 1}
+    indexes = [ID_INDEX, IndexModel([("isActive", ASCENDING), ("applicationDeadline", ASCENDING)]), text_index(search_fields)]
+    summary_fields = ["title", "department", "location", "type", "experience", "description",
+                      "requirements", "applicationDeadline", "salary"]
+
     def __init__(self):
         super().__init__("job_openings")
 
@@ -238,14 +738,20 @@ class ContactSubmissionsCRUD(CRUDBase):
         super().__init__("contact_submissions")
 
 class JobApplicationsCRUD(CRUDBase):
+    indexes = [ID_INDEX, IndexModel([("jobId", ASCENDING), ("submittedAt", DESCENDING), ("id", DESCENDING)])]
+
     def __init__(self):
         super().__init__("job_applications")
 
     async def get_by_job(self, job_id: str) -> List[dict]:
         """Get applications for a specific job"""
-        return await self.get_all(filter_dict={"jobId": job_id})
+        return await self.get_all(filter_dict={"jobId": job_id}, sort_by="submittedAt")
 
 class TestimonialsCRUD(CRUDBase):
+    search_fields = {"name": 5, "content": 1}
+    indexes = [ID_INDEX, IndexModel([("isApproved", ASCENDING)]), text_index(search_fields)]
+    summary_fields = ["name", "position", "content", "avatar"]
+
     def __init__(self):
         super().__init__("testimonials")
 
@@ -254,6 +760,10 @@ class TestimonialsCRUD(CRUDBase):
         return await self.get_all(filter_dict={"isApproved": True})
 
 class FAQsCRUD(CRUDBase):
+    search_fields = {"question": 10, "answer": 1}
+    indexes = [ID_INDEX, IndexModel([("isActive", ASCENDING), ("order", ASCENDING), ("id", ASCENDING)]), text_index(search_fields)]
+    summary_fields = ["question", "answer", "category", "order"]
+
     def __init__(self):
         super().__init__("faq")
 
@@ -266,6 +776,8 @@ class FAQsCRUD(CRUDBase):
         )
 
 class DonationsCRUD(CRUDBase):
+    indexes = [ID_INDEX, IndexModel([("status", ASCENDING)])]
+
     def __init__(self):
         super().__init__("donations")
 
@@ -273,6 +785,70 @@ class DonationsCRUD(CRUDBase):
         """Get donations by status"""
         return await self.get_all(filter_dict={"status": status})
 
+class IdempotencyKeysCRUD(CRUDBase):
+    """Durable Idempotency-Key records; the unique index lets only one worker execute a key"""
+    indexes = [
+        ID_INDEX,
+        IndexModel([("key", ASCENDING)], unique=True),
+        IndexModel([("createdAt", ASCENDING)], expireAfterSeconds=IDEMPOTENCY_KEY_TTL),
+    ]
+
+    def __init__(self):
+        super().__init__("idempotency_keys")
+
+    async def reserve(self, key: str, fingerprint: str, owner: str) -> Optional[dict]:
+        """Claim a key for owner; returns the existing record instead when the key is already taken.
+
+        A processing record whose lockedUntil lease has run out (its worker died
+        or the request was cancelled before releasing it) is taken over.
+        """
+        for _ in range(3):
+            now = datetime.utcnow()
+            locked_until = now + timedelta(seconds=IDEMPOTENCY_LOCK_SECONDS)
+            try:
+                await self.collection.insert_one({
+                    "id": str(uuid.uuid4()),
+                    "key": key,
+                    "fingerprint": fingerprint,
+                    "state": "processing",
+                    "owner": owner,
+                    "lockedUntil": locked_until,
+                    "createdAt": now
+                })
+                return None
+            except DuplicateKeyError:
+                existing = await self.collection.find_one({"key": key})
+            if existing is None:
+                continue  # released between the insert and the read
+            # The TTL monitor runs about once a minute, so expiry is also checked here
+            if (now - existing["createdAt"]).total_seconds() > IDEMPOTENCY_KEY_TTL:
+                await self.collection.delete_one({"_id": existing["_id"]})
+                continue
+            lease = existing.get("lockedUntil")
+            if (existing["state"] == "processing" and existing["fingerprint"] == fingerprint
+                    and (lease is None or lease <= now)):
+                # Matching the old lease makes the takeover atomic between competing retries
+                taken = await self.collection.find_one_and_update(
+                    {"_id": existing["_id"], "state": "processing", "lockedUntil": lease},
+                    {"$set": {"owner": owner, "lockedUntil": locked_until}}
+                )
+                if taken is not None:
+                    return None
+                continue
+            return existing
+        raise RuntimeError(f"Could not reserve idempotency key {key}")
+
+    async def complete(self, key: str, owner: str, response: dict):
+        """Store the response; a no-op if the lease expired and another request took the key over"""
+        await self.collection.update_one(
+            {"key": key, "owner": owner},
+            {"$set": {"state": "completed", "response": response}, "$unset": {"lockedUntil": ""}}
+        )
+
+    async def release(self, key: str, owner: str):
+        """Forget a key whose request failed so a retry executes again"""
+        await self.collection.delete_one({"key": key, "state": "processing", "owner": owner})
+
 # Initialize CRUD instances
 news_articles_crud = NewsArticlesCRUD()
 team_members_crud = TeamMembersCRUD()
@@ -284,4 +860,144 @@ contact_submissions_crud = ContactSubmissionsCRUD()
 job_applications_crud = JobApplicationsCRUD()
 testimonials_crud = TestimonialsCRUD()
 faqs_crud = FAQsCRUD()
-donations_crud = DonationsCRUD()
\ No newline at end of file
+donations_crud = DonationsCRUD()
+idempotency_keys_crud = IdempotencyKeysCRUD()
+
+all_cruds = [
+    news_articles_crud, team_members_crud, research_projects_crud, partners_crud,
+    resources_crud, job_openings_crud, contact_submissions_crud, job_applications_crud,
+    testimonials_crud, faqs_crud, donations_crud, idempotency_keys_crud
+]
+
+async def estimated_counts(cruds: List[CRUDBase]) -> List[int]:
+    """Estimated totals for several collections, fetched concurrently"""
+    return await asyncio.gather(*(crud.estimated_count() for crud in cruds))
+
+async def ensure_all_indexes() -> Dict[str, Dict[str, Any]]:
+    """Reconcile declared indexes for every collection.
+
+    A failure on one collection is recorded under its 'error' key and the
+    remaining collections are still reconciled.
+    """
+    report = {}
+    for crud in all_cruds:
+        try:
+            report[crud.collection_name] = await crud.ensure_indexes()
+        except Exception as e:
+            logger.error(f"Error reconciling indexes on {crud.collection_name}: {str(e)}")
+            report[crud.collection_name] = {"missing": [], "extra": [], "conflicting": [], "error": str(e)}
+    return report
+
+class VersionSync:
+    """Shares per-collection write counters between workers through the collection_versions collection.
+
+    Each push increments the shared counter atomically ($inc), so every
+    counter value is handed out once and stands for one state of the data no
+    matter which worker wrote it. Until a local write has been pushed, its
+    stamp carries this worker's id and a local sequence so it cannot equal a
+    stamp from any other worker. Counters other workers pushed are pulled
+    every interval seconds; adopting one drops the collection's count cache
+    and notifies change_listeners, so ETags and cached responses follow
+    writes made by any worker.
+    """
+
+    def __init__(self, collection_name: str = "collection_versions", interval: float = 1.0):
+        self.collection_name = collection_name
+        self.interval = interval
+        # collection name -> sequence of this worker's latest write not yet pushed
+        self._unpublished: Dict[str, int] = {}
+        self._sequence = 0
+        self._loaded = False
+        self._wakeup = asyncio.Event()
+        self._lock = asyncio.Lock()
+        self._stopping = False
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def collection(self):
+        return database.db[self.collection_name]
+
+    def record_write(self, name: str):
+        """Give the collection a worker-unique stamp and queue the write for the next push"""
+        self._sequence += 1
+        self._unpublished[name] = self._sequence
+        self._wakeup.set()
+
+    def stamp(self, name: str) -> str:
+        """Version stamp of a collection's current content, for ETags"""
+        sequence = self._unpublished.get(name)
+        if sequence is None and self._loaded:
+            return str(collection_versions[name])
+        # Not yet shared (or not yet loaded): only this worker can produce this stamp
+        return f"{collection_versions[name]}~{WORKER_ID}.{sequence or 0}"
+
+    def _adopt(self, name: str, version: int):
+        collection_versions[name] = version
+        for crud in all_cruds:
+            if crud.collection_name == name:
+                crud._count_cache = None
+        for listener in change_listeners:
+            listener(name)
+
+    async def sync(self):
+        """Push local writes, then adopt counters other workers have advanced"""
+        async with self._lock:
+            for name, sequence in list(self._unpublished.items()):
+                known = collection_versions[name]
+                doc = await self.collection.find_one_and_update(
+                    {"_id": name}, {"$inc": {"version": 1}}, upsert=True, return_document=ReturnDocument.AFTER
+                )
+                if self._unpublished.get(name) == sequence:
+                    del self._unpublished[name]  # no further local write while pushing
+                if doc["version"] != known + 1:
+                    self._adopt(name, doc["version"])  # other workers wrote in between
+                else:
+                    collection_versions[name] = doc["version"]
+            
+            async for doc in self.collection.find({}):
+                if doc["version"] > collection_versions[doc["_id"]]:
+                    self._adopt(doc["_id"], doc["version"])
+            self._loaded = True
+
+    async def _run(self):
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            if self._stopping:
+                break
+            try:
+                await self.sync()
+            except Exception as e:
+                logger.error(f"Error syncing collection versions: {str(e)}")
+                await asyncio.sleep(self.interval)
+
+    @property
+    def task(self) -> Optional[asyncio.Task]:
+        """The background task, for health checks"""
+        return self._task
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop the task, then push the last local writes.
+
+        The task is woken up rather than cancelled: the final writes before a
+        shutdown set the wakeup event, and wait_for can swallow a cancellation
+        that races with its inner wait finishing.
+        """
+        if self._task is not None:
+            self._stopping = True
+            self._wakeup.set()
+            try:
+                await self._task
+            finally:
+                self._task = None
+                self._stopping = False
+        await self.sync()
+
+version_sync = VersionSync(interval=VERSION_SYNC_INTERVAL)
@@ -0,0 +1,91 @@
+"""
+Health checks: cached database ping, event-loop lag and background task status
+"""
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+class HealthMonitor:
+    """Dependency checks cheap enough to run on every probe.
+
+    The database ping is cached for ping_cache_seconds and concurrent probes
+    share one ping, so probes never add more than one command per interval.
+    Event-loop lag is sampled by a background task that measures how late its
+    own sleeps wake up.
+    """
+
+    def __init__(self, ping: Callable[[], Awaitable[Any]], ping_timeout: float = 1.0,
+                 ping_cache_seconds: float = 3.0, lag_interval: float = 0.5, lag_samples: int = 20):
+        self.ping = ping
+        self.ping_timeout = ping_timeout
+        self.ping_cache_seconds = ping_cache_seconds
+        self.lag_interval = lag_interval
+        self._ping_result: Optional[Dict[str, Any]] = None
+        self._ping_expires_at = 0.0
+        self._ping_task: Optional[asyncio.Task] = None
+        self._lag = deque(maxlen=lag_samples)
+        self._lag_task: Optional[asyncio.Task] = None
+
+    async def _ping(self) -> Dict[str, Any]:
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(self.ping(), timeout=self.ping_timeout)
+            result = {"status": "ok"}
+        except asyncio.TimeoutError:
+            result = {"status": "down", "error": f"ping timed out after {self.ping_timeout}s"}
+        except Exception as e:
+            result = {"status": "down", "error": str(e)}
+        result["latencyMs"] = round((time.perf_counter() - started) * 1000, 2)
+        result["checkedAt"] = time.time()
+        self._ping_result = result
+        self._ping_expires_at = time.monotonic() + self.ping_cache_seconds
+        return result
+
+    async def database(self) -> Dict[str, Any]:
+        """Latest ping result, pinging again once the cached one is older than ping_cache_seconds"""
+        if self._ping_result is not None and self._ping_expires_at > time.monotonic():
+            return self._ping_result
+        if self._ping_task is None or self._ping_task.done():
+            self._ping_task = asyncio.create_task(self._ping())
+        return await asyncio.shield(self._ping_task)
+
+    async def _measure_lag(self):
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(self.lag_interval)
+            self._lag.append(max(0.0, time.perf_counter() - started - self.lag_interval))
+
+    def loop_lag(self) -> Dict[str, float]:
+        """Event-loop lag in milliseconds: the latest sample and the worst of the recent ones"""
+        if not self._lag:
+            return {"lastMs": 0.0, "maxMs": 0.0}
+        return {"lastMs": round(self._lag[-1] * 1000, 2), "maxMs": round(max(self._lag) * 1000, 2)}
+
+    @property
+    def task(self) -> Optional[asyncio.Task]:
+        return self._lag_task
+
+    def start(self):
+        if self._lag_task is None:
+            self._lag_task = asyncio.create_task(self._measure_lag())
+
+    async def stop(self):
+        if self._lag_task is not None:
+            self._lag_task.cancel()
+            try:
+                await self._lag_task
+            except asyncio.CancelledError:
+                pass
+            self._lag_task = None
+
+def task_status(task: Optional[asyncio.Task]) -> str:
+    """'running', 'stopped' (never started or cancelled) or 'failed'"""
+    if task is None or task.cancelled():
+        return "stopped"
+    if not task.done():
+        return "running"
+    return "failed" if task.exception() is not None else "stopped"
@@ -0,0 +1,67 @@
+"""
+Idempotency-Key support: completed responses are replayed from memory and
+concurrent retries wait for the first execution
+"""
+import asyncio
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+def request_fingerprint(method: str, path: str, body: bytes) -> str:
+    """Identifies the request a key was first used with, so reuse with a different body is caught"""
+    return hashlib.sha256(method.encode() + b" " + path.encode() + b"\n" + body).hexdigest()
+
+class IdempotencyStore:
+    """Bounded LRU of completed responses with a TTL, plus futures for requests in flight.
+
+    Responses are dicts with 'status', 'body' and 'mediaType' so the same
+    value can be stored in MongoDB for other workers.
+    """
+
+    def __init__(self, max_entries: int = 10000, ttl: float = 86400.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        # key -> (expires_at, fingerprint, response)
+        self._completed: "OrderedDict[str, Tuple[float, str, Dict[str, Any]]]" = OrderedDict()
+        # key -> (fingerprint, future resolved with the response, or None when it was not kept)
+        self._in_flight: Dict[str, Tuple[str, asyncio.Future]] = {}
+        self.replays = 0
+
+    def get(self, key: str) -> Optional[Tuple[str, Dict[str, Any]]]:
+        entry = self._completed.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            del self._completed[key]
+            return None
+        self._completed.move_to_end(key)
+        return entry[1], entry[2]
+
+    def put(self, key: str, fingerprint: str, response: Dict[str, Any]):
+        self._completed[key] = (time.monotonic() + self.ttl, fingerprint, response)
+        self._completed.move_to_end(key)
+        while len(self._completed) > self.max_entries:
+            self._completed.popitem(last=False)
+
+    def in_flight(self, key: str) -> Optional[Tuple[str, asyncio.Future]]:
+        return self._in_flight.get(key)
+
+    def begin(self, key: str, fingerprint: str):
+        self._in_flight[key] = (fingerprint, asyncio.get_running_loop().create_future())
+
+    def finish(self, key: str, response: Optional[Dict[str, Any]]):
+        """Complete an in-flight key; waiters receive the response (None means execute again)"""
+        fingerprint, future = self._in_flight.pop(key)
+        if response is not None:
+            self.put(key, fingerprint, response)
+        if not future.done():
+            future.set_result(response)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self._completed),
+            "maxEntries": self.max_entries,
+            "inFlight": len(self._in_flight),
+            "replays": self.replays,
+        }
@@ -0,0 +1,109 @@
+"""
+Streaming NDJSON/CSV import: rows are parsed incrementally, validated in chunks
+and written with insert_many batches
+"""
+import csv
+import json
+from typing import Any, AsyncIterator, Dict, List, Tuple, Type
+
+from pydantic import BaseModel, ValidationError
+
+# Error details kept in the report; the failed count still covers every row
+MAX_REPORTED_ERRORS = 1000
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """Split a byte stream into text lines without buffering the whole body"""
+    pending = b""
+    async for chunk in chunks:
+        pending += chunk
+        *lines, pending = pending.split(b"\n")
+        for line in lines:
+            yield line.decode("utf-8").rstrip("\r")
+    if pending:
+        yield pending.decode("utf-8").rstrip("\r")
+
+async def iter_ndjson(chunks: AsyncIterator[bytes]) -> AsyncIterator[Tuple[int, Any]]:
+    """(row number, parsed object or ValueError) for each non-blank line"""
+    row = 0
+    async for line in iter_lines(chunks):
+        if not line.strip():
+            continue
+        row += 1
+        try:
+            yield row, json.loads(line)
+        except ValueError as e:
+            yield row, ValueError(f"Invalid JSON: {e}")
+
+def csv_cell(value: str) -> Any:
+    """CSV cells holding JSON arrays/objects (as written by the exporter) are decoded"""
+    if value[:1] in ("[", "{"):
+        try:
+            return json.loads(value)
+        except ValueError:
+            pass
+    return value
+
+async def iter_csv(chunks: AsyncIterator[bytes]) -> AsyncIterator[Tuple[int, Any]]:
+    """(row number, dict) for each CSV record; the first record is the header"""
+    header = None
+    row = 0
+    record_lines: List[str] = []
+    async for line in iter_lines(chunks):
+        record_lines.append(line)
+        # A quoted field may span lines; wait until the quotes balance
+        if sum(part.count('"') for part in record_lines) % 2:
+            continue
+        text, record_lines = "\n".join(record_lines), []
+        if not text.strip():
+            continue
+        values = next(csv.reader([text]))
+        if header is None:
+            header = values
+            continue
+        row += 1
+        # Empty cells are omitted so model defaults apply
+        yield row, {key: csv_cell(value) for key, value in zip(header, values) if value != ""}
+
+def validate_row(model: Type[BaseModel], data: Any) -> Dict[str, Any]:
+    """Validate one row against the full document model, so exported server-side
+    fields (status, isActive, ...) survive a re-import; a string 'id' is kept"""
+    if isinstance(data, Exception):
+        raise data
+    if not isinstance(data, dict):
+        raise ValueError("Row must be a JSON object")
+    if not isinstance(data.get("id"), str):
+        data = {key: value for key, value in data.items() if key != "id"}
+    return model(**data).dict()
+
+async def import_rows(crud, model: Type[BaseModel], rows: AsyncIterator[Tuple[int, Any]],
+                      batch_size: int = 500) -> Dict[str, Any]:
+    """Validate and insert rows in batches, collecting per-row errors instead of aborting"""
+    report = {"received": 0, "inserted": 0, "failed": 0, "errors": []}
+
+    def fail(row: int, error: Any):
+        report["failed"] += 1
+        if len(report["errors"]) < MAX_REPORTED_ERRORS:
+            report["errors"].append({"row": row, "error": error})
+
+    async def flush(batch: List[Tuple[int, Dict[str, Any]]]):
+        result = await crud.create_many([document for _, document in batch])
+        report["inserted"] += result["inserted"]
+        for error in result["errors"]:
+            fail(batch[error["index"]][0], error["message"])
+
+    batch: List[Tuple[int, Dict[str, Any]]] = []
+    async for row, data in rows:
+        report["received"] += 1
+        try:
+            batch.append((row, validate_row(model, data)))
+        except ValidationError as e:
+            fail(row, [{"field": ".".join(str(part) for part in err["loc"]), "message": err["msg"]}
+                       for err in e.errors()])
+        except ValueError as e:
+            fail(row, str(e))
+        if len(batch) >= batch_size:
+            await flush(batch)
+            batch = []
+    if batch:
+        await flush(batch)
+    return report
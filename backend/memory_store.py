@@ -0,0 +1,550 @@
+"""
+In-memory stand-in for the Motor client, selected with STORAGE_BACKEND=memory
+
+Implements the subset of the collection API the CRUD classes use: query
+operators, sort/skip/limit, projections, $set/$inc/$unset updates, unique and
+secondary hash indexes and a simple weighted $text search. Nothing is persisted.
+"""
+import copy
+import itertools
+import operator
+import re
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+import bson
+from bson import ObjectId
+from bson.raw_bson import RawBSONDocument
+from pymongo.errors import BulkWriteError, DuplicateKeyError, OperationFailure
+from pymongo.results import BulkWriteResult, DeleteResult, InsertManyResult, InsertOneResult, UpdateResult
+
+_MISSING = object()
+
+# Cross-type ordering used by MongoDB sorts and range comparisons
+def _type_rank(value: Any) -> int:
+    if value is None or value is _MISSING:
+        return 1
+    if isinstance(value, bool):
+        return 8
+    if isinstance(value, (int, float)):
+        return 2
+    if isinstance(value, str):
+        return 3
+    if isinstance(value, dict):
+        return 4
+    if isinstance(value, list):
+        return 5
+    if isinstance(value, bytes):
+        return 6
+    if isinstance(value, ObjectId):
+        return 7
+    if isinstance(value, datetime):
+        return 9
+    return 10
+
+def sort_key(value: Any) -> Tuple[int, Any]:
+    rank = _type_rank(value)
+    if rank in (1, 4, 5):
+        return rank, repr(value) if rank != 1 else 0
+    return rank, value
+
+def get_path(doc: Any, path: str) -> Any:
+    """Value at a dotted path, or _MISSING"""
+    value = doc
+    for part in path.split('.'):
+        if isinstance(value, dict):
+            value = value.get(part, _MISSING)
+        elif isinstance(value, list) and part.isdigit() and int(part) < len(value):
+            value = value[int(part)]
+        else:
+            return _MISSING
+        if value is _MISSING:
+            return _MISSING
+    return value
+
+def _candidates(value: Any) -> List[Any]:
+    """A field value plus, for arrays, each element (MongoDB's implicit array matching)"""
+    if isinstance(value, list):
+        return [value] + value
+    return [value]
+
+def _comparable(a: Any, b: Any) -> bool:
+    return _type_rank(a) == _type_rank(b) and _type_rank(a) not in (1, 4, 5)
+
+def _same(a: Any, b: Any) -> bool:
+    """Equality without Python's bool/int conflation"""
+    return _type_rank(a) == _type_rank(b) and a == b
+
+def _equals(value: Any, target: Any) -> bool:
+    if target is None:
+        return value is _MISSING or value is None or (isinstance(value, list) and None in value)
+    return any(_same(candidate, target) for candidate in _candidates(value))
+
+_RANGE_OPERATORS = {"$gt": operator.gt, "$gte": operator.ge, "$lt": operator.lt, "$lte": operator.le}
+
+def _regex(pattern: Any, options: str = "") -> "re.Pattern":
+    if isinstance(pattern, re.Pattern):
+        return pattern
+    flags = 0
+    for option, flag in (("i", re.IGNORECASE), ("m", re.MULTILINE), ("s", re.DOTALL), ("x", re.VERBOSE)):
+        if option in options:
+            flags |= flag
+    return re.compile(pattern, flags)
+
+def _match_operators(value: Any, spec: dict) -> bool:
+    for op, arg in spec.items():
+        if op == "$eq":
+            ok = _equals(value, arg)
+        elif op == "$ne":
+            ok = not _equals(value, arg)
+        elif op in _RANGE_OPERATORS:
+            compare = _RANGE_OPERATORS[op]
+            ok = any(_comparable(candidate, arg) and compare(candidate, arg) for candidate in _candidates(value))
+        elif op == "$in":
+            ok = any(_equals(value, item) for item in arg)
+        elif op == "$nin":
+            ok = not any(_equals(value, item) for item in arg)
+        elif op == "$exists":
+            ok = (value is not _MISSING) == bool(arg)
+        elif op == "$regex":
+            pattern = _regex(arg, spec.get("$options", ""))
+            ok = any(isinstance(candidate, str) and pattern.search(candidate) for candidate in _candidates(value))
+        elif op == "$options":
+            continue
+        elif op == "$not":
+            ok = not (_match_operators(value, arg) if isinstance(arg, dict) else
+                      _match_operators(value, {"$regex": arg}))
+        elif op == "$size":
+            ok = isinstance(value, list) and len(value) == arg
+        elif op == "$all":
+            ok = all(_equals(value, item) for item in arg)
+        else:
+            raise OperationFailure(f"unknown operator: {op}")
+        if not ok:
+            return False
+    return True
+
+def matches(doc: dict, filter_dict: dict) -> bool:
+    """Evaluate a MongoDB query document against one document"""
+    for key, spec in filter_dict.items():
+        if key == "$and":
+            ok = all(matches(doc, clause) for clause in spec)
+        elif key == "$or":
+            ok = any(matches(doc, clause) for clause in spec)
+        elif key == "$nor":
+            ok = not any(matches(doc, clause) for clause in spec)
+        elif key == "$text":
+            continue  # resolved by the collection, which knows the text index
+        else:
+            value = get_path(doc, key)
+            if isinstance(spec, dict) and spec and all(k.startswith("$") for k in spec):
+                ok = _match_operators(value, spec)
+            elif isinstance(spec, re.Pattern):
+                ok = _match_operators(value, {"$regex": spec})
+            else:
+                ok = _equals(value, spec)
+        if not ok:
+            return False
+    return True
+
+def text_terms(text: str) -> List[str]:
+    return re.findall(r'\w+', text.lower())
+
+def _text_of(value: Any) -> str:
+    if isinstance(value, list):
+        return " ".join(str(item) for item in value if isinstance(item, str))
+    return value if isinstance(value, str) else ""
+
+class MemoryCursor:
+    """Lazily evaluated result set supporting sort/skip/limit, to_list and async iteration"""
+
+    def __init__(self, collection: "MemoryCollection", filter_dict: Optional[dict],
+                 projection: Optional[dict], raw: bool = False):
+        self._collection = collection
+        self._filter = filter_dict or {}
+        self._projection = projection
+        self._raw = raw
+        self._sort: List[Tuple[str, Any]] = []
+        self._skip = 0
+        self._limit = 0
+
+    def sort(self, key_or_list, direction: Any = None) -> "MemoryCursor":
+        self._sort = list(key_or_list) if isinstance(key_or_list, list) else [(key_or_list, direction or 1)]
+        return self
+
+    def skip(self, skip: int) -> "MemoryCursor":
+        self._skip = skip
+        return self
+
+    def limit(self, limit: int) -> "MemoryCursor":
+        self._limit = limit
+        return self
+
+    def _evaluate(self) -> List[dict]:
+        docs, scores = self._collection._select(self._filter)
+        # Stable sorts applied from the least significant key
+        for field, direction in reversed(self._sort):
+            if isinstance(direction, dict):  # {"$meta": "textScore"}
+                docs.sort(key=lambda doc: scores.get(id(doc), 0.0), reverse=True)
+            else:
+                docs.sort(key=lambda doc: sort_key(get_path(doc, field)), reverse=direction == -1)
+        docs = docs[self._skip:]
+        if self._limit:
+            docs = docs[:self._limit]
+        results = [self._collection._project(doc, self._projection, scores.get(id(doc))) for doc in docs]
+        if self._raw:
+            results = [RawBSONDocument(bson.encode(doc)) for doc in results]
+        return results
+
+    async def to_list(self, length: Optional[int] = None) -> List[dict]:
+        docs = self._evaluate()
+        return docs[:length] if length else docs
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for doc in self._evaluate():
+            yield doc
+
+class MemoryCollection:
+    def __init__(self, name: str):
+        self.name = name
+        self._docs: Dict[Any, dict] = {}
+        # index name -> IndexModel document
+        self._index_specs: Dict[str, dict] = {}
+        # leading field -> value -> set of _ids; unique fields are also checked on write
+        self._hash_indexes: Dict[str, Dict[Any, Set[Any]]] = {}
+        # unique field -> partialFilterExpression (None when every document is covered)
+        self._unique_fields: Dict[str, Optional[dict]] = {}
+        self._text_weights: Dict[str, int] = {}
+        # _id -> insertion sequence, so index lookups return natural order like a scan
+        self._order: Dict[Any, int] = {}
+        self._sequence = itertools.count()
+
+    def with_options(self, codec_options=None, **kwargs) -> "MemoryCollection":
+        if codec_options is not None and codec_options.document_class is RawBSONDocument:
+            return _RawView(self)
+        return self
+
+    # Indexes
+    async def index_information(self) -> Dict[str, dict]:
+        info = {"_id_": {"key": [("_id", 1)]}}
+        for name, spec in self._index_specs.items():
+            info[name] = {"key": list(spec["key"].items()), **{k: v for k, v in spec.items() if k not in ("key", "name")}}
+        return info
+
+    async def create_indexes(self, indexes: Iterable) -> List[str]:
+        names = []
+        for index in indexes:
+            spec = index.document
+            self._index_specs[spec["name"]] = spec
+            fields = list(spec["key"])
+            if any(direction == "text" for direction in spec["key"].values()):
+                self._text_weights = spec.get("weights") or {field: 1 for field in fields}
+            else:
+                leading = fields[0]
+                if leading not in self._hash_indexes:
+                    self._hash_indexes[leading] = {}
+                    for doc in self._docs.values():
+                        self._index_doc(doc, fields=[leading])
+                if spec.get("unique") and len(fields) == 1:
+                    self._unique_fields[leading] = spec.get("partialFilterExpression")
+            names.append(spec["name"])
+        return names
+
+    @staticmethod
+    def _index_keys(value: Any) -> List[Any]:
+        keys = []
+        for candidate in _candidates(value):
+            if candidate is _MISSING:
+                candidate = None
+            try:
+                hash(candidate)
+            except TypeError:
+                continue
+            keys.append((type(candidate) is bool, candidate))
+        return keys
+
+    def _index_doc(self, doc: dict, fields: Optional[Iterable[str]] = None, remove: bool = False):
+        for field in fields or self._hash_indexes:
+            index = self._hash_indexes[field]
+            for key in self._index_keys(get_path(doc, field)):
+                if remove:
+                    ids = index.get(key)
+                    if ids is not None:
+                        ids.discard(doc["_id"])
+                        if not ids:
+                            del index[key]
+                else:
+                    index.setdefault(key, set()).add(doc["_id"])
+
+    def _check_unique(self, doc: dict, ignore_id: Any = _MISSING):
+        if doc["_id"] in self._docs and doc["_id"] != ignore_id:
+            raise DuplicateKeyError(f"E11000 duplicate key error collection: {self.name} index: _id_",
+                                    11000, {"keyValue": {"_id": doc["_id"]}})
+        for field, partial in self._unique_fields.items():
+            if partial is not None and not matches(doc, partial):
+                continue
+            value = get_path(doc, field)
+            for key in self._index_keys(value):
+                if self._hash_indexes[field].get(key, set()) - {ignore_id}:
+                    raise DuplicateKeyError(
+                        f"E11000 duplicate key error collection: {self.name} index: {field}_1 dup key: {{ {field}: {value!r} }}",
+                        11000, {"keyValue": {field: value}})
+
+    # Query planning
+    def _index_candidates(self, filter_dict: dict) -> Optional[Set[Any]]:
+        """_ids that may match, from a hash index on an equality/$in clause; None means scan"""
+        if "_id" in filter_dict and not isinstance(filter_dict["_id"], dict):
+            return {filter_dict["_id"]}
+        for field, spec in filter_dict.items():
+            if field == "$or":
+                branches = [self._index_candidates(clause) for clause in spec]
+                if all(branch is not None for branch in branches):
+                    return set().union(*branches)
+                continue
+            if field == "$and":
+                for clause in spec:
+                    ids = self._index_candidates(clause)
+                    if ids is not None:
+                        return ids
+                continue
+            if field == "_id" and isinstance(spec, dict) and set(spec) == {"$in"}:
+                return set(spec["$in"])
+            index = self._hash_indexes.get(field)
+            if index is None:
+                continue
+            if isinstance(spec, dict) and set(spec) == {"$in"}:
+                values = spec["$in"]
+            elif isinstance(spec, dict) and set(spec) == {"$eq"}:
+                values = [spec["$eq"]]
+            elif not isinstance(spec, (dict, list, re.Pattern)):
+                values = [spec]
+            else:
+                continue
+            ids = set()
+            for value in values:
+                for key in self._index_keys(value):
+                    ids |= index.get(key, set())
+            return ids
+        return None
+
+    def _text_scores(self, search: str) -> Dict[Any, float]:
+        if not self._text_weights:
+            raise OperationFailure("text index required for $text query", 27)
+        terms = set(text_terms(search))
+        scores = {}
+        for _id, doc in self._docs.items():
+            score = 0.0
+            for field, weight in self._text_weights.items():
+                tokens = text_terms(_text_of(get_path(doc, field)))
+                matched = sum(1 for token in tokens if token in terms)
+                if matched:
+                    score += weight * (0.5 + 0.5 * matched / len(tokens))
+            if score:
+                scores[_id] = score
+        return scores
+
+    def _select(self, filter_dict: dict) -> Tuple[List[dict], Dict[int, float]]:
+        """Matching stored documents in insertion order, plus text scores keyed by id(doc)"""
+        text_scores = None
+        text = filter_dict.get("$text")
+        if text is not None:
+            text_scores = self._text_scores(text["$search"])
+        ids = self._index_candidates(filter_dict)
+        if text_scores is not None:
+            ids = set(text_scores) if ids is None else ids & set(text_scores)
+        if ids is None:
+            docs = list(self._docs.values())
+        else:
+            docs = sorted((self._docs[_id] for _id in ids if _id in self._docs),
+                          key=lambda doc: self._order[doc["_id"]])
+        docs = [doc for doc in docs if matches(doc, filter_dict)]
+        scores = {id(doc): text_scores[doc["_id"]] for doc in docs} if text_scores is not None else {}
+        return docs, scores
+
+    @staticmethod
+    def _project(doc: dict, projection: Optional[dict], score: Optional[float] = None) -> dict:
+        """Copy of a stored document with the projection applied; nested values are shared"""
+        if not projection:
+            return dict(doc)
+        meta = {field: spec for field, spec in projection.items() if isinstance(spec, dict)}
+        flags = {field: spec for field, spec in projection.items() if field not in meta}
+        included = [field for field, flag in flags.items() if flag and field != "_id"]
+        if included:
+            result = {field: doc[field] for field in included if field in doc}
+            if flags.get("_id", 1) and "_id" in doc:
+                result = {"_id": doc["_id"], **result}
+        else:
+            result = {field: value for field, value in doc.items() if flags.get(field, 1)}
+        for field in meta:
+            result[field] = score or 0.0
+        return result
+
+    # Reads
+    def find(self, filter_dict: Optional[dict] = None, projection: Optional[dict] = None, **kwargs) -> MemoryCursor:
+        return MemoryCursor(self, filter_dict, projection)
+
+    async def find_one(self, filter_dict: Optional[dict] = None, projection: Optional[dict] = None) -> Optional[dict]:
+        docs = await self.find(filter_dict, projection).limit(1).to_list(1)
+        return docs[0] if docs else None
+
+    async def count_documents(self, filter_dict: dict) -> int:
+        if not filter_dict:
+            return len(self._docs)
+        return len(self._select(filter_dict)[0])
+
+    async def estimated_document_count(self) -> int:
+        return len(self._docs)
+
+    # Writes
+    def _insert(self, doc: dict) -> Any:
+        if "_id" not in doc:
+            doc["_id"] = ObjectId()  # pymongo also sets _id on the caller's document
+        stored = copy.deepcopy(doc)
+        self._check_unique(stored)
+        self._docs[stored["_id"]] = stored
+        self._order[stored["_id"]] = next(self._sequence)
+        self._index_doc(stored)
+        return stored["_id"]
+
+    async def insert_one(self, doc: dict) -> InsertOneResult:
+        return InsertOneResult(self._insert(doc), True)
+
+    async def insert_many(self, docs: List[dict], ordered: bool = True) -> InsertManyResult:
+        inserted, errors = [], []
+        for index, doc in enumerate(docs):
+            try:
+                inserted.append(self._insert(doc))
+            except DuplicateKeyError as e:
+                errors.append({"index": index, "code": 11000, "errmsg": str(e), "op": doc})
+                if ordered:
+                    break
+        if errors:
+            raise BulkWriteError({"writeErrors": errors, "nInserted": len(inserted), "writeConcernErrors": [],
+                                  "nUpserted": 0, "nMatched": 0, "nModified": 0, "nRemoved": 0, "upserted": []})
+        return InsertManyResult(inserted, True)
+
+    def _apply_update(self, doc: dict, update: dict, inserting: bool = False) -> dict:
+        updated = copy.deepcopy(doc)
+        for op, fields in update.items():
+            for path, value in fields.items():
+                *parents, leaf = path.split('.')
+                target = updated
+                for part in parents:
+                    target = target.setdefault(part, {})
+                if op == "$set" or (op == "$setOnInsert" and inserting):
+                    target[leaf] = copy.deepcopy(value)
+                elif op == "$inc":
+                    target[leaf] = target.get(leaf, 0) + value
+                elif op == "$max":
+                    if leaf not in target or _comparable(value, target[leaf]) and target[leaf] < value:
+                        target[leaf] = copy.deepcopy(value)
+                elif op == "$unset":
+                    target.pop(leaf, None)
+                elif op != "$setOnInsert":
+                    raise OperationFailure(f"unsupported update operator: {op}")
+        return updated
+
+    def _replace(self, old: dict, new: dict):
+        self._check_unique(new, ignore_id=old["_id"])
+        self._index_doc(old, remove=True)
+        self._docs[old["_id"]] = new
+        self._index_doc(new)
+
+    def _upsert(self, filter_dict: dict, update: dict) -> dict:
+        seed = {field: value for field, value in filter_dict.items()
+                if not field.startswith("$") and not isinstance(value, dict)}
+        doc = self._apply_update(seed, update, inserting=True)
+        self._insert(doc)
+        return doc
+
+    async def find_one_and_update(self, filter_dict: dict, update: dict, projection: Optional[dict] = None,
+                                  upsert: bool = False, return_document: bool = False, **kwargs) -> Optional[dict]:
+        docs, _ = self._select(filter_dict)
+        if not docs:
+            if not upsert:
+                return None
+            doc = self._upsert(filter_dict, update)
+            return self._project(doc, projection) if return_document else None
+        old = docs[0]
+        new = self._apply_update(old, update)
+        self._replace(old, new)
+        return self._project(new if return_document else old, projection)
+
+    async def update_one(self, filter_dict: dict, update: dict, upsert: bool = False) -> UpdateResult:
+        docs, _ = self._select(filter_dict)
+        if not docs:
+            if upsert:
+                doc = self._upsert(filter_dict, update)
+                return UpdateResult({"n": 1, "nModified": 0, "upserted": doc["_id"]}, True)
+            return UpdateResult({"n": 0, "nModified": 0}, True)
+        new = self._apply_update(docs[0], update)
+        modified = int(new != docs[0])
+        self._replace(docs[0], new)
+        return UpdateResult({"n": 1, "nModified": modified}, True)
+
+    async def bulk_write(self, requests: List[Any], ordered: bool = True) -> BulkWriteResult:
+        matched = modified = 0
+        for request in requests:
+            # UpdateOne keeps its arguments in private slots
+            result = await self.update_one(request._filter, request._doc, upsert=bool(request._upsert))
+            matched += result.matched_count
+            modified += result.modified_count
+        return BulkWriteResult({"nInserted": 0, "nUpserted": 0, "nMatched": matched, "nModified": modified,
+                                "nRemoved": 0, "upserted": [], "writeErrors": [], "writeConcernErrors": []}, True)
+
+    def _remove(self, doc: dict):
+        self._index_doc(doc, remove=True)
+        del self._docs[doc["_id"]]
+        del self._order[doc["_id"]]
+
+    async def delete_one(self, filter_dict: dict) -> DeleteResult:
+        docs, _ = self._select(filter_dict)
+        if docs:
+            self._remove(docs[0])
+        return DeleteResult({"n": len(docs[:1])}, True)
+
+    async def delete_many(self, filter_dict: dict) -> DeleteResult:
+        docs, _ = self._select(filter_dict)
+        for doc in docs:
+            self._remove(doc)
+        return DeleteResult({"n": len(docs)}, True)
+
+class _RawView:
+    """Collection view whose find() yields RawBSONDocument, like a raw codec_options collection"""
+
+    def __init__(self, collection: MemoryCollection):
+        self._collection = collection
+
+    def find(self, filter_dict: Optional[dict] = None, projection: Optional[dict] = None, **kwargs) -> MemoryCursor:
+        return MemoryCursor(self._collection, filter_dict, projection, raw=True)
+
+class MemoryDatabase:
+    def __init__(self, name: str):
+        self.name = name
+        self._collections: Dict[str, MemoryCollection] = {}
+
+    def __getitem__(self, name: str) -> MemoryCollection:
+        if name not in self._collections:
+            self._collections[name] = MemoryCollection(name)
+        return self._collections[name]
+
+    async def command(self, command: Any, **kwargs) -> dict:
+        return {"ok": 1.0}
+
+class MemoryClient:
+    """Stands in for AsyncIOMotorClient; databases live for the lifetime of the process"""
+
+    def __init__(self):
+        self._databases: Dict[str, MemoryDatabase] = {}
+        self.admin = MemoryDatabase("admin")
+
+    def __getitem__(self, name: str) -> MemoryDatabase:
+        if name not in self._databases:
+            self._databases[name] = MemoryDatabase(name)
+        return self._databases[name]
+
+    def close(self):
+        pass
@@ -302,4 +302,5 @@ class PaginatedResponse(BaseModel):
     total: int
     page: int
     limit: int
-    totalPages: int
\ No newline at end of file
+    totalPages: int
+    nextCursor: Optional[str] = None
\ No newline at end of file
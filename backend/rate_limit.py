@@ -0,0 +1,83 @@
+"""
+Sliding-window rate limiting with bounded memory
+"""
+import math
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+class SlidingWindowLimiter:
+    """Sliding-window counter: each key keeps the previous and current fixed-window
+    counts and the estimate weights the previous one by how much of it still
+    overlaps the sliding window. Keys are evicted least recently used first once
+    max_keys is reached, so address churn cannot grow memory without bound.
+    """
+
+    def __init__(self, limit: int, window: float, max_keys: int = 100000):
+        self.limit = limit
+        self.window = window
+        self.max_keys = max_keys
+        # key -> [current window index, previous count, current count]
+        self._counters: "OrderedDict[str, List[int]]" = OrderedDict()
+        self.rejected = 0
+
+    def _counter(self, key: str, window_index: int) -> List[int]:
+        counter = self._counters.get(key)
+        if counter is None:
+            counter = self._counters[key] = [window_index, 0, 0]
+            if len(self._counters) > self.max_keys:
+                self._counters.popitem(last=False)
+        else:
+            self._counters.move_to_end(key)
+            if counter[0] != window_index:
+                # Roll forward; a gap of more than one window empties both slots
+                previous = counter[2] if counter[0] == window_index - 1 else 0
+                counter[:] = [window_index, previous, 0]
+        return counter
+
+    def hit(self, key: str, now: Optional[float] = None) -> Tuple[bool, float]:
+        """Count a request for key; returns (allowed, seconds until a retry would be allowed)"""
+        now = time.time() if now is None else now
+        window_index = int(now // self.window)
+        elapsed = now - window_index * self.window
+        counter = self._counter(key, window_index)
+        _, previous, current = counter
+
+        estimate = previous * (1 - elapsed / self.window) + current
+        if estimate + 1 <= self.limit:
+            counter[2] += 1
+            return True, 0.0
+        self.rejected += 1
+        return False, self._retry_after(previous, current, elapsed)
+
+    def _retry_after(self, previous: int, current: int, elapsed: float) -> float:
+        remaining = self.window - elapsed
+        if current + 1 <= self.limit and previous:
+            # Wait for enough of the previous window to slide out
+            wait = self.window * (1 - (self.limit - 1 - current) / previous) - elapsed
+            if wait <= remaining:
+                return max(wait, 0.0)
+        # Otherwise wait into the next window, where the current count becomes the previous one
+        wait = remaining
+        if current:
+            wait += max(0.0, self.window * (1 - (self.limit - 1) / current))
+        return wait
+
+    def __len__(self) -> int:
+        return len(self._counters)
+
+def parse_rate_limits(spec: str) -> Dict[Tuple[str, str], Tuple[int, float]]:
+    """Parse 'METHOD route=limit/seconds;...' into {(method, route): (limit, seconds)}"""
+    limits = {}
+    for entry in spec.split(';'):
+        entry = entry.strip()
+        if not entry:
+            continue
+        target, _, budget = entry.rpartition('=')
+        method, _, route = target.strip().partition(' ')
+        limit, _, window = budget.partition('/')
+        limits[(method.upper(), route.strip())] = (int(limit), float(window or 60))
+    return limits
+
+def retry_after_header(seconds: float) -> str:
+    return str(max(1, math.ceil(seconds)))
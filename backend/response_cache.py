@@ -0,0 +1,164 @@
+"""
+In-process read-through cache for serialized public GET responses
+"""
+import gzip
+import time
+from collections import OrderedDict, defaultdict
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Preferred first; brotli is used only when the optional package is installed
+SUPPORTED_ENCODINGS = ("br", "gzip") if brotli is not None else ("gzip",)
+
+def compress(body: bytes, encoding: str) -> bytes:
+    """Compress a response body; cached variants are built once per content version"""
+    if encoding == "br":
+        return brotli.compress(body, quality=9)
+    return gzip.compress(body, compresslevel=9)
+
+def negotiate_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """Pick the best supported content coding from an Accept-Encoding header"""
+    if not accept_encoding:
+        return None
+    accepted = {}
+    for part in accept_encoding.split(','):
+        coding, _, params = part.strip().partition(';')
+        quality = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[coding.strip().lower()] = quality
+    for encoding in SUPPORTED_ENCODINGS:
+        if accepted.get(encoding, accepted.get('*', 0.0)) > 0:
+            return encoding
+    return None
+
+class CacheEntry:
+    __slots__ = ('body', 'media_type', 'collections', 'expires_at', 'etag', 'variants')
+
+    def __init__(self, body: bytes, media_type: str, collections: Tuple[str, ...], expires_at: float,
+                 etag: Optional[str] = None):
+        self.body = body
+        self.media_type = media_type
+        self.collections = collections
+        self.expires_at = expires_at
+        self.etag = etag
+        # Content coding -> compressed body
+        self.variants: Dict[str, bytes] = {}
+
+    @property
+    def size(self) -> int:
+        return len(self.body) + sum(len(variant) for variant in self.variants.values())
+
+class ResponseCache:
+    """LRU cache of response bodies bounded by total bytes, with per-entry TTL.
+
+    Entries are tagged with the collections they were built from so a write to
+    a collection drops exactly the responses that depend on it.
+    """
+
+    def __init__(self, max_bytes: int = 32 * 1024 * 1024, ttl: float = 60.0):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.size = 0
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._keys_by_collection: Dict[str, Set[str]] = defaultdict(set)
+        # Bumped on invalidation so responses computed across a write are not stored
+        self._generations: Dict[str, int] = defaultdict(int)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def generation(self, collections: Iterable[str]) -> Tuple[int, ...]:
+        return tuple(self._generations[name] for name in collections)
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        entry = self._entries.get(key)
+        if entry is None or entry.expires_at <= time.monotonic():
+            if entry is not None:
+                self._remove(key)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def set(self, key: str, body: bytes, media_type: str, collections: Tuple[str, ...],
+            generation: Optional[Tuple[int, ...]] = None, etag: Optional[str] = None) -> CacheEntry:
+        """Store a response; the entry is returned even when it is not kept"""
+        entry = CacheEntry(body, media_type, collections, time.monotonic() + self.ttl, etag)
+        if generation is not None and generation != self.generation(collections):
+            return entry  # a write landed while this response was being built
+        if len(body) > self.max_bytes:
+            return entry
+        if key in self._entries:
+            self._remove(key)
+
+        self._entries[key] = entry
+        self.size += len(body)
+        for name in collections:
+            self._keys_by_collection[name].add(key)
+        self._evict()
+        return entry
+
+    def add_variant(self, key: str, entry: CacheEntry, encoding: str, data: bytes) -> bytes:
+        """Record a compressed body for an entry and return the variant to serve.
+
+        Compression itself may run in a worker thread, but this must be called
+        on the event loop: it updates the entry, the byte count and evicts.
+        """
+        existing = entry.variants.get(encoding)
+        if existing is not None:
+            return existing  # another request compressed it first
+        entry.variants[encoding] = data
+        if self._entries.get(key) is entry:
+            self.size += len(data)
+            self._evict()
+        return data
+
+    def _evict(self):
+        while self.size > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def invalidate(self, collection_name: str):
+        self._generations[collection_name] += 1
+        for key in list(self._keys_by_collection.pop(collection_name, ())):
+            if key in self._entries:
+                self._remove(key)
+                self.invalidations += 1
+
+    def clear(self):
+        for name in list(self._keys_by_collection):
+            self.invalidate(name)
+
+    def _remove(self, key: str):
+        entry = self._entries.pop(key)
+        self.size -= entry.size
+        for name in entry.collections:
+            keys = self._keys_by_collection.get(name)
+            if keys is not None:
+                keys.discard(key)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self.size,
+            "maxBytes": self.max_bytes,
+            "ttlSeconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hitRatio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations
+        }
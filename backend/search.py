@@ -0,0 +1,69 @@
+"""
+Cross-collection full-text search built on the per-collection text indexes
+"""
+import asyncio
+import html
+import re
+from typing import Dict, List, Optional
+
+SNIPPET_RADIUS = 80
+
+def query_terms(query: str) -> List[str]:
+    """Split a search query into the lowercase words used for highlighting"""
+    return [term for term in re.findall(r'\w+', query.lower()) if len(term) > 1]
+
+def build_snippet(text: Optional[str], query: str, radius: int = SNIPPET_RADIUS) -> str:
+    """Cut a window of text around the first query match and wrap matches in <mark>"""
+    if not text:
+        return ""
+    terms = query_terms(query)
+    # Prefix matching approximates the stemming done by the text index
+    pattern = re.compile(r'\b(' + '|'.join(re.escape(term) for term in terms) + r')\w*', re.IGNORECASE) if terms else None
+
+    match = pattern.search(text) if pattern else None
+    start = max(match.start() - radius, 0) if match else 0
+    end = min(start + 2 * radius, len(text))
+    window = text[start:end]
+
+    # Match on the raw text and escape each piece, so a term never matches inside an entity
+    parts, position = [], 0
+    for term in (pattern.finditer(window) if pattern else ()):
+        parts.append(html.escape(window[position:term.start()]))
+        parts.append(f"<mark>{html.escape(term.group(0))}</mark>")
+        position = term.end()
+    parts.append(html.escape(window[position:]))
+    return ("…" if start > 0 else "") + "".join(parts) + ("…" if end < len(text) else "")
+
+async def search_collections(sources: Dict[str, tuple], query: str,
+                             skip: int = 0, limit: int = 10) -> dict:
+    """Relevance-ranked search over several collections.
+
+    sources maps a section name to (crud, title_field, snippet_field).
+    """
+    names = list(sources)
+    # Each collection must contribute its top skip+limit hits for the merged page to be correct
+    hits, totals = await asyncio.gather(
+        asyncio.gather(*(sources[name][0].search(query, skip=0, limit=skip + limit) for name in names)),
+        asyncio.gather(*(sources[name][0].search_count(query) for name in names))
+    )
+
+    items = []
+    for name, docs in zip(names, hits):
+        _, title_field, snippet_field = sources[name]
+        for doc in docs:
+            items.append({
+                "collection": name,
+                "id": doc["id"],
+                "title": doc.get(title_field),
+                "score": doc.get("score", 0),
+                "snippet": build_snippet(doc.get(snippet_field), query)
+            })
+    items.sort(key=lambda item: item["score"], reverse=True)
+
+    return {
+        "query": query,
+        "total": sum(totals),
+        "skip": skip,
+        "limit": limit,
+        "items": items[skip:skip + limit]
+    }
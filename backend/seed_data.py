@@ -3,6 +3,7 @@ Seed script to populate database with initial data from mock.js
 """
 import asyncio
 import os
+import uuid
 from datetime import datetime, date
 from database import (
     news_articles_crud, team_members_crud, research_projects_crud,
@@ -298,64 +299,54 @@ FAQ_DATA = [
     }
 ]
 
-async def seed_database():
-    """Seed the database with initial data"""
+SEED_COLLECTIONS = [
+    ("👥", "team members", team_members_crud, TEAM_MEMBERS),
+    ("📰", "news articles", news_articles_crud, NEWS_ARTICLES),
+    ("🔬", "research projects", research_projects_crud, RESEARCH_PROJECTS),
+    ("🤝", "partners", partners_crud, PARTNERS),
+    ("📚", "resources", resources_crud, RESOURCES),
+    ("💼", "job openings", job_openings_crud, JOB_OPENINGS),
+    ("💬", "testimonials", testimonials_crud, TESTIMONIALS),
+    ("❓", "FAQ items", faqs_crud, FAQ_DATA),
+]
+
+# Seed documents get deterministic ids, so a second seeding run (or two
+# workers seeding at once) is rejected by the unique 'id' index
+SEED_NAMESPACE = uuid.UUID("6f6e0c7a-3f4b-4d57-9a55-7761724f6273")
+
+def seed_id(crud, index: int) -> str:
+    return str(uuid.uuid5(SEED_NAMESPACE, f"{crud.collection_name}:{index}"))
+
+async def seed_collection(icon, label, crud, documents) -> int:
+    """Bulk insert one collection's seed documents; collections that already have data are skipped"""
+    if await crud.estimated_count():
+        print(f"⏭️  Skipping {label}: collection is not empty")
+        return 0
+    print(f"{icon} Seeding {label}...")
+    # Copy so the module-level seed data is not mutated by insert_many
+    result = await crud.create_many([
+        {"id": seed_id(crud, index), **document} for index, document in enumerate(documents)
+    ])
+    errors = [error for error in result["errors"] if "E11000" not in error["message"]]
+    if errors:
+        raise RuntimeError(f"{len(errors)} {label} failed to insert: {errors[0]['message']}")
+    print(f"✅ Created {result['inserted']} {label}")
+    return result["inserted"]
+
+async def seed_database() -> dict:
+    """Seed empty collections with initial data; safe to run repeatedly"""
     print("🌱 Starting database seeding...")
     
     try:
-        # Seed team members
-        print("👥 Seeding team members...")
-        for member_data in TEAM_MEMBERS:
-            await team_members_crud.create(member_data)
-        print(f"✅ Created {len(TEAM_MEMBERS)} team members")
-        
-        # Seed news articles
-        print("📰 Seeding news articles...")
-        for article_data in NEWS_ARTICLES:
-            await news_articles_crud.create(article_data)
-        print(f"✅ Created {len(NEWS_ARTICLES)} news articles")
-        
-        # Seed research projects
-        print("🔬 Seeding research projects...")
-        for project_data in RESEARCH_PROJECTS:
-            await research_projects_crud.create(project_data)
-        print(f"✅ Created {len(RESEARCH_PROJECTS)} research projects")
-        
-        # Seed partners
-        print("🤝 Seeding partners...")
-        for partner_data in PARTNERS:
-            await partners_crud.create(partner_data)
-        print(f"✅ Created {len(PARTNERS)} partners")
-        
-        # Seed resources
-        print("📚 Seeding resources...")
-        for resource_data in RESOURCES:
-            await resources_crud.create(resource_data)
-        print(f"✅ Created {len(RESOURCES)} resources")
-        
-        # Seed job openings
-        print("💼 Seeding job openings...")
-        for job_data in JOB_OPENINGS:
-            await job_openings_crud.create(job_data)
-        print(f"✅ Created {len(JOB_OPENINGS)} job openings")
-        
-        # Seed testimonials
-        print("💬 Seeding testimonials...")
-        for testimonial_data in TESTIMONIALS:
-            await testimonials_crud.create(testimonial_data)
-        print(f"✅ Created {len(TESTIMONIALS)} testimonials")
-        
-        # Seed FAQ
-        print("❓ Seeding FAQ...")
-        for faq_data in FAQ_DATA:
-            await faqs_crud.create(faq_data)
-        print(f"✅ Created {len(FAQ_DATA)} FAQ items")
+        # Collections are independent, so seed them concurrently
+        inserted = await asyncio.gather(*(seed_collection(*entry) for entry in SEED_COLLECTIONS))
         
         print("🎉 Database seeding completed successfully!")
+        return {crud.collection_name: count for (_, _, crud, _), count in zip(SEED_COLLECTIONS, inserted)}
         
     except Exception as e:
         print(f"❌ Error during database seeding: {str(e)}")
         raise
 
 if __name__ == "__main__":
-    asyncio.run(seed_database())
\ No newline at end of file
+    asyncio.run(seed_database())
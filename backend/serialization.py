@@ -0,0 +1,81 @@
+"""
+Single-pass serialization of MongoDB documents for responses and exports
+"""
+import csv
+import io
+from datetime import datetime
+from typing import Any, AsyncIterator, List
+
+import orjson
+from bson import Decimal128, ObjectId
+from pydantic import BaseModel
+from starlette.responses import JSONResponse
+
+def mongo_default(value: Any) -> Any:
+    """orjson fallback for the BSON and pydantic types it does not know natively"""
+    if isinstance(value, ObjectId):
+        return str(value)
+    if isinstance(value, Decimal128):
+        return str(value.to_decimal())
+    if isinstance(value, BaseModel):
+        return value.model_dump()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def dumps(content: Any) -> bytes:
+    """Serialize documents straight to JSON bytes; datetimes, enums and ObjectIds included"""
+    return orjson.dumps(content, default=mongo_default, option=orjson.OPT_NON_STR_KEYS)
+
+class MongoJSONResponse(JSONResponse):
+    """JSON response rendered by orjson in one native pass.
+
+    Returning an instance from a route skips FastAPI's jsonable_encoder, so
+    documents go from Motor to bytes without an intermediate copy.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+def csv_value(value: Any) -> Any:
+    """Flatten a document value into a single CSV cell"""
+    if value is None:
+        return ""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, (dict, list)):
+        return dumps(value).decode()
+    if isinstance(value, ObjectId):
+        return str(value)
+    return value
+
+async def ndjson_lines(docs: AsyncIterator[dict], chunk_size: int = 100) -> AsyncIterator[bytes]:
+    """One JSON document per line, yielded in chunks of chunk_size lines"""
+    chunk = []
+    async for doc in docs:
+        chunk.append(dumps(doc))
+        if len(chunk) >= chunk_size:
+            yield b"\n".join(chunk) + b"\n"
+            chunk = []
+    if chunk:
+        yield b"\n".join(chunk) + b"\n"
+
+async def csv_rows(docs: AsyncIterator[dict], columns: List[str] = None,
+                   chunk_size: int = 100) -> AsyncIterator[bytes]:
+    """CSV with a header row; without explicit columns the first document's keys are used"""
+    buffer = io.StringIO()
+    writer = None
+    rows = 0
+    async for doc in docs:
+        if writer is None:
+            columns = columns or list(doc.keys())
+            writer = csv.writer(buffer)
+            writer.writerow(columns)
+        writer.writerow([csv_value(doc.get(column)) for column in columns])
+        rows += 1
+        if rows % chunk_size == 0:
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+    if writer is None and columns:
+        csv.writer(buffer).writerow(columns)
+    if buffer.getvalue():
+        yield buffer.getvalue().encode()
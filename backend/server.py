@@ -1,19 +1,40 @@
-from fastapi import FastAPI, APIRouter, HTTPException, Query, Depends
+from fastapi import FastAPI, APIRouter, HTTPException, Query, Depends, Request, Response
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
+from starlette.middleware.gzip import GZipMiddleware
 import os
+import re
 import logging
 from pathlib import Path
-from typing import List, Optional
+from typing import Awaitable, List, Optional, Set
+from urllib.parse import urlencode
 import asyncio
+import hashlib
+import time
+import uuid
 
 # Import our models and database
 from models import *
 from database import (
     news_articles_crud, team_members_crud, research_projects_crud,
     partners_crud, resources_crud, job_openings_crud, contact_submissions_crud,
-    job_applications_crud, testimonials_crud, faqs_crud, donations_crud, database
+    job_applications_crud, testimonials_crud, faqs_crud, donations_crud, database,
+    idempotency_keys_crud, all_cruds, ensure_all_indexes, estimated_counts, change_listeners,
+    command_listeners, version_sync
 )
+from search import search_collections
+from counters import CounterBuffer
+from write_queue import SubmissionQueue, QueueFull
+from rate_limit import SlidingWindowLimiter, parse_rate_limits, retry_after_header
+from idempotency import IdempotencyStore, request_fingerprint
+from health import HealthMonitor, task_status
+from response_cache import ResponseCache, compress, negotiate_encoding
+from serialization import MongoJSONResponse, ndjson_lines, csv_rows
+from importer import iter_ndjson, iter_csv, import_rows
+from metrics import registry, CONTENT_TYPE as METRICS_CONTENT_TYPE
+from starlette.responses import StreamingResponse
+from starlette.routing import Match
+from bson import json_util
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
@@ -22,7 +43,8 @@ load_dotenv(ROOT_DIR / '.env')
 app = FastAPI(
     title="War:Observe API",
     description="API for War:Observe NGO website",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=MongoJSONResponse
 )
 
 # Create a router with the /api prefix
@@ -35,23 +57,44 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Utility function to convert datetime objects to strings for JSON serialization
-def serialize_datetime_fields(data):
-    """Convert datetime objects to ISO format strings in a document or list of documents"""
-    if isinstance(data, list):
-        for item in data:
-            serialize_datetime_fields(item)
-    elif isinstance(data, dict):
-        for key, value in data.items():
-            if hasattr(value, 'isoformat'):
-                data[key] = value.isoformat()
-    return data
-
 # Helper function for pagination
 def get_pagination_params(page: int = Query(1, ge=1), limit: int = Query(10, ge=1, le=100)):
     skip = (page - 1) * limit
     return skip, limit, page
 
+# Sparse fieldsets: ?fields=title,excerpt
+FIELD_NAME_PATTERN = re.compile(r'^[A-Za-z_][A-Za-z0-9_.]*$')
+
+def get_fields_param(fields: Optional[str] = Query(None, description="Comma-separated list of fields to return")):
+    if not fields:
+        return None
+    field_list = [field.strip() for field in fields.split(',') if field.strip()]
+    invalid = [field for field in field_list if not FIELD_NAME_PATTERN.match(field)]
+    if invalid:
+        raise HTTPException(status_code=400, detail=f"Invalid field names: {', '.join(invalid)}")
+    return field_list
+
+# Batched lookups: ?ids=a,b,c
+MAX_IDS_PER_REQUEST = 100
+
+def get_ids_param(ids: Optional[str] = Query(None, description="Comma-separated list of ids to fetch in one request")):
+    if not ids:
+        return None
+    id_list = [doc_id.strip() for doc_id in ids.split(',') if doc_id.strip()]
+    if len(id_list) > MAX_IDS_PER_REQUEST:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_IDS_PER_REQUEST} ids per request")
+    return id_list
+
+# Raw BSON pass-through: ?format=ejson
+def get_raw_param(format: Optional[str] = Query(
+    None, pattern="^ejson$",
+    description="'ejson' returns documents as relaxed Extended JSON converted straight from BSON"
+)):
+    return format == "ejson"
+
+def raw_json_response(body: bytes) -> Response:
+    return Response(content=body, media_type="application/json")
+
 # Root endpoint
 @api_router.get("/")
 async def root():
@@ -62,27 +105,52 @@ async def root():
 async def get_news_articles(
     skip: int = Query(0, ge=0),
     limit: int = Query(10, ge=1, le=100),
-    category: Optional[str] = None
+    category: Optional[str] = None,
+    after: Optional[str] = None,
+    ids: Optional[List[str]] = Depends(get_ids_param),
+    fields: Optional[List[str]] = Depends(get_fields_param),
+    raw: bool = Depends(get_raw_param)
 ):
-    """Get published news articles with optional category filtering"""
+    """Get published news articles with optional category filtering.
+
+    Passing 'after' (empty for the first page) switches to cursor pagination
+    and returns a PaginatedResponse whose nextCursor feeds the next request.
+    """
     try:
+        projection = news_articles_crud.projection(fields)
+        if ids:
+            return MongoJSONResponse(await news_articles_crud.get_many(ids, projection))
+        if after is not None:
+            filter_dict = {"category": category, "status": "published"} if category else None
+            page = await news_articles_crud.get_page(
+                filter_dict=filter_dict, limit=limit, sort_by="publishedDate", after=after,
+                projection=projection
+            )
+            return PaginatedResponse(**page)
+        if raw:
+            filter_dict = {"category": category, "status": "published"} if category else None
+            return raw_json_response(await news_articles_crud.get_all_raw(
+                filter_dict=filter_dict, skip=skip, limit=limit, sort_by="publishedDate", projection=projection
+            ))
         if category:
-            articles = await news_articles_crud.get_by_category(category, skip, limit)
+            articles = await news_articles_crud.get_by_category(category, skip, limit, projection)
         else:
-            articles = await news_articles_crud.get_all(skip=skip, limit=limit)  # Get all articles instead of just published
-        return serialize_datetime_fields(articles)
+            articles = await news_articles_crud.get_all(skip=skip, limit=limit, sort_by="publishedDate", projection=projection)  # Get all articles instead of just published
+        return MongoJSONResponse(articles)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Error fetching news articles: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
 @api_router.get("/news/{article_id}")
-async def get_news_article(article_id: str):
+async def get_news_article(article_id: str, fields: Optional[List[str]] = Depends(get_fields_param)):
     """Get a single news article by ID"""
     try:
-        article = await news_articles_crud.get_by_id(article_id)
+        article = await news_articles_crud.get_by_id(article_id, news_articles_crud.projection(fields, view="full"))
         if not article:
             raise HTTPException(status_code=404, detail="Article not found")
-        return serialize_datetime_fields(article)
+        return MongoJSONResponse(article)
     except HTTPException:
         raise
     except Exception as e:
@@ -93,35 +161,47 @@ async def get_news_article(article_id: str):
 async def get_news_by_category(
     category: str,
     skip: int = Query(0, ge=0),
-    limit: int = Query(10, ge=1, le=100)
+    limit: int = Query(10, ge=1, le=100),
+    fields: Optional[List[str]] = Depends(get_fields_param)
 ):
     """Get news articles by category"""
     try:
-        articles = await news_articles_crud.get_by_category(category, skip, limit)
-        return serialize_datetime_fields(articles)
+        projection = news_articles_crud.projection(fields)
+        articles = await news_articles_crud.get_by_category(category, skip, limit, projection)
+        return MongoJSONResponse(articles)
     except Exception as e:
         logger.error(f"Error fetching articles by category {category}: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
 # Team Members Endpoints
 @api_router.get("/team")
-async def get_team_members():
+async def get_team_members(
+    ids: Optional[List[str]] = Depends(get_ids_param),
+    fields: Optional[List[str]] = Depends(get_fields_param),
+    raw: bool = Depends(get_raw_param)
+):
     """Get all active team members"""
     try:
-        members = await team_members_crud.get_all()
-        return serialize_datetime_fields(members)
+        projection = team_members_crud.projection(fields)
+        if ids:
+            members = await team_members_crud.get_many(ids, projection)
+        elif raw:
+            return raw_json_response(await team_members_crud.get_all_raw(sort_order=1, projection=projection))
+        else:
+            members = await team_members_crud.get_all(sort_order=1, projection=projection)
+        return MongoJSONResponse(members)
     except Exception as e:
         logger.error(f"Error fetching team members: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
 @api_router.get("/team/{member_id}")
-async def get_team_member(member_id: str):
+async def get_team_member(member_id: str, fields: Optional[List[str]] = Depends(get_fields_param)):
     """Get a single team member by ID"""
     try:
-        member = await team_members_crud.get_by_id(member_id)
+        member = await team_members_crud.get_by_id(member_id, team_members_crud.projection(fields, view="full"))
         if not member:
             raise HTTPException(status_code=404, detail="Team member not found")
-        return serialize_datetime_fields(member)
+        return MongoJSONResponse(member)
     except HTTPException:
         raise
     except Exception as e:
@@ -130,23 +210,33 @@ async def get_team_member(member_id: str):
 
 # Research Projects Endpoints
 @api_router.get("/research")
-async def get_research_projects():
+async def get_research_projects(
+    ids: Optional[List[str]] = Depends(get_ids_param),
+    fields: Optional[List[str]] = Depends(get_fields_param),
+    raw: bool = Depends(get_raw_param)
+):
     """Get all research projects"""
     try:
-        projects = await research_projects_crud.get_all()
-        return serialize_datetime_fields(projects)
+        projection = research_projects_crud.projection(fields)
+        if ids:
+            projects = await research_projects_crud.get_many(ids, projection)
+        elif raw:
+            return raw_json_response(await research_projects_crud.get_all_raw(sort_order=1, projection=projection))
+        else:
+            projects = await research_projects_crud.get_all(sort_order=1, projection=projection)
+        return MongoJSONResponse(projects)
     except Exception as e:
         logger.error(f"Error fetching research projects: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
 @api_router.get("/research/{project_id}")
-async def get_research_project(project_id: str):
+async def get_research_project(project_id: str, fields: Optional[List[str]] = Depends(get_fields_param)):
     """Get a single research project by ID"""
     try:
-        project = await research_projects_crud.get_by_id(project_id)
+        project = await research_projects_crud.get_by_id(project_id, research_projects_crud.projection(fields, view="full"))
         if not project:
             raise HTTPException(status_code=404, detail="Research project not found")
-        return serialize_datetime_fields(project)
+        return MongoJSONResponse(project)
     except HTTPException:
         raise
     except Exception as e:
@@ -154,45 +244,73 @@ async def get_research_project(project_id: str):
         raise HTTPException(status_code=500, detail=str(e))
 
 @api_router.get("/research/status/{status}")
-async def get_research_by_status(status: str):
+async def get_research_by_status(status: str, fields: Optional[List[str]] = Depends(get_fields_param)):
     """Get research projects by status"""
     try:
-        projects = await research_projects_crud.get_by_status(status)
-        return serialize_datetime_fields(projects)
+        projects = await research_projects_crud.get_by_status(status, research_projects_crud.projection(fields))
+        return MongoJSONResponse(projects)
     except Exception as e:
         logger.error(f"Error fetching projects by status {status}: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
 # Partners Endpoints
 @api_router.get("/partners")
-async def get_partners():
+async def get_partners(
+    ids: Optional[List[str]] = Depends(get_ids_param),
+    fields: Optional[List[str]] = Depends(get_fields_param),
+    raw: bool = Depends(get_raw_param)
+):
     """Get all active partners"""
     try:
-        partners = await partners_crud.get_all()
-        return serialize_datetime_fields(partners)
+        projection = partners_crud.projection(fields)
+        if ids:
+            partners = await partners_crud.get_many(ids, projection)
+        elif raw:
+            return raw_json_response(await partners_crud.get_all_raw(sort_order=1, projection=projection))
+        else:
+            partners = await partners_crud.get_all(sort_order=1, projection=projection)
+        return MongoJSONResponse(partners)
     except Exception as e:
         logger.error(f"Error fetching partners: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
 # Resources Endpoints
 @api_router.get("/resources")
-async def get_resources():
+async def get_resources(
+    ids: Optional[List[str]] = Depends(get_ids_param),
+    fields: Optional[List[str]] = Depends(get_fields_param),
+    raw: bool = Depends(get_raw_param)
+):
     """Get all resources"""
     try:
-        resources = await resources_crud.get_all()
-        return serialize_datetime_fields(resources)
+        projection = resources_crud.projection(fields)
+        if ids:
+            resources = await resources_crud.get_many(ids, projection)
+        elif raw:
+            return raw_json_response(await resources_crud.get_all_raw(sort_order=1, projection=projection))
+        else:
+            resources = await resources_crud.get_all(sort_order=1, projection=projection)
+        return MongoJSONResponse(resources)
     except Exception as e:
         logger.error(f"Error fetching resources: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
+# Download clicks are counted in memory and written out in batches
+download_counter = CounterBuffer(
+    resources_crud.add_download_counts,
+    flush_interval=float(os.environ.get('DOWNLOAD_FLUSH_INTERVAL', '5'))
+)
+
 @api_router.get("/resources/download/{resource_id}")
 async def download_resource(resource_id: str):
-    """Increment download count and return download info"""
+    """Record a download and return download info"""
     try:
-        resource = await resources_crud.increment_download_count(resource_id)
+        resource = await resources_crud.get_download_info(resource_id)
         if not resource:
             raise HTTPException(status_code=404, detail="Resource not found")
         
+        download_counter.increment(resource["id"])
+        
         return {
             "success": True,
             "message": "Download count incremented",
@@ -207,23 +325,33 @@ async def download_resource(resource_id: str):
 
 # Job Openings Endpoints
 @api_router.get("/jobs")
-async def get_job_openings():
+async def get_job_openings(
+    ids: Optional[List[str]] = Depends(get_ids_param),
+    fields: Optional[List[str]] = Depends(get_fields_param),
+    raw: bool = Depends(get_raw_param)
+):
     """Get all active job openings"""
     try:
-        jobs = await job_openings_crud.get_all()
-        return serialize_datetime_fields(jobs)
+        projection = job_openings_crud.projection(fields)
+        if ids:
+            jobs = await job_openings_crud.get_many(ids, projection)
+        elif raw:
+            return raw_json_response(await job_openings_crud.get_all_raw(sort_order=1, projection=projection))
+        else:
+            jobs = await job_openings_crud.get_all(sort_order=1, projection=projection)
+        return MongoJSONResponse(jobs)
     except Exception as e:
         logger.error(f"Error fetching job openings: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
 @api_router.get("/jobs/{job_id}")
-async def get_job_opening(job_id: str):
+async def get_job_opening(job_id: str, fields: Optional[List[str]] = Depends(get_fields_param)):
     """Get a single job opening by ID"""
     try:
-        job = await job_openings_crud.get_by_id(job_id)
+        job = await job_openings_crud.get_by_id(job_id, job_openings_crud.projection(fields, view="full"))
         if not job:
             raise HTTPException(status_code=404, detail="Job opening not found")
-        return serialize_datetime_fields(job)
+        return MongoJSONResponse(job)
     except HTTPException:
         raise
     except Exception as e:
@@ -231,25 +359,44 @@ async def get_job_opening(job_id: str):
         raise HTTPException(status_code=500, detail=str(e))
 
 # Job Applications Endpoint
+# Public submissions are acknowledged immediately and inserted in batches
+submission_queue = SubmissionQueue(
+    max_size=int(os.environ.get('SUBMISSION_QUEUE_MAX_SIZE', '10000')),
+    batch_size=int(os.environ.get('SUBMISSION_BATCH_SIZE', '200')),
+    flush_interval=float(os.environ.get('SUBMISSION_FLUSH_INTERVAL', '0.05')),
+    max_retries=int(os.environ.get('SUBMISSION_MAX_RETRIES', '30'))
+)
+
+def enqueue_submission(crud, document: dict) -> str:
+    """Queue a submission, answering 503 when the queue is at capacity"""
+    try:
+        return submission_queue.submit(crud, document)
+    except QueueFull:
+        raise HTTPException(status_code=503, detail="Too many pending submissions, please retry shortly",
+                            headers={"Retry-After": "1"})
+
 @api_router.post("/jobs/{job_id}/apply")
 async def submit_job_application(job_id: str, application: JobApplicationCreate):
     """Submit a job application"""
     try:
         # Verify job exists
-        job = await job_openings_crud.get_by_id(job_id)
+        job = await job_openings_crud.get_by_id(job_id, {"id": 1})
         if not job:
             raise HTTPException(status_code=404, detail="Job opening not found")
         
         # Create application
         application_data = application.dict()
         application_data["jobId"] = job_id
+        # Stamped at acceptance, not at the batched insert; get_by_job sorts on it
+        application_data["status"] = ApplicationStatus.SUBMITTED.value
+        application_data["submittedAt"] = datetime.utcnow()
         
-        result = await job_applications_crud.create(application_data)
+        application_id = enqueue_submission(job_applications_crud, application_data)
         
         return APIResponse(
             success=True,
             message="Application submitted successfully",
-            data={"applicationId": result["id"]}
+            data={"applicationId": application_id}
         )
     except HTTPException:
         raise
@@ -262,79 +409,104 @@ async def submit_job_application(job_id: str, application: JobApplicationCreate)
 async def submit_contact_form(contact: ContactSubmissionCreate):
     """Submit a contact form"""
     try:
-        result = await contact_submissions_crud.create(contact.dict())
+        submission_id = enqueue_submission(contact_submissions_crud, contact.dict())
         
         return APIResponse(
             success=True,
             message="Contact form submitted successfully",
-            data={"submissionId": result["id"]}
+            data={"submissionId": submission_id}
         )
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error submitting contact form: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
 # Testimonials Endpoint
 @api_router.get("/testimonials")
-async def get_testimonials():
+async def get_testimonials(
+    ids: Optional[List[str]] = Depends(get_ids_param),
+    fields: Optional[List[str]] = Depends(get_fields_param),
+    raw: bool = Depends(get_raw_param)
+):
     """Get approved testimonials"""
     try:
-        testimonials = await testimonials_crud.get_all()
-        return serialize_datetime_fields(testimonials)
+        projection = testimonials_crud.projection(fields)
+        if ids:
+            testimonials = await testimonials_crud.get_many(ids, projection)
+        elif raw:
+            return raw_json_response(await testimonials_crud.get_all_raw(sort_order=1, projection=projection))
+        else:
+            testimonials = await testimonials_crud.get_all(sort_order=1, projection=projection)
+        return MongoJSONResponse(testimonials)
     except Exception as e:
         logger.error(f"Error fetching testimonials: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
 # FAQ Endpoint
 @api_router.get("/faq")
-async def get_faq():
+async def get_faq(
+    ids: Optional[List[str]] = Depends(get_ids_param),
+    fields: Optional[List[str]] = Depends(get_fields_param),
+    raw: bool = Depends(get_raw_param)
+):
     """Get active FAQ items"""
     try:
-        faqs = await faqs_crud.get_all()
-        return serialize_datetime_fields(faqs)
+        projection = faqs_crud.projection(fields)
+        if ids:
+            faqs = await faqs_crud.get_many(ids, projection)
+        elif raw:
+            return raw_json_response(await faqs_crud.get_all_raw(sort_order=1, projection=projection))
+        else:
+            faqs = await faqs_crud.get_all(sort_order=1, projection=projection)
+        return MongoJSONResponse(faqs)
     except Exception as e:
         logger.error(f"Error fetching FAQ: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
 # Donation Endpoints
+# Donation tiers (static data)
+DONATION_TIERS = {
+    "tiers": [
+        {
+            "id": "supporter",
+            "name": "Supporter",
+            "amount": 25,
+            "currency": "EUR",
+            "description": "Help us maintain our research databases and online resources.",
+            "benefits": ["Monthly newsletter", "Access to research summaries"]
+        },
+        {
+            "id": "advocate",
+            "name": "Advocate",
+            "amount": 50,
+            "currency": "EUR",
+            "description": "Support our training programs for young journalists.",
+            "benefits": ["Monthly newsletter", "Access to research summaries", "Invitation to webinars"]
+        },
+        {
+            "id": "partner",
+            "name": "Partner",
+            "amount": 100,
+            "currency": "EUR",
+            "description": "Fund field research and analytical projects.",
+            "benefits": ["Monthly newsletter", "Full research reports", "Webinar access", "Annual impact report"]
+        },
+        {
+            "id": "champion",
+            "name": "Champion",
+            "amount": 250,
+            "currency": "EUR",
+            "description": "Enable our comprehensive conflict analysis and documentation work.",
+            "benefits": ["All previous benefits", "Direct consultation opportunities", "Priority project updates"]
+        }
+    ]
+}
+
 @api_router.get("/donation-tiers")
 async def get_donation_tiers():
     """Get donation tier information (static data)"""
-    return {
-        "tiers": [
-            {
-                "id": "supporter",
-                "name": "Supporter",
-                "amount": 25,
-                "currency": "EUR",
-                "description": "Help us maintain our research databases and online resources.",
-                "benefits": ["Monthly newsletter", "Access to research summaries"]
-            },
-            {
-                "id": "advocate",
-                "name": "Advocate",
-                "amount": 50,
-                "currency": "EUR",
-                "description": "Support our training programs for young journalists.",
-                "benefits": ["Monthly newsletter", "Access to research summaries", "Invitation to webinars"]
-            },
-            {
-                "id": "partner",
-                "name": "Partner",
-                "amount": 100,
-                "currency": "EUR",
-                "description": "Fund field research and analytical projects.",
-                "benefits": ["Monthly newsletter", "Full research reports", "Webinar access", "Annual impact report"]
-            },
-            {
-                "id": "champion",
-                "name": "Champion",
-                "amount": 250,
-                "currency": "EUR",
-                "description": "Enable our comprehensive conflict analysis and documentation work.",
-                "benefits": ["All previous benefits", "Direct consultation opportunities", "Priority project updates"]
-            }
-        ]
-    }
+    return DONATION_TIERS
 
 @api_router.post("/donate")
 async def process_donation(donation: DonationCreate):
@@ -345,50 +517,236 @@ async def process_donation(donation: DonationCreate):
         donation_data["status"] = "completed"  # Simulated successful payment
         donation_data["paymentId"] = f"sim_{donation_data['donorName'].replace(' ', '_').lower()}_donation"
         
-        result = await donations_crud.create(donation_data)
+        donation_id = enqueue_submission(donations_crud, donation_data)
         
         return APIResponse(
             success=True,
             message="Donation processed successfully",
-            data={"donationId": result.get("id", result.get("_id")), "paymentId": donation_data["paymentId"]}
+            data={"donationId": donation_id, "paymentId": donation_data["paymentId"]}
         )
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error processing donation: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
-# Health check endpoint
-@api_router.get("/health")
-async def health_check():
-    """API health check"""
+# Home page bootstrap: every section the landing page renders, in one response
+async def settle(awaitable):
+    """Promise.allSettled-style outcome so one failing section does not fail the page"""
+    try:
+        return {"status": "fulfilled", "value": await awaitable}
+    except Exception as e:
+        logger.error(f"Error loading home section: {str(e)}")
+        return {"status": "rejected", "reason": {"message": str(e)}}
+
+async def static_value(value):
+    return value
+
+@api_router.get("/home")
+async def get_home():
+    """All landing page sections, read concurrently with per-section error isolation"""
+    sections = {
+        'news': news_articles_crud.get_all(
+            limit=10, sort_by="publishedDate", projection=news_articles_crud.projection()
+        ),
+        'team': team_members_crud.get_all(sort_order=1, projection=team_members_crud.projection()),
+        'research': research_projects_crud.get_all(sort_order=1, projection=research_projects_crud.projection()),
+        'partners': partners_crud.get_all(sort_order=1, projection=partners_crud.projection()),
+        'resources': resources_crud.get_all(sort_order=1, projection=resources_crud.projection()),
+        'jobs': job_openings_crud.get_all(sort_order=1, projection=job_openings_crud.projection()),
+        'faq': faqs_crud.get_all(sort_order=1, projection=faqs_crud.projection()),
+        'donationTiers': static_value(DONATION_TIERS)
+    }
+    results = await asyncio.gather(*(settle(section) for section in sections.values()))
+    # A page with a failed section must not be cached or revalidated once the fault clears
+    headers = {"Cache-Control": "no-store"} if any(r["status"] == "rejected" for r in results) else None
+    return MongoJSONResponse(dict(zip(sections, results)), headers=headers)
+
+# Search Endpoint
+SEARCH_SOURCES = {
+    'news': (news_articles_crud, 'title', 'content'),
+    'research': (research_projects_crud, 'title', 'description'),
+    'resources': (resources_crud, 'title', 'description'),
+    'faq': (faqs_crud, 'question', 'answer')
+}
+
+@api_router.get("/search")
+async def search(
+    q: str = Query(..., min_length=1, max_length=200),
+    collections: Optional[str] = Query(None, description="Comma-separated subset of: news, research, resources, faq"),
+    skip: int = Query(0, ge=0, le=1000),
+    limit: int = Query(10, ge=1, le=50)
+):
+    """Relevance-ranked full-text search with highlighted snippets"""
+    try:
+        sources = SEARCH_SOURCES
+        if collections:
+            requested = [name.strip() for name in collections.split(',') if name.strip()]
+            unknown = [name for name in requested if name not in SEARCH_SOURCES]
+            if unknown:
+                raise HTTPException(status_code=400, detail=f"Unknown collections: {', '.join(unknown)}")
+            sources = {name: SEARCH_SOURCES[name] for name in requested}
+        
+        return MongoJSONResponse(await search_collections(sources, q, skip, limit))
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error searching for '{q}': {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+# Health checks: /api/live (process), /api/ready (can serve traffic), /api/health (full report)
+HEALTH_LOOP_LAG_DEGRADED_MS = float(os.environ.get('HEALTH_LOOP_LAG_DEGRADED_MS', '200'))
+HEALTH_LOOP_LAG_FAILED_MS = float(os.environ.get('HEALTH_LOOP_LAG_FAILED_MS', '5000'))
+# Fraction of the pool (or submission queue) in use above which a worker reports degraded
+HEALTH_SATURATION_DEGRADED = float(os.environ.get('HEALTH_SATURATION_DEGRADED', '0.9'))
+health_monitor = HealthMonitor(
+    ping=lambda: database.client.admin.command('ping'),
+    ping_timeout=float(os.environ.get('HEALTH_PING_TIMEOUT', '1')),
+    ping_cache_seconds=float(os.environ.get('HEALTH_PING_CACHE_SECONDS', '3'))
+)
+
+# False until startup has warmed connections and caches (retried in the
+# background when it fails, see retry_startup), and again while shutting down
+app.state.ready = False
+
+def background_tasks() -> dict:
     return {
-        "status": "healthy",
-        "message": "War:Observe API is running",
-        "timestamp": datetime.utcnow().isoformat()
+        "downloadCounter": task_status(download_counter.task),
+        "submissionQueue": task_status(submission_queue.task),
+        "loopLagMonitor": task_status(health_monitor.task),
+        "versionSync": task_status(version_sync.task),
+    }
+
+def liveness_report() -> dict:
+    """Process-local checks only; a dead database must not get the worker restarted"""
+    lag = health_monitor.loop_lag()
+    tasks = background_tasks()
+    if lag["maxMs"] >= HEALTH_LOOP_LAG_FAILED_MS:
+        lag["status"] = "stalled"
+    elif lag["maxMs"] >= HEALTH_LOOP_LAG_DEGRADED_MS:
+        lag["status"] = "degraded"
+    else:
+        lag["status"] = "ok"
+    
+    if lag["status"] == "stalled" or "failed" in tasks.values():
+        status = "unhealthy"
+    elif lag["status"] == "degraded":
+        status = "degraded"
+    else:
+        status = "healthy"
+    return {"status": status, "eventLoop": lag, "backgroundTasks": tasks}
+
+async def readiness_report() -> dict:
+    """Liveness plus the database ping, pool saturation and submission backlog"""
+    report = liveness_report()
+    pool = database.pool_stats()
+    saturation = pool["checkedOut"] / pool["maxPoolSize"] if pool["maxPoolSize"] else 0.0
+    backlog = submission_queue.depth / submission_queue.max_size if submission_queue.max_size else 0.0
+    checks = {
+        "database": await health_monitor.database(),
+        "pool": {
+            "checkedOut": pool["checkedOut"],
+            "maxPoolSize": pool["maxPoolSize"],
+            "saturation": round(saturation, 3),
+            "status": "degraded" if saturation >= HEALTH_SATURATION_DEGRADED else "ok"
+        },
+        "submissionQueue": {
+            "depth": submission_queue.depth,
+            "maxSize": submission_queue.max_size,
+            "status": "degraded" if backlog >= HEALTH_SATURATION_DEGRADED else "ok"
+        }
     }
+    
+    if checks["database"]["status"] != "ok":
+        report["status"] = "unhealthy"
+    elif report["status"] == "healthy" and any(check["status"] == "degraded" for check in checks.values()):
+        report["status"] = "degraded"
+    report.update(checks)
+    return report
+
+def health_response(report: dict) -> MongoJSONResponse:
+    """200 while the worker can serve (healthy or degraded), 503 otherwise"""
+    report["timestamp"] = datetime.utcnow().isoformat()
+    status_code = 503 if report["status"] in ("unhealthy", "starting") else 200
+    return MongoJSONResponse(report, status_code=status_code, headers={"Cache-Control": "no-store"})
+
+@api_router.get("/live")
+async def liveness_check():
+    """Liveness: the event loop is responsive and background tasks have not crashed"""
+    return health_response(liveness_report())
+
+@api_router.get("/ready")
+async def readiness_check():
+    """Readiness: warmed up and MongoDB answers; 503 tells load balancers to hold traffic"""
+    if not app.state.ready:
+        return health_response({"status": "starting", "startupError": app.state.startup_error})
+    return health_response(await readiness_report())
+
+@api_router.get("/health")
+async def health_check():
+    """Full health report: database ping latency, pool saturation, event-loop lag and background tasks"""
+    report = await readiness_report()
+    report["message"] = "War:Observe API is running"
+    report["ready"] = app.state.ready
+    if app.state.startup_error:
+        report["startupError"] = app.state.startup_error
+    return health_response(report)
 
 # Admin CRUD endpoints
+ADMIN_CRUD_INSTANCES = {
+    'news_articles': news_articles_crud,
+    'team_members': team_members_crud,
+    'research_projects': research_projects_crud,
+    'partners': partners_crud,
+    'resources': resources_crud,
+    'job_openings': job_openings_crud,
+    'testimonials': testimonials_crud,
+    'faq': faqs_crud,
+    'donations': donations_crud
+}
+
+def get_admin_crud(collection_name: str):
+    """Resolve an admin collection name to its CRUD instance"""
+    if collection_name not in ADMIN_CRUD_INSTANCES:
+        raise HTTPException(status_code=404, detail="Collection not found")
+    return ADMIN_CRUD_INSTANCES[collection_name]
+
+def coerce_datetime_fields(data: dict) -> dict:
+    """Convert datetime strings to datetime objects if needed"""
+    for key, value in data.items():
+        if isinstance(value, str) and ('date' in key.lower() or 'at' in key.lower()):
+            try:
+                data[key] = datetime.fromisoformat(value.replace('Z', '+00:00'))
+            except ValueError:
+                pass  # Keep as string if parsing fails
+    return data
+
+@api_router.post("/admin/seed")
+async def seed_collections():
+    """Seed empty collections with the initial content; collections that have data are left alone"""
+    try:
+        from seed_data import seed_database
+        inserted = await seed_database()
+        return APIResponse(
+            success=True,
+            message=f"Seeded {sum(1 for count in inserted.values() if count)} collections",
+            data={"inserted": inserted}
+        )
+    except Exception as e:
+        logger.error(f"Error seeding database: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
 @api_router.get("/admin/collections")
 async def get_collections_info():
     """Get information about all collections"""
     try:
+        counts = await estimated_counts(list(ADMIN_CRUD_INSTANCES.values()))
         collections_info = []
-        crud_instances = {
-            'news_articles': news_articles_crud,
-            'team_members': team_members_crud,
-            'research_projects': research_projects_crud,
-            'partners': partners_crud,
-            'resources': resources_crud,
-            'job_openings': job_openings_crud,
-            'testimonials': testimonials_crud,
-            'faq': faqs_crud,
-            'donations': donations_crud
-        }
-        
-        for name, crud in crud_instances.items():
-            count = await crud.count()
+        for name, count in zip(ADMIN_CRUD_INSTANCES, counts):
             collections_info.append({
                 'name': name,
                 'count': count,
+                'countExact': False,  # collection metadata estimate, cached briefly
                 'display_name': name.replace('_', ' ').title()
             })
         
@@ -396,28 +754,44 @@ async def get_collections_info():
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@api_router.get("/admin/pool")
+async def get_pool_stats():
+    """MongoDB connection pool usage: checked-out connections, wait time and churn"""
+    return database.pool_stats()
+
+@api_router.get("/admin/cache")
+async def get_cache_stats():
+    """Response cache hit/miss statistics"""
+    return response_cache.stats()
+
+@api_router.get("/admin/queue")
+async def get_queue_stats():
+    """Submission queue depth and write counts"""
+    return submission_queue.stats()
+
 @api_router.get("/admin/{collection_name}")
-async def get_collection_data(collection_name: str, skip: int = 0, limit: int = 50):
-    """Get all data from a specific collection"""
-    try:
-        crud_instances = {
-            'news_articles': news_articles_crud,
-            'team_members': team_members_crud,
-            'research_projects': research_projects_crud,
-            'partners': partners_crud,
-            'resources': resources_crud,
-            'job_openings': job_openings_crud,
-            'testimonials': testimonials_crud,
-            'faq': faqs_crud,
-            'donations': donations_crud
-        }
+async def get_collection_data(
+    collection_name: str,
+    skip: int = 0,
+    limit: int = 50,
+    sort_by: str = "_id",
+    sort_order: int = Query(-1, ge=-1, le=1),
+    after: Optional[str] = None
+):
+    """Get all data from a specific collection (cursor pagination when 'after' is passed)"""
+    try:
+        crud = get_admin_crud(collection_name)
+        if sort_order == 0:
+            raise HTTPException(status_code=400, detail="sort_order must be 1 or -1")
         
-        if collection_name not in crud_instances:
-            raise HTTPException(status_code=404, detail="Collection not found")
+        if after is not None:
+            page = await crud.get_page(limit=limit, sort_by=sort_by, sort_order=sort_order, after=after)
+            return {"collection": collection_name, **PaginatedResponse(**page).dict()}
         
-        crud = crud_instances[collection_name]
-        data = await crud.get_all(skip=skip, limit=limit)
-        total = await crud.count()
+        data, total = await asyncio.gather(
+            crud.get_all(skip=skip, limit=limit, sort_by=sort_by, sort_order=sort_order),
+            crud.count()
+        )
         
         return {
             "collection": collection_name,
@@ -428,29 +802,70 @@ async def get_collection_data(collection_name: str, skip: int = 0, limit: int =
         }
     except HTTPException:
         raise  # Re-raise HTTPExceptions as-is
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+# Streaming export
+EXPORT_BATCH_SIZE = int(os.environ.get('EXPORT_BATCH_SIZE', '1000'))
+# Query operators accepted in export filters; anything else (e.g. $where) is rejected
+FILTER_OPERATORS = {
+    '$eq', '$ne', '$gt', '$gte', '$lt', '$lte', '$in', '$nin', '$exists',
+    '$regex', '$options', '$and', '$or', '$nor', '$not'
+}
+
+def check_filter_operators(value):
+    if isinstance(value, dict):
+        for key, item in value.items():
+            if key.startswith('$') and key not in FILTER_OPERATORS:
+                raise HTTPException(status_code=400, detail=f"Filter operator {key} is not allowed")
+            check_filter_operators(item)
+    elif isinstance(value, list):
+        for item in value:
+            check_filter_operators(item)
+
+def parse_filter_param(filter: Optional[str] = Query(
+    None, description='MongoDB filter as Extended JSON, e.g. {"status": "completed"}'
+)):
+    if not filter:
+        return {}
+    try:
+        filter_dict = json_util.loads(filter)
+    except Exception:
+        raise HTTPException(status_code=400, detail="filter must be valid JSON")
+    if not isinstance(filter_dict, dict):
+        raise HTTPException(status_code=400, detail="filter must be a JSON object")
+    check_filter_operators(filter_dict)
+    return filter_dict
+
+@api_router.get("/admin/{collection_name}/export")
+async def export_collection(
+    collection_name: str,
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    filter_dict: dict = Depends(parse_filter_param),
+    fields: Optional[List[str]] = Depends(get_fields_param)
+):
+    """Stream a whole collection as NDJSON or CSV with constant memory use"""
+    crud = get_admin_crud(collection_name)
+    projection = crud.projection(fields, view="full")
+    docs = crud.iter_documents(filter_dict, projection, batch_size=EXPORT_BATCH_SIZE)
+    
+    if format == "csv":
+        columns = ["id"] + [field for field in fields if field != "id"] if fields else None
+        body, media_type = csv_rows(docs, columns), "text/csv"
+    else:
+        body, media_type = ndjson_lines(docs), "application/x-ndjson"
+    
+    return StreamingResponse(body, media_type=media_type, headers={
+        "Content-Disposition": f'attachment; filename="{collection_name}.{format}"'
+    })
+
 @api_router.get("/admin/{collection_name}/{item_id}")
 async def get_item_by_id(collection_name: str, item_id: str):
     """Get specific item by ID"""
     try:
-        crud_instances = {
-            'news_articles': news_articles_crud,
-            'team_members': team_members_crud,
-            'research_projects': research_projects_crud,
-            'partners': partners_crud,
-            'resources': resources_crud,
-            'job_openings': job_openings_crud,
-            'testimonials': testimonials_crud,
-            'faq': faqs_crud,
-            'donations': donations_crud
-        }
-        
-        if collection_name not in crud_instances:
-            raise HTTPException(status_code=404, detail="Collection not found")
-        
-        crud = crud_instances[collection_name]
+        crud = get_admin_crud(collection_name)
         item = await crud.get_by_id(item_id)
         
         if not item:
@@ -466,36 +881,14 @@ async def get_item_by_id(collection_name: str, item_id: str):
 async def update_item(collection_name: str, item_id: str, update_data: dict):
     """Update specific item"""
     try:
-        crud_instances = {
-            'news_articles': news_articles_crud,
-            'team_members': team_members_crud,
-            'research_projects': research_projects_crud,
-            'partners': partners_crud,
-            'resources': resources_crud,
-            'job_openings': job_openings_crud,
-            'testimonials': testimonials_crud,
-            'faq': faqs_crud,
-            'donations': donations_crud
-        }
-        
-        if collection_name not in crud_instances:
-            raise HTTPException(status_code=404, detail="Collection not found")
-        
-        crud = crud_instances[collection_name]
+        crud = get_admin_crud(collection_name)
         
         # Remove system fields that shouldn't be updated
         system_fields = ['id', '_id', 'createdAt']
         for field in system_fields:
             update_data.pop(field, None)
         
-        # Convert datetime strings to datetime objects if needed
-        for key, value in update_data.items():
-            if isinstance(value, str) and ('date' in key.lower() or 'at' in key.lower()):
-                try:
-                    from datetime import datetime
-                    update_data[key] = datetime.fromisoformat(value.replace('Z', '+00:00'))
-                except:
-                    pass  # Keep as string if parsing fails
+        coerce_datetime_fields(update_data)
         
         updated_item = await crud.update(item_id, update_data)
         
@@ -516,22 +909,7 @@ async def update_item(collection_name: str, item_id: str, update_data: dict):
 async def delete_item(collection_name: str, item_id: str):
     """Delete specific item"""
     try:
-        crud_instances = {
-            'news_articles': news_articles_crud,
-            'team_members': team_members_crud,
-            'research_projects': research_projects_crud,
-            'partners': partners_crud,
-            'resources': resources_crud,
-            'job_openings': job_openings_crud,
-            'testimonials': testimonials_crud,
-            'faq': faqs_crud,
-            'donations': donations_crud
-        }
-        
-        if collection_name not in crud_instances:
-            raise HTTPException(status_code=404, detail="Collection not found")
-        
-        crud = crud_instances[collection_name]
+        crud = get_admin_crud(collection_name)
         success = await crud.delete(item_id)
         
         if not success:
@@ -550,31 +928,9 @@ async def delete_item(collection_name: str, item_id: str):
 async def create_item(collection_name: str, item_data: dict):
     """Create new item in collection"""
     try:
-        crud_instances = {
-            'news_articles': news_articles_crud,
-            'team_members': team_members_crud,
-            'research_projects': research_projects_crud,
-            'partners': partners_crud,
-            'resources': resources_crud,
-            'job_openings': job_openings_crud,
-            'testimonials': testimonials_crud,
-            'faq': faqs_crud,
-            'donations': donations_crud
-        }
-        
-        if collection_name not in crud_instances:
-            raise HTTPException(status_code=404, detail="Collection not found")
-        
-        crud = crud_instances[collection_name]
+        crud = get_admin_crud(collection_name)
         
-        # Convert datetime strings to datetime objects if needed
-        for key, value in item_data.items():
-            if isinstance(value, str) and ('date' in key.lower() or 'at' in key.lower()):
-                try:
-                    from datetime import datetime
-                    item_data[key] = datetime.fromisoformat(value.replace('Z', '+00:00'))
-                except:
-                    pass  # Keep as string if parsing fails
+        coerce_datetime_fields(item_data)
         
         new_item = await crud.create(item_data)
         
@@ -588,9 +944,454 @@ async def create_item(collection_name: str, item_data: dict):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@api_router.post("/admin/{collection_name}/bulk")
+async def create_items_bulk(collection_name: str, items: List[dict]):
+    """Create many items in a collection with a single unordered insert"""
+    try:
+        crud = get_admin_crud(collection_name)
+        
+        if not items:
+            raise HTTPException(status_code=400, detail="No items provided")
+        
+        for item_data in items:
+            coerce_datetime_fields(item_data)
+        
+        result = await crud.create_many(items)
+        
+        return APIResponse(
+            success=not result["errors"],
+            message=f"Inserted {result['inserted']} of {len(items)} items",
+            data=result
+        )
+    except HTTPException:
+        raise  # Re-raise HTTPExceptions as-is
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+# Streaming import; rows are validated against the collection's full model so an
+# export can be imported back without losing server-side fields
+IMPORT_BATCH_SIZE = int(os.environ.get('IMPORT_BATCH_SIZE', '500'))
+ADMIN_IMPORT_MODELS = {
+    'news_articles': NewsArticle,
+    'team_members': TeamMember,
+    'research_projects': ResearchProject,
+    'partners': Partner,
+    'resources': Resource,
+    'job_openings': JobOpening,
+    'testimonials': Testimonial,
+    'faq': FAQ,
+    'donations': Donation
+}
+
+@api_router.post("/admin/{collection_name}/import")
+async def import_collection(
+    collection_name: str,
+    request: Request,
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$")
+):
+    """Import an NDJSON or CSV body in batches; invalid rows are reported, not fatal"""
+    try:
+        crud = get_admin_crud(collection_name)
+        model = ADMIN_IMPORT_MODELS[collection_name]
+        
+        rows = iter_csv(request.stream()) if format == "csv" else iter_ndjson(request.stream())
+        report = await import_rows(crud, model, rows, batch_size=IMPORT_BATCH_SIZE)
+        
+        if not report["received"]:
+            raise HTTPException(status_code=400, detail="No rows provided")
+        
+        return APIResponse(
+            success=not report["failed"],
+            message=f"Imported {report['inserted']} of {report['received']} rows",
+            data=report
+        )
+    except HTTPException:
+        raise  # Re-raise HTTPExceptions as-is
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail="Body must be UTF-8 encoded")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
 # Include the router in the main app
 app.include_router(api_router)
 
+# Response cache for public GET endpoints; entries are dropped when their collections change
+response_cache = ResponseCache(
+    max_bytes=int(os.environ.get('RESPONSE_CACHE_MAX_BYTES', str(32 * 1024 * 1024))),
+    ttl=float(os.environ.get('RESPONSE_CACHE_TTL', '60'))
+)
+change_listeners.append(response_cache.invalidate)
+
+# First path segment under /api -> collections the response is built from
+CACHED_ROUTES = {
+    'news': ('news_articles',),
+    'team': ('team_members',),
+    'research': ('research_projects',),
+    'partners': ('partners',),
+    'resources': ('resources',),
+    'jobs': ('job_openings',),
+    'testimonials': ('testimonials',),
+    'faq': ('faq',),
+    'search': ('news_articles', 'research_projects', 'resources', 'faq'),
+    'home': ('news_articles', 'team_members', 'research_projects', 'partners', 'resources', 'job_openings', 'faq')
+}
+
+def cached_collections(request: Request):
+    """Collections backing a cacheable request, or None when it must not be cached"""
+    if request.method != "GET":
+        return None
+    parts = request.url.path.strip('/').split('/')
+    if len(parts) < 2 or parts[0] != 'api':
+        return None
+    if parts[1] == 'resources' and len(parts) > 2 and parts[2] == 'download':
+        return None  # records a download on every call
+    return CACHED_ROUTES.get(parts[1])
+
+def response_cache_key(request: Request) -> str:
+    query = urlencode(sorted(request.query_params.multi_items()))
+    return f"{request.url.path}?{query}"
+
+# Conditional requests: strong ETags derived from collection version stamps.
+# Stamps are shared between workers (database.VersionSync), so another
+# worker's write changes this worker's ETags within VERSION_SYNC_INTERVAL.
+CACHE_CONTROL = os.environ.get('CACHE_CONTROL', 'public, max-age=0, stale-while-revalidate=60')
+# Optionally also rotate ETags every ETAG_WINDOW_SECONDS as an upper bound on revalidation
+ETAG_WINDOW_SECONDS = float(os.environ.get('ETAG_WINDOW_SECONDS', '0'))
+
+# Bodies smaller than this are sent uncompressed
+COMPRESSION_MIN_SIZE = int(os.environ.get('COMPRESSION_MIN_SIZE', '1024'))
+
+def compute_etag(key: str, collections) -> str:
+    stamp = ":".join(version_sync.stamp(name) for name in collections)
+    if ETAG_WINDOW_SECONDS:
+        stamp += f":{int(time.time() // ETAG_WINDOW_SECONDS)}"
+    return '"' + hashlib.sha1(f"{key}|{stamp}".encode()).hexdigest() + '"'
+
+def encoded_etag(etag: str, encoding: Optional[str]) -> str:
+    """Strong ETags must differ between content codings of the same resource"""
+    return f'{etag[:-1]}-{encoding}"' if encoding else etag
+
+def etag_matches(if_none_match: Optional[str], etags) -> Optional[str]:
+    """The ETag from etags that If-None-Match lists, or None.
+
+    '*' is not handled here: it matches any current representation, which is
+    only known once the handler (or the cache) has produced one.
+    """
+    if not if_none_match:
+        return None
+    candidates = [tag.strip() for tag in if_none_match.split(',')]
+    # If-None-Match uses weak comparison
+    candidates = {tag[2:] if tag.startswith('W/') else tag for tag in candidates}
+    return next((etag for etag in etags if etag in candidates), None)
+
+def matches_any(if_none_match: Optional[str]) -> bool:
+    return bool(if_none_match) and any(tag.strip() == '*' for tag in if_none_match.split(','))
+
+async def cached_response(key: str, entry, encoding: Optional[str], headers: dict,
+                          not_modified: bool = False) -> Response:
+    """Serve a cache entry, using (and filling) its precompressed variant when negotiated"""
+    if not encoding or len(entry.body) < COMPRESSION_MIN_SIZE:
+        encoding = None
+    if entry.etag:
+        headers["ETag"] = encoded_etag(entry.etag, encoding)
+    headers["Vary"] = "Accept-Encoding"
+    headers["Cache-Control"] = CACHE_CONTROL
+    if not_modified:
+        return Response(status_code=304, headers=headers)
+    
+    body = entry.body
+    if encoding:
+        if encoding in entry.variants:
+            body = entry.variants[encoding]
+        else:
+            # Only the compression runs in a thread; the cache is updated back on the loop
+            compressed = await asyncio.to_thread(compress, entry.body, encoding)
+            body = response_cache.add_variant(key, entry, encoding, compressed)
+        headers["Content-Encoding"] = encoding
+    return Response(content=body, media_type=entry.media_type, headers=headers)
+
+@app.middleware("http")
+async def response_cache_middleware(request: Request, call_next):
+    collections = cached_collections(request)
+    if collections is None:
+        return await call_next(request)
+    
+    key = response_cache_key(request)
+    encoding = negotiate_encoding(request.headers.get("accept-encoding"))
+    etag = compute_etag(key, collections)
+    if_none_match = request.headers.get("if-none-match")
+    matched = etag_matches(if_none_match, (encoded_etag(etag, encoding), etag))
+    if matched:
+        # Echo the tag the client sent, which may be a content-coding variant
+        return Response(status_code=304, headers={
+            "ETag": matched, "Cache-Control": CACHE_CONTROL, "Vary": "Accept-Encoding"
+        })
+    
+    entry = response_cache.get(key)
+    if entry is not None:
+        return await cached_response(key, entry, encoding, {"X-Cache": "HIT"}, matches_any(if_none_match))
+    
+    generation = response_cache.generation(collections)
+    response = await call_next(request)
+    # Handlers opt out with no-store, e.g. a degraded /api/home
+    if response.status_code != 200 or "no-store" in response.headers.get("cache-control", ""):
+        return response
+    
+    body = b"".join([chunk async for chunk in response.body_iterator])
+    media_type = response.headers.get("content-type", "application/json")
+    # A write during the read means the body may not match the pre-read stamps
+    if compute_etag(key, collections) != etag:
+        etag = None
+    entry = response_cache.set(key, body, media_type, collections, generation, etag)
+    return await cached_response(key, entry, encoding, {"X-Cache": "MISS"}, matches_any(if_none_match))
+
+# Idempotency-Key support: a retried submission replays the first response instead of writing again
+IDEMPOTENT_ROUTES = {
+    ("POST", "/api/donate"),
+    ("POST", "/api/contact"),
+    ("POST", "/api/jobs/{job_id}/apply"),
+}
+IDEMPOTENCY_KEY_MAX_LENGTH = 255
+idempotency_store = IdempotencyStore(
+    max_entries=int(os.environ.get('IDEMPOTENCY_MAX_ENTRIES', '10000')),
+    ttl=float(os.environ.get('IDEMPOTENCY_KEY_TTL', '86400'))
+)
+
+# Durable key writes the request does not wait for, kept so shutdown can flush them
+idempotency_writes: Set[asyncio.Task] = set()
+
+def write_in_background(write: Awaitable, description: str):
+    async def run():
+        try:
+            await write
+        except Exception as e:
+            logger.error(f"Error {description}: {str(e)}")
+    task = asyncio.create_task(run())
+    idempotency_writes.add(task)
+    task.add_done_callback(idempotency_writes.discard)
+
+def idempotent_replay(response: dict) -> Response:
+    return Response(content=response["body"], status_code=response["status"], media_type=response["mediaType"],
+                    headers={"Idempotent-Replayed": "true"})
+
+def idempotency_error(status_code: int, detail: str, headers: Optional[dict] = None) -> Response:
+    return MongoJSONResponse({"detail": detail}, status_code=status_code, headers=headers)
+
+@app.middleware("http")
+async def idempotency_middleware(request: Request, call_next):
+    idempotency_key = request.headers.get("idempotency-key")
+    if not idempotency_key or request.method != "POST":
+        return await call_next(request)
+    if (request.method, route_template(request)) not in IDEMPOTENT_ROUTES:
+        return await call_next(request)
+    if len(idempotency_key) > IDEMPOTENCY_KEY_MAX_LENGTH:
+        return idempotency_error(400, f"Idempotency-Key must be at most {IDEMPOTENCY_KEY_MAX_LENGTH} characters")
+    
+    key = f"{request.url.path}|{idempotency_key}"
+    fingerprint = request_fingerprint(request.method, request.url.path, await request.body())
+    
+    while True:
+        # Completed in this worker: a memory lookup
+        completed = idempotency_store.get(key)
+        if completed is not None:
+            if completed[0] != fingerprint:
+                return idempotency_error(422, "Idempotency-Key was already used with a different request")
+            idempotency_store.replays += 1
+            return idempotent_replay(completed[1])
+        
+        # Running in this worker: wait for the first execution
+        in_flight = idempotency_store.in_flight(key)
+        if in_flight is None:
+            break
+        if in_flight[0] != fingerprint:
+            return idempotency_error(422, "Idempotency-Key was already used with a different request")
+        if await asyncio.shield(in_flight[1]) is None:
+            continue  # the first execution failed; run it again unless another retry got there first
+    
+    idempotency_store.begin(key, fingerprint)
+    owner = str(uuid.uuid4())
+    reserved = False
+    stored = None
+    try:
+        # Claimed durably so retries landing on other workers do not execute it too
+        existing = await idempotency_keys_crud.reserve(key, fingerprint, owner)
+        if existing is not None:
+            if existing["fingerprint"] != fingerprint:
+                return idempotency_error(422, "Idempotency-Key was already used with a different request")
+            if existing["state"] != "completed":
+                return idempotency_error(409, "A request with this Idempotency-Key is still being processed",
+                                         {"Retry-After": "1"})
+            stored = existing["response"]
+            idempotency_store.replays += 1
+            return idempotent_replay(stored)
+        reserved = True
+        
+        response = await call_next(request)
+        # Transient failures are not remembered so the client can retry them
+        if response.status_code >= 500 or response.status_code in (429, 503):
+            return response
+        
+        body = b"".join([chunk async for chunk in response.body_iterator])
+        stored = {
+            "status": response.status_code,
+            "body": body,
+            "mediaType": response.headers.get("content-type", "application/json")
+        }
+        # This worker replays from memory straight away; other workers answer 409 until the write lands
+        write_in_background(idempotency_keys_crud.complete(key, owner, stored), "storing idempotent response")
+        headers = {name: value for name, value in response.headers.items() if name != "content-length"}
+        return Response(content=body, status_code=response.status_code, headers=headers)
+    finally:
+        # Also reached when the request is cancelled, which skips except Exception
+        if reserved and stored is None:
+            write_in_background(idempotency_keys_crud.release(key, owner), "releasing idempotency key")
+        idempotency_store.finish(key, stored)
+
+# Rate limiting: "METHOD route=limit/seconds" budgets per client IP. A route of
+# "*" is a per-IP budget shared by every public (non-admin) route of that method.
+# Registered after the idempotency middleware so it runs first: a rejected
+# request costs no body read and no idempotency_keys write.
+RATE_LIMITS = parse_rate_limits(os.environ.get(
+    'RATE_LIMITS',
+    'POST /api/contact=5/60;POST /api/jobs/{job_id}/apply=5/60;POST /api/donate=10/60;POST *=30/60'
+))
+RATE_LIMIT_MAX_KEYS = int(os.environ.get('RATE_LIMIT_MAX_KEYS', '100000'))
+# Behind a reverse proxy the client address comes from X-Forwarded-For
+RATE_LIMIT_TRUST_FORWARDED = os.environ.get('RATE_LIMIT_TRUST_FORWARDED', 'false').lower() == 'true'
+rate_limiters = {
+    target: SlidingWindowLimiter(limit, window, RATE_LIMIT_MAX_KEYS)
+    for target, (limit, window) in RATE_LIMITS.items()
+}
+RATE_LIMITED_METHODS = {method for method, _ in RATE_LIMITS}
+
+def client_address(request: Request) -> str:
+    if RATE_LIMIT_TRUST_FORWARDED:
+        forwarded = request.headers.get("x-forwarded-for")
+        if forwarded:
+            return forwarded.split(',')[0].strip()
+    return request.client.host if request.client else "unknown"
+
+@app.middleware("http")
+async def rate_limit_middleware(request: Request, call_next):
+    if request.method not in RATE_LIMITED_METHODS:
+        return await call_next(request)
+    
+    route = route_template(request)
+    limiters = [(route, rate_limiters.get((request.method, route)))]
+    if not route.startswith("/api/admin"):
+        limiters.append(("*", rate_limiters.get((request.method, "*"))))
+    
+    address = client_address(request)
+    for name, limiter in limiters:
+        if limiter is None:
+            continue
+        allowed, retry_after = limiter.hit(address)
+        if not allowed:
+            rate_limit_rejections.inc((request.method, name))
+            return MongoJSONResponse(
+                {"detail": "Too many requests, please retry later"},
+                status_code=429,
+                headers={"Retry-After": retry_after_header(retry_after)}
+            )
+    return await call_next(request)
+
+# Prometheus metrics, served from /metrics
+http_requests = registry.counter(
+    "http_requests_total", "HTTP requests by method, route template and status",
+    ("method", "route", "status")
+)
+http_request_seconds = registry.histogram(
+    "http_request_duration_seconds", "Time until response headers, by method and route template",
+    ("method", "route")
+)
+http_in_flight = registry.gauge("http_requests_in_flight", "HTTP requests currently being handled")
+mongo_command_seconds = registry.histogram(
+    "mongodb_command_duration_seconds", "MongoDB command latency by collection and operation",
+    ("collection", "operation"),
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+)
+mongo_command_failures = registry.counter(
+    "mongodb_command_failures_total", "Failed MongoDB commands by collection and operation",
+    ("collection", "operation")
+)
+rate_limit_rejections = registry.counter(
+    "rate_limit_rejections_total", "Requests rejected with 429 by method and budget (route or *)",
+    ("method", "route")
+)
+registry.callback_gauge("rate_limit_tracked_keys", "Client addresses held by the rate limiters",
+                        lambda: sum(len(limiter) for limiter in rate_limiters.values()))
+registry.callback_gauge("idempotency_replays", "Requests answered from a stored Idempotency-Key response",
+                        lambda: idempotency_store.replays)
+registry.callback_gauge("event_loop_lag_seconds", "Latest event-loop lag sample",
+                        lambda: health_monitor.loop_lag()["lastMs"] / 1000)
+registry.callback_gauge("response_cache_hit_ratio", "Response cache hits / lookups",
+                        lambda: response_cache.stats()["hitRatio"])
+registry.callback_gauge("response_cache_hits", "Response cache hits", lambda: response_cache.hits)
+registry.callback_gauge("response_cache_misses", "Response cache misses", lambda: response_cache.misses)
+registry.callback_gauge("response_cache_bytes", "Bytes held by the response cache", lambda: response_cache.size)
+registry.callback_gauge("mongodb_pool_checked_out", "Connections currently checked out",
+                        lambda: database.pool_monitor.checked_out)
+registry.callback_gauge("mongodb_pool_open_connections", "Open pool connections",
+                        lambda: database.pool_monitor.open_connections)
+registry.callback_gauge("mongodb_pool_wait_seconds_total", "Total time spent waiting for a connection",
+                        lambda: database.pool_monitor.wait_seconds_total)
+registry.callback_gauge("submission_queue_depth", "Submissions waiting to be inserted",
+                        lambda: submission_queue.depth)
+registry.callback_gauge("submission_queue_written", "Queued submissions inserted",
+                        lambda: submission_queue.written)
+registry.callback_gauge("submission_queue_failed", "Queued submissions rejected by the database",
+                        lambda: submission_queue.failed)
+submission_drain_seconds = registry.histogram(
+    "submission_drain_seconds", "Time from enqueue to insert for queued submissions", ("collection",)
+)
+submission_queue.drain_listeners.append(lambda name, seconds: submission_drain_seconds.observe((name,), seconds))
+registry.callback_gauge("download_counts_pending", "Download increments not yet flushed",
+                        lambda: sum(download_counter.pending.values()))
+
+def record_mongo_command(collection: str, operation: str, seconds: float, succeeded: bool):
+    labels = (collection, operation)
+    mongo_command_seconds.observe(labels, seconds)
+    if not succeeded:
+        mongo_command_failures.inc(labels)
+
+command_listeners.append(record_mongo_command)
+
+def route_template(request: Request) -> str:
+    """Path template of the matched route; raw paths would give unbounded label values"""
+    route = request.scope.get("route")
+    if route is None:
+        # Cache hits and 304s never reach the router
+        for candidate in app.router.routes:
+            match, _ = candidate.matches(request.scope)
+            if match == Match.FULL:
+                route = candidate
+                break
+    return getattr(route, "path", "<unmatched>")
+
+@app.middleware("http")
+async def metrics_middleware(request: Request, call_next):
+    started = time.perf_counter()
+    http_in_flight.inc()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        http_in_flight.dec()
+        route = route_template(request)
+        http_request_seconds.observe((request.method, route), time.perf_counter() - started)
+        http_requests.inc((request.method, route, str(status)))
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus text exposition of request, MongoDB, cache and pool metrics"""
+    return Response(content=registry.render(), media_type=METRICS_CONTENT_TYPE)
+
+# Compress everything else (admin, streaming) on the fly; responses that
+# already carry a Content-Encoding from the cache middleware are left alone
+app.add_middleware(GZipMiddleware, minimum_size=COMPRESSION_MIN_SIZE)
+
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -600,27 +1401,106 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Warm-up steps that fail at startup (MongoDB not reachable yet, an index
+# build error) are retried in the background with exponential backoff, so a
+# worker that started before its database still becomes ready on its own
+STARTUP_RETRY_INITIAL_DELAY = float(os.environ.get('STARTUP_RETRY_INITIAL_DELAY', '1'))
+STARTUP_RETRY_MAX_DELAY = float(os.environ.get('STARTUP_RETRY_MAX_DELAY', '30'))
+app.state.indexes_reconciled = False
+app.state.startup_error = None
+app.state.startup_task = None
+
+async def reconcile_indexes() -> List[str]:
+    """Reconcile declared indexes, logging the report; returns collections that failed"""
+    index_report = await ensure_all_indexes()
+    failed = []
+    for collection_name, report in index_report.items():
+        if "error" in report:
+            failed.append(collection_name)
+        if report["missing"]:
+            logger.info(f"Created indexes on {collection_name}: {', '.join(report['missing'])}")
+        if report["extra"]:
+            logger.warning(f"Undeclared indexes on {collection_name}: {', '.join(report['extra'])}")
+        if report["conflicting"]:
+            logger.warning(f"Indexes on {collection_name} differ from their declaration: "
+                           f"{', '.join(report['conflicting'])}")
+    return failed
+
+async def prepare_worker():
+    """Warm connections, indexes and caches; raises while any step still needs another attempt.
+
+    Steps that already succeeded are skipped, and the worker is marked ready
+    once the database answers even if some index builds are still failing.
+    """
+    failed = []
+    if not app.state.ready:
+        open_connections = await database.warm_up()
+        logger.info(f"MongoDB connection pool warmed up with {open_connections} connections")
+        # Start from the version counters other workers share, so ETags agree between workers
+        await version_sync.sync()
+    if not app.state.indexes_reconciled:
+        # Creation is a no-op when the indexes already exist
+        failed = await reconcile_indexes()
+        app.state.indexes_reconciled = not failed
+    if not app.state.ready:
+        # Fill the collection count caches used by the admin collection listing
+        await estimated_counts(all_cruds)
+        app.state.ready = True
+        logger.info("Startup complete, ready to serve")
+    if failed:
+        raise RuntimeError(f"Index reconciliation failed on {', '.join(failed)}")
+    app.state.startup_error = None
+
+async def retry_startup():
+    """Run prepare_worker with exponential backoff until it succeeds"""
+    delay = STARTUP_RETRY_INITIAL_DELAY
+    while True:
+        logger.info(f"Retrying startup in {delay:g}s")
+        await asyncio.sleep(delay)
+        try:
+            await prepare_worker()
+            return
+        except Exception as e:
+            app.state.startup_error = str(e)
+            logger.error(f"Error during startup retry: {str(e)}")
+        delay = min(delay * 2, STARTUP_RETRY_MAX_DELAY)
+
 # Startup event to seed database if needed
 @app.on_event("startup")
 async def startup_event():
-    """Initialize database with seed data if empty"""
+    """Warm up connections and caches; seeding is run separately (python seed_data.py or POST /api/admin/seed)"""
+    health_monitor.start()
+    download_counter.start()
+    submission_queue.start()
+    version_sync.start()
     try:
-        # Check if we need to seed the database
-        team_count = await team_members_crud.count()
-        
-        if team_count == 0:
-            logger.info("Database appears empty, running seed script...")
-            from seed_data import seed_database
-            await seed_database()
-            logger.info("Database seeding completed")
-        else:
-            logger.info(f"Database already contains {team_count} team members, skipping seed")
-            
+        await prepare_worker()
     except Exception as e:
+        app.state.startup_error = str(e)
         logger.error(f"Error during startup: {str(e)}")
+        app.state.startup_task = asyncio.create_task(retry_startup())
 
 # Shutdown event
 @app.on_event("shutdown")
 async def shutdown_event():
-    """Clean up database connections"""
+    """Flush buffered writes and clean up database connections"""
+    app.state.ready = False
+    if app.state.startup_task is not None:
+        app.state.startup_task.cancel()
+        app.state.startup_task = None
+    try:
+        await download_counter.stop()
+    except Exception as e:
+        logger.error(f"Error flushing download counts: {str(e)}")
+    try:
+        await submission_queue.stop()
+    except Exception as e:
+        logger.error(f"Error flushing queued submissions ({submission_queue.depth} left): {str(e)}")
+    if idempotency_writes:
+        await asyncio.gather(*idempotency_writes)
+    try:
+        await version_sync.stop()
+    except Exception as e:
+        logger.error(f"Error publishing collection versions: {str(e)}")
+    await health_monitor.stop()
     await database.close_connection()
\ No newline at end of file
@@ -0,0 +1,161 @@
+"""
+Write-behind submission queue: documents are acknowledged with a pre-generated id
+and inserted in batches by a background task
+"""
+import asyncio
+import logging
+import time
+import uuid
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from pymongo.errors import ConnectionFailure, ExecutionTimeout, WTimeoutError
+
+logger = logging.getLogger(__name__)
+
+# Failures of the server or the network, after which the same batch is retried;
+# any other error means a document in the batch can never be written
+TRANSIENT_ERRORS = (ConnectionFailure, ExecutionTimeout, WTimeoutError)
+# Longest pause between retries after a transient failure
+MAX_RETRY_DELAY = 5.0
+
+class QueueFull(Exception):
+    """Raised by SubmissionQueue.submit when max_size documents are already waiting"""
+
+class SubmissionQueue:
+    """Bounded queue of pending inserts, drained with one insert_many per collection batch.
+
+    Documents still queued when the process dies are lost; stop() drains
+    everything on a clean shutdown. A batch that fails transiently is put back
+    and retried with backoff, at most max_retries times in a row before it is
+    dropped. A batch the driver rejects outright is split until the offending
+    document is found and dropped, so one bad document cannot block the rest.
+    """
+
+    def __init__(self, max_size: int = 10000, batch_size: int = 200, flush_interval: float = 0.05,
+                 max_retries: int = 30):
+        self.max_size = max_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_retries = max_retries
+        # Consecutive transient failures; reset by any successful write
+        self.retries = 0
+        # collection name -> (crud, pending (enqueued_at, document) pairs)
+        self._pending: Dict[str, Tuple[Any, Deque[Tuple[float, dict]]]] = {}
+        self.depth = 0
+        self.written = 0
+        self.failed = 0
+        # Called with (collection name, seconds from enqueue to insert) for each written document
+        self.drain_listeners: List[Callable[[str, float], None]] = []
+        self._wakeup = asyncio.Event()
+        self._drain_lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    def submit(self, crud, document: dict) -> str:
+        """Queue a document for insertion and return its id"""
+        if self.depth >= self.max_size:
+            raise QueueFull(f"Submission queue is full ({self.max_size} pending)")
+        document.setdefault("id", str(uuid.uuid4()))
+        if crud.collection_name not in self._pending:
+            self._pending[crud.collection_name] = (crud, deque())
+        self._pending[crud.collection_name][1].append((time.monotonic(), document))
+        self.depth += 1
+        if self.depth >= self.batch_size:
+            self._wakeup.set()
+        return document["id"]
+
+    async def _write_batch(self, name: str, crud, batch: List[Tuple[float, dict]]):
+        try:
+            result = await crud.create_many([document for _, document in batch])
+        except TRANSIENT_ERRORS as e:
+            self.retries += 1
+            if self.retries > self.max_retries:
+                logger.error(f"Dropped {len(batch)} queued {name} documents after {self.max_retries} retries: {str(e)}")
+                self.failed += len(batch)
+                self.retries = 0
+                return
+            # Put the batch back in order; it is retried on the next drain
+            self._pending[name][1].extendleft(reversed(batch))
+            self.depth += len(batch)
+            raise
+        except Exception as e:
+            if len(batch) == 1:
+                logger.error(f"Dropped queued {name} document: {str(e)}")
+                self.failed += 1
+                return
+            # e.g. DocumentTooLarge or InvalidDocument: halve the batch to isolate the document
+            middle = len(batch) // 2
+            await self._write_batch(name, crud, batch[:middle])
+            await self._write_batch(name, crud, batch[middle:])
+            return
+        self.retries = 0
+        finished = time.monotonic()
+        failed = set()
+        for error in result["errors"]:
+            # Ids are assigned on submit, so a duplicate id means an earlier
+            # attempt already inserted this document before failing
+            if "E11000" in error["message"] and "index: id_1 " in error["message"]:
+                continue
+            failed.add(error["index"])
+            logger.error(f"Dropped queued {name} document: {error['message']}")
+        self.failed += len(failed)
+        self.written += len(batch) - len(failed)
+        for index, (enqueued_at, _) in enumerate(batch):
+            if index not in failed:
+                for listener in self.drain_listeners:
+                    listener(name, finished - enqueued_at)
+
+    async def drain(self) -> int:
+        """Insert everything queued so far in batches of batch_size"""
+        async with self._drain_lock:
+            written = self.written
+            for name, (crud, pending) in list(self._pending.items()):
+                while pending:
+                    batch = [pending.popleft() for _ in range(min(self.batch_size, len(pending)))]
+                    self.depth -= len(batch)
+                    await self._write_batch(name, crud, batch)
+            return self.written - written
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            if not self.depth:
+                continue
+            try:
+                await self.drain()
+            except Exception as e:
+                logger.error(f"Error draining submission queue (retry {self.retries}): {str(e)}")
+                await asyncio.sleep(min(self.flush_interval * 2 ** self.retries, MAX_RETRY_DELAY))
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "depth": self.depth,
+            "maxSize": self.max_size,
+            "written": self.written,
+            "failed": self.failed,
+            "retries": self.retries,
+            "byCollection": {name: len(pending) for name, (_, pending) in self._pending.items()},
+        }
+
+    @property
+    def task(self) -> Optional[asyncio.Task]:
+        """The background task, for health checks"""
+        return self._task
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.drain()
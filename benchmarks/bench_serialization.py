@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Serialization benchmark: legacy list-response path vs the single-pass orjson path
+
+Legacy path (before MongoJSONResponse):
+  CRUDBase isoformat walk -> serialize_datetime_fields walk -> jsonable_encoder -> json.dumps
+New path:
+  id/_id normalization -> orjson.dumps
+
+Usage: python benchmarks/bench_serialization.py [--docs 500] [--rounds 50] [--json results.json]
+"""
+import argparse
+import json
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'backend'))
+
+from bson import ObjectId
+from fastapi.encoders import jsonable_encoder
+
+from serialization import dumps
+
+def make_documents(count: int, content_size: int) -> list:
+    """Synthetic news_articles documents shaped like the seeded ones"""
+    base = datetime(2024, 1, 1)
+    paragraph = "Analysis of the security situation and its humanitarian impact. "
+    content = (paragraph * (content_size // len(paragraph) + 1))[:content_size]
+    return [
+        {
+            "_id": ObjectId(),
+            "id": str(uuid.uuid4()),
+            "title": f"Article {i}",
+            "excerpt": paragraph,
+            "content": content,
+            "author": "War:Observe Analytics",
+            "publishedDate": base + timedelta(hours=i),
+            "category": "Analysis",
+            "imageUrl": "https://www.warobserve.com/img/news/example.jpg",
+            "tags": ["security", "analysis", "ukraine"],
+            "status": "published",
+            "createdAt": base,
+            "updatedAt": base + timedelta(minutes=i),
+        }
+        for i in range(count)
+    ]
+
+def legacy_path(docs: list) -> bytes:
+    for doc in docs:
+        doc['id'] = doc.get('id', str(doc['_id']))
+        doc['_id'] = str(doc['_id'])
+        for key, value in doc.items():
+            if hasattr(value, 'isoformat'):
+                doc[key] = value.isoformat()
+    # serialize_datetime_fields in server.py walked the result a second time
+    for doc in docs:
+        for key, value in doc.items():
+            if hasattr(value, 'isoformat'):
+                doc[key] = value.isoformat()
+    # FastAPI then encodes generically and JSONResponse renders with json.dumps
+    encoded = jsonable_encoder(docs)
+    return json.dumps(encoded, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+
+def orjson_path(docs: list) -> bytes:
+    for doc in docs:
+        doc['id'] = doc.get('id', str(doc['_id']))
+        doc['_id'] = str(doc['_id'])
+    return dumps(docs)
+
+def measure(fn, documents: list, rounds: int) -> dict:
+    timings = []
+    size = 0
+    for _ in range(rounds):
+        docs = [dict(doc) for doc in documents]  # both paths mutate their input
+        started = time.perf_counter()
+        body = fn(docs)
+        timings.append(time.perf_counter() - started)
+        size = len(body)
+    timings.sort()
+    median = timings[len(timings) // 2]
+    return {
+        "medianMs": round(median * 1000, 3),
+        "docsPerSecond": round(len(documents) / median),
+        "megabytesPerSecond": round(size / median / 1_000_000, 1),
+        "responseBytes": size,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--docs', type=int, default=500, help='documents per response')
+    parser.add_argument('--content-size', type=int, default=4000, help='characters of article content')
+    parser.add_argument('--rounds', type=int, default=50)
+    parser.add_argument('--json', dest='json_path', help='write results to this file')
+    args = parser.parse_args()
+
+    documents = make_documents(args.docs, args.content_size)
+    results = {
+        "docs": args.docs,
+        "contentSize": args.content_size,
+        "rounds": args.rounds,
+        "legacy": measure(legacy_path, documents, args.rounds),
+        "orjson": measure(orjson_path, documents, args.rounds),
+    }
+    results["speedup"] = round(results["legacy"]["medianMs"] / results["orjson"]["medianMs"], 2)
+
+    for name in ("legacy", "orjson"):
+        r = results[name]
+        print(f"{name:>7}: {r['medianMs']:>9.3f} ms  {r['docsPerSecond']:>9} docs/s  {r['megabytesPerSecond']:>7} MB/s")
+    print(f"speedup: {results['speedup']}x")
+
+    if args.json_path:
+        Path(args.json_path).write_text(json.dumps(results, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+Load test: replays weighted API scenarios at a fixed concurrency and reports
+latency percentiles and throughput per scenario
+
+Scenarios (weights via --mix):
+  home        GET /api/home
+  article     GET /api/news/{id} for a random published article
+  search      GET /api/search?q=<term>
+  contact     POST /api/contact (writes a contact submission)
+  admin_edit  GET + PUT /api/admin/faq/{id} (rewrites an FAQ's order; invalidates caches)
+
+Without --base-url the backend app is imported and driven in-process through
+httpx's ASGI transport, so only MongoDB needs to be running (or none at all
+with STORAGE_BACKEND=memory and --seed).
+
+Usage:
+  python benchmarks/load_test.py [--base-url http://localhost:8001] [--concurrency 20]
+      [--duration 30] [--mix home=5,article=3,search=2,contact=1,admin_edit=1]
+      [--json results.json] [--compare baseline.json]
+"""
+import argparse
+import asyncio
+import json
+import logging
+import math
+import os
+import random
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+
+import httpx
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent / 'backend'
+
+DEFAULT_MIX = "home=5,article=3,search=2,contact=1,admin_edit=1"
+SEARCH_TERMS = ["ukraine", "security", "analysis", "humanitarian", "report", "conflict", "donate"]
+
+def parse_mix(value: str) -> dict:
+    mix = {}
+    for part in value.split(','):
+        name, _, weight = part.partition('=')
+        name = name.strip()
+        if name not in SCENARIOS:
+            raise argparse.ArgumentTypeError(f"unknown scenario: {name}")
+        mix[name] = float(weight or 1)
+    return {name: weight for name, weight in mix.items() if weight > 0}
+
+def percentile(sorted_values: list, fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    index = max(0, min(len(sorted_values) - 1, math.ceil(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+class Fixtures:
+    """Ids the scenarios pick from, loaded once before the run"""
+
+    def __init__(self):
+        self.article_ids = []
+        self.faq_ids = []
+
+    async def load(self, client: httpx.AsyncClient):
+        news = await client.get("/api/news", params={"limit": 50, "fields": "id"})
+        news.raise_for_status()
+        self.article_ids = [article["id"] for article in news.json()]
+        faq = await client.get("/api/admin/faq", params={"limit": 50})
+        faq.raise_for_status()
+        self.faq_ids = [item["id"] for item in faq.json()["data"]]
+
+async def scenario_home(client, fixtures):
+    return await client.get("/api/home")
+
+async def scenario_article(client, fixtures):
+    if not fixtures.article_ids:
+        return await client.get("/api/news", params={"limit": 10})
+    return await client.get(f"/api/news/{random.choice(fixtures.article_ids)}")
+
+async def scenario_search(client, fixtures):
+    return await client.get("/api/search", params={"q": random.choice(SEARCH_TERMS)})
+
+async def scenario_contact(client, fixtures):
+    return await client.post("/api/contact", json={
+        "name": "Load Test",
+        "email": "loadtest@example.com",
+        "subject": "Load test submission",
+        "message": f"Generated by benchmarks/load_test.py at {time.time():.3f}"
+    })
+
+async def scenario_admin_edit(client, fixtures):
+    if not fixtures.faq_ids:
+        return await client.get("/api/admin/faq", params={"limit": 10})
+    item_id = random.choice(fixtures.faq_ids)
+    response = await client.get(f"/api/admin/faq/{item_id}")
+    if response.status_code != 200:
+        return response
+    return await client.put(f"/api/admin/faq/{item_id}", json={"order": response.json().get("order", 0)})
+
+SCENARIOS = {
+    "home": scenario_home,
+    "article": scenario_article,
+    "search": scenario_search,
+    "contact": scenario_contact,
+    "admin_edit": scenario_admin_edit,
+}
+
+async def worker(client, fixtures, mix: dict, deadline: float, samples: dict, errors: dict):
+    names, weights = list(mix), list(mix.values())
+    while time.perf_counter() < deadline:
+        name = random.choices(names, weights)[0]
+        started = time.perf_counter()
+        try:
+            response = await SCENARIOS[name](client, fixtures)
+            failed = response.status_code >= 400
+        except httpx.HTTPError:
+            failed = True
+        samples[name].append(time.perf_counter() - started)
+        if failed:
+            errors[name] += 1
+
+def summarize(latencies: list, errors: int, elapsed: float) -> dict:
+    latencies = sorted(latencies)
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        "p50Ms": round(percentile(latencies, 0.50) * 1000, 2),
+        "p95Ms": round(percentile(latencies, 0.95) * 1000, 2),
+        "p99Ms": round(percentile(latencies, 0.99) * 1000, 2),
+        "maxMs": round(latencies[-1] * 1000, 2) if latencies else 0.0,
+    }
+
+async def run(args) -> dict:
+    if args.base_url:
+        transport, base_url, app = None, args.base_url, None
+    else:
+        sys.path.insert(0, str(BACKEND_DIR))
+        # Every virtual user shares one client address, so per-IP budgets would
+        # reject most submissions; set RATE_LIMITS explicitly to measure them
+        os.environ.setdefault('RATE_LIMITS', '')
+        from server import app
+        logging.getLogger("httpx").setLevel(logging.WARNING)  # one INFO line per request otherwise
+        transport, base_url = httpx.ASGITransport(app=app), "http://loadtest"
+        await app.router.startup()  # the ASGI transport does not send lifespan events
+        if args.seed:
+            from seed_data import seed_database
+            await seed_database()
+
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    try:
+        async with httpx.AsyncClient(base_url=base_url, transport=transport, limits=limits,
+                                     timeout=args.timeout, headers={"Accept-Encoding": "gzip"}) as client:
+            fixtures = Fixtures()
+            await fixtures.load(client)
+
+            if args.warmup:
+                warmup_deadline = time.perf_counter() + args.warmup
+                await asyncio.gather(*[
+                    worker(client, fixtures, args.mix, warmup_deadline, defaultdict(list), defaultdict(int))
+                    for _ in range(args.concurrency)
+                ])
+
+            samples, errors = defaultdict(list), defaultdict(int)
+            started = time.perf_counter()
+            await asyncio.gather(*[
+                worker(client, fixtures, args.mix, started + args.duration, samples, errors)
+                for _ in range(args.concurrency)
+            ])
+            elapsed = time.perf_counter() - started
+    finally:
+        if app is not None:
+            await app.router.shutdown()
+
+    all_latencies = [latency for latencies in samples.values() for latency in latencies]
+    return {
+        "target": args.base_url or "in-process",
+        "concurrency": args.concurrency,
+        "durationSeconds": round(elapsed, 2),
+        "mix": args.mix,
+        "total": summarize(all_latencies, sum(errors.values()), elapsed),
+        "scenarios": {name: summarize(samples[name], errors[name], elapsed) for name in args.mix},
+    }
+
+def print_report(results: dict, baseline: dict = None):
+    print(f"target={results['target']} concurrency={results['concurrency']} duration={results['durationSeconds']}s")
+    header = f"{'scenario':<12}{'requests':>10}{'errors':>8}{'rps':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+    if baseline:
+        header += f"{'p95 vs base':>14}"
+    print(header)
+    rows = dict(results["scenarios"], total=results["total"])
+    for name, row in rows.items():
+        line = (f"{name:<12}{row['requests']:>10}{row['errors']:>8}{row['rps']:>9}"
+                f"{row['p50Ms']:>10}{row['p95Ms']:>10}{row['p99Ms']:>10}")
+        if baseline:
+            base = baseline["total"] if name == "total" else baseline["scenarios"].get(name)
+            if base and base["p95Ms"]:
+                line += f"{(row['p95Ms'] / base['p95Ms'] - 1) * 100:>+13.1f}%"
+        print(line)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--base-url', help='server to test; omit to run the app in-process')
+    parser.add_argument('--concurrency', type=int, default=20, help='concurrent virtual users')
+    parser.add_argument('--duration', type=float, default=30, help='seconds of measured load')
+    parser.add_argument('--warmup', type=float, default=3, help='seconds of unmeasured load first')
+    parser.add_argument('--timeout', type=float, default=10)
+    parser.add_argument('--seed', action='store_true',
+                        help='seed empty collections first (in-process only, e.g. with STORAGE_BACKEND=memory)')
+    parser.add_argument('--mix', type=parse_mix, default=parse_mix(DEFAULT_MIX), help='scenario=weight,...')
+    parser.add_argument('--json', dest='json_path', help='write results to this file')
+    parser.add_argument('--compare', help='earlier results file to compare p95 latencies against')
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    baseline = json.loads(Path(args.compare).read_text()) if args.compare else None
+    print_report(results, baseline)
+
+    if args.json_path:
+        Path(args.json_path).write_text(json.dumps(results, indent=2))
+
+if __name__ == "__main__":
+    main()
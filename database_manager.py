@@ -9,8 +9,9 @@ from datetime import datetime
 from backend.database import (
     news_articles_crud, team_members_crud, research_projects_crud,
     partners_crud, resources_crud, job_openings_crud, 
-    testimonials_crud, faqs_crud, donations_crud, database
+    testimonials_crud, faqs_crud, donations_crud, estimated_counts
 )
+from backend.search import build_snippet
 
 class DatabaseManager:
     def __init__(self):
@@ -33,9 +34,10 @@ class DatabaseManager:
         print("="*50)
         print("Виберіть колекцію для роботи:")
         
-        for key, (col_name, crud, display_name) in self.collections.items():
-            count = await database.db[col_name].count_documents({})
-            print(f"{key}. {display_name} ({count} записів)")
+        # Оцінка з метаданих колекцій, кешується на кілька секунд
+        counts = await estimated_counts([crud for _, crud, _ in self.collections.values()])
+        for (key, (col_name, crud, display_name)), count in zip(self.collections.items(), counts):
+            print(f"{key}. {display_name} (~{count} записів)")
         
         print("\n0. Вихід")
         print("h. Показати структуру всіх колекцій")
@@ -282,7 +284,7 @@ class DatabaseManager:
             return
         
         try:
-            # Визначаємо поля для пошуку
+            # Поля для пошуку, якщо колекція не має текстового індексу
             search_fields = ['title', 'name', 'content', 'description', 'question']
             results = await crud.search(query, search_fields, limit=20)
             
@@ -301,6 +303,13 @@ class DatabaseManager:
                     print(f"   Ім'я: {record['name']}")
                 elif 'question' in record:
                     print(f"   Питання: {record['question']}")
+                
+                if 'score' in record:
+                    print(f"   Релевантність: {record['score']:.2f}")
+                matched_text = next((record[field] for field in crud.search_fields or search_fields
+                                     if isinstance(record.get(field), str)), None)
+                if matched_text:
+                    print(f"   {build_snippet(matched_text, query)}")
                     
         except Exception as e:
             print(f"❌ Помилка пошуку: {e}")
@@ -33,14 +33,10 @@ import Modal from './Modal';
 
 // Import API services
 import { 
+  homeAPI,
   newsAPI, 
-  teamAPI, 
-  researchAPI, 
-  partnersAPI, 
   resourcesAPI, 
-  jobsAPI,
   contactAPI,
-  faqAPI,
   donationsAPI 
 } from '../services/api';
 
@@ -106,26 +102,27 @@ const Home = () => {
 
   const loadAllData = async () => {
     try {
-      // Load all data in parallel
-      const [
-        newsData,
-        teamData,
-        researchData,
-        partnersData,
-        resourcesData,
-        jobsData,
-        faqDataResponse,
-        donationData
-      ] = await Promise.allSettled([
-        newsAPI.getAll(),
-        teamAPI.getAll(),
-        researchAPI.getAll(),
-        partnersAPI.getAll(),
-        resourcesAPI.getAll(),
-        jobsAPI.getAll(),
-        faqAPI.getAll(),
-        donationsAPI.getTiers()
-      ]);
+      // Load all sections in one request; each section settles independently
+      let sections;
+      try {
+        sections = await homeAPI.get();
+      } catch (error) {
+        const rejected = { status: 'rejected', reason: error };
+        sections = {
+          news: rejected, team: rejected, research: rejected, partners: rejected,
+          resources: rejected, jobs: rejected, faq: rejected, donationTiers: rejected
+        };
+      }
+      const {
+        news: newsData,
+        team: teamData,
+        research: researchData,
+        partners: partnersData,
+        resources: resourcesData,
+        jobs: jobsData,
+        faq: faqDataResponse,
+        donationTiers: donationData
+      } = sections;
 
       // Handle successful responses
       if (newsData.status === 'fulfilled') {
@@ -260,6 +257,18 @@ const Home = () => {
     setModalOpen(true);
   };
 
+  // News lists carry a summary view only, so load the full article body on open
+  const openArticle = async (article) => {
+    openModal('news', article);
+    try {
+      const fullArticle = await newsAPI.getById(article.id);
+      // Ignore the response if the modal was closed or switched to another item meanwhile
+      setModalData(current => (current && current.id === article.id ? fullArticle : current));
+    } catch (error) {
+      console.error('Error loading article:', error);
+    }
+  };
+
   const closeModal = () => {
     setModalOpen(false);
     setModalType(null);
@@ -553,7 +562,7 @@ const Home = () => {
                     <button 
                       className="btn-secondary" 
                       style={{ padding: '12px 20px', minHeight: 'auto' }}
-                      onClick={() => openModal('news', article)}
+                      onClick={() => openArticle(article)}
                     >
                       Read More <ExternalLink size={16} style={{ marginLeft: '8px' }} />
                     </button>
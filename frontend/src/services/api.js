@@ -224,6 +224,18 @@ export const donationsAPI = {
   }
 };
 
+// Home page bootstrap API: all landing page sections in one request
+export const homeAPI = {
+  get: async () => {
+    try {
+      const response = await axios.get(`${API_BASE}/home`);
+      return handleApiResponse(response);
+    } catch (error) {
+      handleApiError(error);
+    }
+  }
+};
+
 // Health Check API
 export const healthAPI = {
   check: async () => {
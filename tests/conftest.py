@@ -0,0 +1,41 @@
+"""
+Shared setup: the backend modules are imported from backend/ and run against
+the in-memory store, so the suite needs no MongoDB server
+"""
+import asyncio
+import os
+import sys
+from pathlib import Path
+
+import httpx
+import pytest
+
+# Read by backend/database.py at import time, so set before any test imports it
+os.environ['STORAGE_BACKEND'] = 'memory'
+os.environ.setdefault('RATE_LIMITS', '')
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'backend'))
+
+class LiveApp:
+    """The FastAPI app served in-process; run() executes coroutines on the app's own event loop"""
+
+    def __init__(self):
+        from server import app
+        self.app = app
+        self.loop = asyncio.new_event_loop()
+        self.client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+
+    def run(self, coroutine):
+        return self.loop.run_until_complete(coroutine)
+
+@pytest.fixture(scope="session")
+def live_app():
+    """Started and seeded once per session; the ASGI transport does not send lifespan events"""
+    from seed_data import seed_database
+    live = LiveApp()
+    live.run(live.app.router.startup())
+    live.run(seed_database())
+    yield live
+    live.run(live.client.aclose())
+    live.run(live.app.router.shutdown())
+    live.loop.close()
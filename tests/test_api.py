@@ -0,0 +1,194 @@
+"""
+End-to-end requests against the in-process app on the memory store
+"""
+import base64
+import json
+
+def get(live_app, path: str, **kwargs):
+    return live_app.run(live_app.client.get(path, **kwargs))
+
+def test_ready_after_startup(live_app):
+    response = get(live_app, "/api/ready")
+    assert response.status_code == 200 and response.json()["status"] == "healthy"
+
+def test_cursor_paging_walks_every_article_once(live_app):
+    everything = get(live_app, "/api/news", params={"limit": 100}).json()
+    ids, after, pages = [], "", 0
+    while after is not None:
+        page = get(live_app, "/api/news", params={"limit": 3, "after": after}).json()
+        ids.extend(item["id"] for item in page["items"])
+        after = page["nextCursor"]
+        pages += 1
+    assert ids == [article["id"] for article in everything]
+    assert pages == page["totalPages"] == -(-len(everything) // 3)
+
+def test_malformed_cursor_is_a_bad_request(live_app):
+    assert get(live_app, "/api/news", params={"after": "garbage"}).status_code == 400
+    forged = base64.urlsafe_b64encode(b'{"k": 1, "id": "x", "p": "a"}').decode()
+    assert get(live_app, "/api/news", params={"after": forged}).status_code == 400
+
+def test_ids_returns_requested_order_and_skips_missing(live_app):
+    articles = get(live_app, "/api/news", params={"limit": 3}).json()
+    wanted = [articles[2]["id"], "does-not-exist", articles[0]["id"], articles[2]["id"]]
+    response = get(live_app, "/api/news", params={"ids": ",".join(wanted)})
+    assert [article["id"] for article in response.json()] == [articles[2]["id"], articles[0]["id"]]
+
+def test_conditional_get(live_app):
+    first = get(live_app, "/api/faq", headers={"Accept-Encoding": "gzip"})
+    etag = first.headers["etag"]
+    assert first.status_code == 200
+
+    # The client may hold either the coding variant or the plain tag; a 304 echoes the one it sent
+    for tag in (etag, etag.replace("-gzip", "")):
+        revalidated = get(live_app, "/api/faq", headers={"Accept-Encoding": "gzip", "If-None-Match": f'W/{tag}, "x"'})
+        assert revalidated.status_code == 304 and revalidated.headers["etag"] == tag
+
+    assert get(live_app, "/api/faq", headers={"If-None-Match": "*"}).status_code == 304
+    assert get(live_app, "/api/news/does-not-exist", headers={"If-None-Match": "*"}).status_code == 404
+
+def test_write_changes_etag(live_app):
+    etag = get(live_app, "/api/faq").headers["etag"]
+    item = get(live_app, "/api/admin/faq", params={"limit": 1}).json()["data"][0]
+    updated = live_app.run(live_app.client.put(f"/api/admin/faq/{item['id']}", json={"order": item.get("order", 0)}))
+    assert updated.status_code == 200
+    response = get(live_app, "/api/faq", headers={"If-None-Match": etag})
+    assert response.status_code == 200 and response.headers["etag"] != etag
+
+def test_idempotent_submission_is_replayed(live_app):
+    contact = {"name": "Test", "email": "test@example.com", "subject": "Hello", "message": "Idempotency test"}
+    headers = {"Idempotency-Key": "api-contact"}
+    first = live_app.run(live_app.client.post("/api/contact", json=contact, headers=headers))
+    replay = live_app.run(live_app.client.post("/api/contact", json=contact, headers=headers))
+    assert first.status_code == replay.status_code == 200
+    assert replay.json() == first.json() and replay.headers["idempotent-replayed"] == "true"
+
+def test_home_with_a_failed_section_is_not_cached(live_app, monkeypatch):
+    from database import faqs_crud
+    import server
+    server.response_cache.clear()
+    original = faqs_crud.get_all
+
+    async def failing(*args, **kwargs):
+        raise RuntimeError("faq unavailable")
+    monkeypatch.setattr(faqs_crud, "get_all", failing)
+    degraded = get(live_app, "/api/home")
+    assert degraded.status_code == 200 and degraded.json()["faq"]["status"] == "rejected"
+    assert degraded.headers["cache-control"] == "no-store" and "etag" not in degraded.headers
+
+    monkeypatch.setattr(faqs_crud, "get_all", original)
+    recovered = get(live_app, "/api/home")
+    assert recovered.headers["x-cache"] == "MISS" and recovered.json()["faq"]["status"] == "fulfilled"
+
+def test_job_applications_are_listed_newest_first(live_app):
+    from database import job_applications_crud
+    import server
+    job_id = get(live_app, "/api/jobs").json()[0]["id"]
+    application = {"email": "applicant@example.com", "phone": "555-0100", "experience": "5 years", "coverLetter": "Hello"}
+    ids = []
+    for name in ("First", "Second"):
+        response = live_app.run(live_app.client.post(f"/api/jobs/{job_id}/apply", json={**application, "name": name}))
+        ids.append(response.json()["data"]["applicationId"])
+    # Both land in the same batch and share createdAt; submittedAt still orders them
+    live_app.run(server.submission_queue.drain())
+    listed = live_app.run(job_applications_crud.get_by_job(job_id))
+    assert [doc["id"] for doc in listed][:2] == ids[::-1]
+    assert all(doc["status"] == "submitted" and "submittedAt" in doc for doc in listed[:2])
+
+def test_export_then_import_keeps_server_side_fields(live_app):
+    import server
+    donation = {"donorName": "Round Trip", "donorEmail": "donor@example.com", "amount": 25, "tier": "supporter"}
+    assert live_app.run(live_app.client.post("/api/donate", json=donation)).status_code == 200
+    live_app.run(server.submission_queue.drain())
+    partner = get(live_app, "/api/admin/partners", params={"limit": 1}).json()["data"][0]
+    live_app.run(live_app.client.put(f"/api/admin/partners/{partner['id']}", json={"isActive": False}))
+
+    def export(name):
+        rows = [json.loads(line) for line in get(live_app, f"/api/admin/{name}/export").text.splitlines()]
+        # _id and insertion times are assigned by the import itself
+        return {row["id"]: {key: value for key, value in row.items() if key not in ("_id", "createdAt", "updatedAt")}
+                for row in rows}
+
+    for name in ("donations", "testimonials", "partners"):
+        exported = get(live_app, f"/api/admin/{name}/export").content
+        before = export(name)
+        live_app.run(server.ADMIN_CRUD_INSTANCES[name].collection.delete_many({}))
+        imported = live_app.run(live_app.client.post(f"/api/admin/{name}/import", content=exported))
+        assert imported.json()["data"]["failed"] == 0
+        after = export(name)
+        # Model defaults may fill fields the original write left out, but nothing exported is lost
+        assert after.keys() == before.keys()
+        assert all(after[doc_id].items() >= row.items() for doc_id, row in before.items())
+    assert any(row["status"] == "completed" and row["paymentId"] for row in export("donations").values())
+    assert export("partners")[partner["id"]]["isActive"] is False
+
+def test_public_reads_are_served_from_the_cache_until_a_write(live_app):
+    import server
+    server.response_cache.clear()
+    assert get(live_app, "/api/team").headers["x-cache"] == "MISS"
+    cached = get(live_app, "/api/team")
+    assert cached.headers["x-cache"] == "HIT"
+    member = get(live_app, "/api/admin/team_members", params={"limit": 1}).json()["data"][0]
+    live_app.run(live_app.client.put(f"/api/admin/team_members/{member['id']}", json={"bio": "Updated bio"}))
+    fresh = get(live_app, "/api/team")
+    assert fresh.headers["x-cache"] == "MISS" and fresh.content != cached.content
+
+def test_cached_gzip_variant_matches_the_plain_body(live_app):
+    import server
+    server.response_cache.clear()
+    plain = get(live_app, "/api/research", headers={"Accept-Encoding": "identity"})
+    for _ in range(2):  # built on the miss, served from the cached variant on the hit
+        compressed = get(live_app, "/api/research", headers={"Accept-Encoding": "gzip"})
+        assert compressed.headers["content-encoding"] == "gzip" and compressed.headers["vary"] == "Accept-Encoding"
+        assert compressed.content == plain.content  # httpx decodes the gzip body
+    assert compressed.headers["x-cache"] == "HIT" and compressed.headers["etag"] != plain.headers["etag"]
+
+def test_metrics_label_requests_by_route_template(live_app):
+    article_id = get(live_app, "/api/news", params={"limit": 1}).json()[0]["id"]
+    get(live_app, f"/api/news/{article_id}")
+    get(live_app, f"/api/news/{article_id}")  # cache hit, never reaches the router
+    response = get(live_app, "/metrics")
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    lines = response.text.splitlines()
+    assert any(line.startswith('http_requests_total{method="GET",route="/api/news/{article_id}",status="200"} ')
+               for line in lines)
+    assert not any(article_id in line for line in lines)
+
+def test_liveness_ignores_the_database_but_readiness_does_not(live_app, monkeypatch):
+    import server
+
+    async def down():
+        return {"status": "down", "error": "no primary"}
+    monkeypatch.setattr(server.health_monitor, "database", down)
+    assert get(live_app, "/api/live").status_code == 200
+    ready = get(live_app, "/api/ready")
+    assert ready.status_code == 503 and ready.json()["database"]["error"] == "no primary"
+
+def test_loop_lag_and_backlog_degrade_then_fail_health(live_app, monkeypatch):
+    import server
+    monkeypatch.setattr(server.health_monitor, "loop_lag", lambda: {"lastMs": 300.0, "maxMs": 300.0})
+    live = get(live_app, "/api/live")
+    assert live.status_code == 200 and live.json()["status"] == "degraded"
+
+    monkeypatch.setattr(server.health_monitor, "loop_lag", lambda: {"lastMs": 0.0, "maxMs": 0.0})
+    monkeypatch.setattr(server.submission_queue, "depth", server.submission_queue.max_size)
+    ready = get(live_app, "/api/ready")
+    assert ready.status_code == 200 and ready.json()["submissionQueue"]["status"] == "degraded"
+    assert ready.json()["status"] == "degraded"
+
+    monkeypatch.setattr(server.submission_queue, "depth", 0)
+    monkeypatch.setattr(server.health_monitor, "loop_lag", lambda: {"lastMs": 6000.0, "maxMs": 6000.0})
+    live = get(live_app, "/api/live")
+    assert live.status_code == 503 and live.json()["eventLoop"]["status"] == "stalled"
+
+def test_crashed_background_task_fails_liveness(live_app, monkeypatch):
+    import server
+    monkeypatch.setattr(server, "background_tasks", lambda: {"downloadCounter": "failed"})
+    live = get(live_app, "/api/live")
+    assert live.status_code == 503 and live.json()["status"] == "unhealthy"
+
+def test_not_ready_until_startup_completes(live_app, monkeypatch):
+    import server
+    monkeypatch.setattr(server.app.state, "ready", False)
+    ready = get(live_app, "/api/ready")
+    assert ready.status_code == 503 and ready.json()["status"] == "starting"
+    assert ready.headers["cache-control"] == "no-store"
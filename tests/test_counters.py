@@ -0,0 +1,96 @@
+import asyncio
+
+import pytest
+
+from counters import CounterBuffer
+from database import ResourcesCRUD, database
+
+class Recorder:
+    """flush_fn stand-in that fails the first `failures` calls"""
+
+    def __init__(self, failures: int = 0):
+        self.failures = failures
+        self.batches = []
+
+    async def __call__(self, counts):
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError("database unavailable")
+        self.batches.append(counts)
+        return len(counts)
+
+def test_increments_are_aggregated_into_one_batch():
+    async def scenario():
+        recorder = Recorder()
+        counter = CounterBuffer(recorder)
+        for key in ("a", "b", "a", "a"):
+            counter.increment(key)
+        counter.increment("b", 5)
+        flushed = await counter.flush()
+        return flushed, recorder.batches, await counter.flush()
+    flushed, batches, second = asyncio.run(scenario())
+    assert flushed == 9 and batches == [{"a": 3, "b": 6}]
+    assert second == 0  # nothing pending, flush_fn is not called again
+
+def test_failed_flush_keeps_increments_for_the_next_attempt():
+    async def scenario():
+        recorder = Recorder(failures=1)
+        counter = CounterBuffer(recorder)
+        counter.increment("a", 2)
+        with pytest.raises(RuntimeError):
+            await counter.flush()
+        counter.increment("a")
+        await counter.flush()
+        return recorder.batches, dict(counter.pending)
+    batches, pending = asyncio.run(scenario())
+    assert batches == [{"a": 3}] and pending == {}
+
+def test_increments_during_a_flush_are_not_lost():
+    async def scenario():
+        started, release = asyncio.Event(), asyncio.Event()
+        batches = []
+
+        async def slow_flush(counts):
+            batches.append(counts)
+            started.set()
+            await release.wait()
+        counter = CounterBuffer(slow_flush)
+        counter.increment("a")
+        flushing = asyncio.create_task(counter.flush())
+        await started.wait()
+        counter.increment("a")
+        release.set()
+        await flushing
+        await counter.flush()
+        return batches
+    assert asyncio.run(scenario()) == [{"a": 1}, {"a": 1}]
+
+def test_background_task_flushes_and_stop_flushes_the_rest():
+    async def scenario():
+        recorder = Recorder(failures=1)
+        counter = CounterBuffer(recorder, flush_interval=0.01)
+        counter.start()
+        counter.increment("a")
+        # The first periodic flush fails and is logged; a later one succeeds
+        for _ in range(100):
+            if recorder.batches:
+                break
+            await asyncio.sleep(0.01)
+        counter.increment("b")
+        await counter.stop()
+        return recorder.batches, counter.task
+    batches, task = asyncio.run(scenario())
+    assert batches[0] == {"a": 1}
+    assert sum(batch.get("b", 0) for batch in batches) == 1
+    assert task is None
+
+def test_download_counts_are_added_in_one_bulk_write():
+    async def scenario():
+        crud = ResourcesCRUD()
+        crud.collection = database.db["counter_test_resources"]
+        await crud.collection.insert_many([{"id": "r1", "downloadCount": 2}, {"id": "r2", "downloadCount": 0}])
+        modified = await crud.add_download_counts({"r1": 3, "r2": 1, "missing": 4})
+        counts = {doc["id"]: doc["downloadCount"] async for doc in crud.collection.find({})}
+        return modified, counts
+    modified, counts = asyncio.run(scenario())
+    assert modified == 2 and counts == {"r1": 5, "r2": 1}
@@ -0,0 +1,79 @@
+import asyncio
+import time
+
+from health import HealthMonitor, task_status
+
+class Ping:
+    """ping stand-in that counts calls and can hang or fail"""
+
+    def __init__(self, delay: float = 0.0, error: Exception = None):
+        self.delay = delay
+        self.error = error
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.error:
+            raise self.error
+        return {"ok": 1}
+
+def test_task_status():
+    async def scenario():
+        async def crash():
+            raise RuntimeError("boom")
+        running = asyncio.create_task(asyncio.sleep(10))
+        cancelled = asyncio.create_task(asyncio.sleep(10))
+        failed = asyncio.create_task(crash())
+        finished = asyncio.create_task(asyncio.sleep(0))
+        cancelled.cancel()
+        await asyncio.wait([cancelled, failed, finished])
+        statuses = [task_status(task) for task in (None, running, cancelled, failed, finished)]
+        running.cancel()
+        return statuses
+    assert asyncio.run(scenario()) == ["stopped", "running", "stopped", "failed", "stopped"]
+
+def test_concurrent_probes_share_one_cached_ping():
+    async def scenario():
+        ping = Ping(delay=0.01)
+        monitor = HealthMonitor(ping, ping_cache_seconds=60)
+        results = await asyncio.gather(*(monitor.database() for _ in range(5)))
+        await monitor.database()
+        return ping.calls, results
+    calls, results = asyncio.run(scenario())
+    assert calls == 1
+    assert all(result is results[0] for result in results) and results[0]["status"] == "ok"
+
+def test_expired_ping_is_repeated():
+    async def scenario():
+        ping = Ping()
+        monitor = HealthMonitor(ping, ping_cache_seconds=0)
+        await monitor.database()
+        await monitor.database()
+        return ping.calls
+    assert asyncio.run(scenario()) == 2
+
+def test_failed_and_hung_pings_report_down():
+    async def scenario():
+        failed = await HealthMonitor(Ping(error=RuntimeError("no primary"))).database()
+        hung = await HealthMonitor(Ping(delay=1), ping_timeout=0.01).database()
+        return failed, hung
+    failed, hung = asyncio.run(scenario())
+    assert failed["status"] == "down" and failed["error"] == "no primary"
+    assert hung["status"] == "down" and "timed out" in hung["error"]
+
+def test_loop_lag_is_sampled_until_stopped():
+    async def scenario():
+        monitor = HealthMonitor(Ping(), lag_interval=0.01)
+        before = monitor.loop_lag()
+        monitor.start()
+        await asyncio.sleep(0.05)
+        # Block the loop so the next sample wakes up late
+        time.sleep(0.1)
+        await asyncio.sleep(0.02)
+        status = task_status(monitor.task)
+        await monitor.stop()
+        return before, monitor.loop_lag(), status, monitor.task
+    before, lag, status, task = asyncio.run(scenario())
+    assert before == {"lastMs": 0.0, "maxMs": 0.0}
+    assert lag["maxMs"] >= 50 and status == "running" and task is None
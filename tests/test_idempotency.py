@@ -0,0 +1,155 @@
+import asyncio
+import json
+from datetime import datetime, timedelta
+
+import pytest
+from starlette.requests import Request
+
+from database import idempotency_keys_crud
+from idempotency import IdempotencyStore, request_fingerprint
+
+DONATION = {"donorName": "Test Donor", "donorEmail": "donor@example.com", "amount": 25, "tier": "supporter"}
+
+def test_store_replays_until_ttl_and_evicts_lru(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr("idempotency.time.monotonic", lambda: clock[0])
+    store = IdempotencyStore(max_entries=2, ttl=10)
+    store.put("a", "fa", {"status": 200})
+    store.put("b", "fb", {"status": 201})
+    assert store.get("a") == ("fa", {"status": 200})  # a is now most recent
+    store.put("c", "fc", {"status": 202})
+    assert store.get("b") is None
+    clock[0] += 11
+    assert store.get("a") is None and store.stats()["entries"] == 1
+
+def test_waiters_receive_the_first_response_or_none():
+    async def scenario():
+        store = IdempotencyStore()
+        store.begin("k", "f")
+        fingerprint, future = store.in_flight("k")
+        store.finish("k", {"status": 200})
+        first = await future, store.get("k"), store.in_flight("k")
+        store.begin("failed", "f")
+        _, future = store.in_flight("failed")
+        store.finish("failed", None)
+        return first, await future, store.get("failed")
+    (response, completed, in_flight), failed, kept = asyncio.run(scenario())
+    assert response == {"status": 200} and completed == ("f", {"status": 200}) and in_flight is None
+    assert failed is None and kept is None
+
+def test_fingerprint_covers_method_path_and_body():
+    base = request_fingerprint("POST", "/api/donate", b"{}")
+    assert base == request_fingerprint("POST", "/api/donate", b"{}")
+    assert base != request_fingerprint("POST", "/api/contact", b"{}")
+    assert base != request_fingerprint("POST", "/api/donate", b"{ }")
+
+def test_reserve_takes_over_only_expired_leases(live_app):
+    async def scenario():
+        key = "test|lease"
+        assert await idempotency_keys_crud.reserve(key, "f", "first") is None
+        held = await idempotency_keys_crud.reserve(key, "f", "second")
+        await idempotency_keys_crud.collection.update_one(
+            {"key": key}, {"$set": {"lockedUntil": datetime.utcnow() - timedelta(seconds=1)}})
+        other_body = await idempotency_keys_crud.reserve(key, "different", "second")
+        taken = await idempotency_keys_crud.reserve(key, "f", "second")
+        # The first owner's late writes must not touch the new reservation
+        await idempotency_keys_crud.release(key, "first")
+        await idempotency_keys_crud.complete(key, "first", {"status": 200})
+        record = await idempotency_keys_crud.collection.find_one({"key": key})
+        await idempotency_keys_crud.release(key, "second")
+        return held, other_body, taken, record, await idempotency_keys_crud.collection.find_one({"key": key})
+    held, other_body, taken, record, released = live_app.run(scenario())
+    assert held["owner"] == "first" and held["state"] == "processing"
+    assert other_body["fingerprint"] == "f"  # a different request never takes a key over
+    assert taken is None
+    assert record["owner"] == "second" and record["state"] == "processing"
+    assert released is None
+
+def donate(live_app, key: str, body: dict = DONATION):
+    return live_app.client.post("/api/donate", json=body, headers={"Idempotency-Key": key})
+
+def test_concurrent_retries_execute_once(live_app):
+    async def scenario():
+        return await asyncio.gather(*[donate(live_app, "concurrent") for _ in range(5)])
+    responses = live_app.run(scenario())
+    assert {response.status_code for response in responses} == {200}
+    assert len({response.json()["data"]["donationId"] for response in responses}) == 1
+    assert sum(response.headers.get("idempotent-replayed") == "true" for response in responses) == 4
+
+    changed = live_app.run(donate(live_app, "concurrent", {**DONATION, "amount": 99}))
+    assert changed.status_code == 422
+
+def test_key_held_by_another_worker(live_app):
+    fingerprint = request_fingerprint("POST", "/api/donate", json.dumps(DONATION).encode())
+    key = "/api/donate|elsewhere"
+    live_app.run(idempotency_keys_crud.reserve(key, fingerprint, "other-worker"))
+
+    async def post():
+        return await live_app.client.post("/api/donate", content=json.dumps(DONATION),
+                                          headers={"Idempotency-Key": "elsewhere", "Content-Type": "application/json"})
+    busy = live_app.run(post())
+    assert busy.status_code == 409 and busy.headers["retry-after"] == "1"
+
+    # The other worker died: once its lease runs out the retry executes here
+    live_app.run(idempotency_keys_crud.collection.update_one(
+        {"key": key}, {"$set": {"lockedUntil": datetime.utcnow() - timedelta(seconds=1)}}))
+    assert live_app.run(post()).status_code == 200
+
+def test_transient_failure_is_not_remembered(live_app, monkeypatch):
+    from server import submission_queue
+    monkeypatch.setattr(submission_queue, "max_size", 0)
+    assert live_app.run(donate(live_app, "transient")).status_code == 503
+    monkeypatch.undo()
+
+    async def retry():
+        response = await donate(live_app, "transient")
+        await asyncio.sleep(0.05)  # the completed response is stored in the background
+        return response, await idempotency_keys_crud.collection.find_one({"key": "/api/donate|transient"})
+    response, record = live_app.run(retry())
+    assert response.status_code == 200 and "idempotent-replayed" not in response.headers
+    assert record["state"] == "completed" and record["response"]["status"] == 200
+
+def test_cancelled_request_releases_its_reservation(live_app):
+    from server import idempotency_middleware, idempotency_store
+    body = json.dumps(DONATION).encode()
+
+    async def receive():
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    async def cancelled(request):
+        raise asyncio.CancelledError()
+
+    async def scenario():
+        request = Request({
+            "type": "http", "method": "POST", "path": "/api/donate", "root_path": "", "query_string": b"",
+            "headers": [(b"idempotency-key", b"cancelled"), (b"content-type", b"application/json")],
+        }, receive)
+        with pytest.raises(asyncio.CancelledError):
+            await idempotency_middleware(request, cancelled)
+        await asyncio.sleep(0.05)  # release runs in the background
+        return await idempotency_keys_crud.collection.find_one({"key": "/api/donate|cancelled"})
+    assert live_app.run(scenario()) is None
+    assert idempotency_store.in_flight("/api/donate|cancelled") is None
+
+def test_rate_limited_requests_write_no_keys(live_app, monkeypatch):
+    import server
+    from rate_limit import SlidingWindowLimiter
+    monkeypatch.setattr(server, "rate_limiters", {("POST", "/api/contact"): SlidingWindowLimiter(1, 60)})
+    monkeypatch.setattr(server, "RATE_LIMITED_METHODS", {"POST"})
+    writes = []
+    for method in ("reserve", "complete", "release"):
+        original = getattr(idempotency_keys_crud, method)
+        async def counted(*args, _method=method, _original=original):
+            writes.append(_method)
+            return await _original(*args)
+        monkeypatch.setattr(idempotency_keys_crud, method, counted)
+    contact = {"name": "Bot", "email": "bot@example.com", "subject": "Spam", "message": "Rotating keys"}
+
+    async def scenario():
+        responses = [await live_app.client.post("/api/contact", json=contact, headers={"Idempotency-Key": f"bot-{i}"})
+                     for i in range(5)]
+        await asyncio.sleep(0.05)  # background key writes, if any, land by now
+        return responses
+    responses = live_app.run(scenario())
+    assert [response.status_code for response in responses] == [200, 429, 429, 429, 429]
+    assert writes == ["reserve", "complete"]
@@ -0,0 +1,52 @@
+import asyncio
+
+from database import CRUDBase
+from importer import import_rows, iter_csv, iter_ndjson
+from models import FAQ
+
+async def chunked(data: bytes, size: int):
+    for start in range(0, len(data), size):
+        yield data[start:start + size]
+
+async def collect(rows):
+    return [row async for row in rows]
+
+def test_csv_records_are_reassembled_across_lines_and_chunks():
+    data = ('question,answer,order,tags\r\n'
+            '"Multi\nline ""quoted""",plain,2,"[""a"",""b""]"\r\n'
+            '\r\n'
+            'Second,"comma, inside",,\n').encode()
+    for size in (1, 7, len(data)):
+        rows = asyncio.run(collect(iter_csv(chunked(data, size))))
+        assert rows == [
+            (1, {"question": 'Multi\nline "quoted"', "answer": "plain", "order": "2", "tags": ["a", "b"]}),
+            (2, {"question": "Second", "answer": "comma, inside"}),
+        ]
+
+def test_csv_keeps_multibyte_characters_split_between_chunks():
+    data = "question,answer\nЩо це?,Відповідь\n".encode()
+    rows = asyncio.run(collect(iter_csv(chunked(data, 3))))
+    assert rows == [(1, {"question": "Що це?", "answer": "Відповідь"})]
+
+def test_ndjson_reports_invalid_lines_and_skips_blank_ones():
+    data = b'{"question": "q"}\n\n{broken\n'
+    rows = asyncio.run(collect(iter_ndjson(chunked(data, 4))))
+    assert rows[0] == (1, {"question": "q"})
+    assert rows[1][0] == 2 and isinstance(rows[1][1], ValueError)
+
+def test_import_rows_reports_per_row_errors():
+    async def scenario():
+        crud = CRUDBase("import_test")
+        await crud.ensure_indexes()
+        data = (b'{"id": "faq-1", "question": "q1", "answer": "a1"}\n'
+                b'{"question": "missing answer"}\n'
+                b'[1, 2]\n'
+                b'{"id": "faq-1", "question": "dup", "answer": "a"}\n'
+                b'{"question": "q3", "answer": "a3", "order": "3"}\n')
+        report = await import_rows(crud, FAQ, iter_ndjson(chunked(data, 16)), batch_size=2)
+        return report, await crud.collection.find_one({"id": "faq-1"})
+    report, stored = asyncio.run(scenario())
+    assert (report["received"], report["inserted"], report["failed"]) == (5, 2, 3)
+    assert [error["row"] for error in report["errors"]] == [2, 3, 4]
+    assert report["errors"][0]["error"][0]["field"] == "answer"
+    assert stored["question"] == "q1" and stored["category"] == "General"
@@ -0,0 +1,108 @@
+import asyncio
+
+import pytest
+from pymongo import ASCENDING, IndexModel, UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+
+from memory_store import MemoryCollection, matches
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+async def filled_collection() -> MemoryCollection:
+    collection = MemoryCollection("items")
+    await collection.insert_many([
+        {"id": "a", "n": 3, "tags": ["x", "y"], "status": "published"},
+        {"id": "b", "n": 1, "tags": ["y"], "status": "draft"},
+        {"id": "c", "n": 2, "tags": [], "status": "published", "nested": {"v": 5}},
+    ])
+    return collection
+
+@pytest.mark.parametrize("filter_dict, expected", [
+    ({"status": "published"}, True),
+    ({"n": {"$gte": 3}}, True),
+    ({"n": {"$lt": 3}}, False),
+    ({"tags": "x"}, True),
+    ({"tags": {"$in": ["z", "y"]}}, True),
+    ({"missing": None}, True),
+    ({"missing": {"$exists": True}}, False),
+    ({"$or": [{"n": 0}, {"id": "a"}]}, True),
+    ({"title": {"$regex": "^hel", "$options": "i"}}, False),
+])
+def test_matches(filter_dict, expected):
+    doc = {"id": "a", "n": 3, "tags": ["x", "y"], "status": "published"}
+    assert matches(doc, filter_dict) is expected
+
+def test_find_sort_skip_limit_and_projection():
+    async def scenario():
+        collection = await filled_collection()
+        docs = await collection.find({}, {"n": 1}).sort([("n", ASCENDING)]).skip(1).limit(1).to_list(None)
+        nested = await collection.find_one({"nested.v": 5})
+        return docs, nested
+    docs, nested = run(scenario())
+    assert [{key: value for key, value in doc.items() if key != "_id"} for doc in docs] == [{"n": 2}]
+    assert nested["id"] == "c"
+
+def test_updates_and_upsert():
+    async def scenario():
+        collection = await filled_collection()
+        await collection.update_one({"id": "a"}, {"$inc": {"n": 2}, "$set": {"status": "archived"}})
+        await collection.update_one({"id": "b"}, {"$unset": {"status": ""}})
+        await collection.update_one({"id": "d"}, {"$max": {"n": 4}}, upsert=True)
+        await collection.update_one({"id": "d"}, {"$max": {"n": 1}})
+        return {doc["id"]: doc async for doc in collection.find({})}
+    docs = run(scenario())
+    assert (docs["a"]["n"], docs["a"]["status"]) == (5, "archived")
+    assert "status" not in docs["b"]
+    assert docs["d"]["n"] == 4
+
+def test_partial_unique_index_ignores_documents_without_the_field():
+    async def scenario():
+        collection = MemoryCollection("unique")
+        await collection.create_indexes([
+            IndexModel([("id", ASCENDING)], unique=True, partialFilterExpression={"id": {"$exists": True}})
+        ])
+        await collection.insert_one({"title": "no id"})
+        await collection.insert_one({"title": "no id either"})
+        await collection.insert_one({"id": "x"})
+        with pytest.raises(DuplicateKeyError):
+            await collection.insert_one({"id": "x"})
+        with pytest.raises(BulkWriteError) as error:
+            await collection.insert_many([{"id": "y"}, {"id": "x"}, {"id": "z"}], ordered=False)
+        return error.value.details, await collection.count_documents({})
+    details, count = run(scenario())
+    assert [error["index"] for error in details["writeErrors"]] == [1]
+    assert count == 5
+
+def test_index_lookup_keeps_natural_order():
+    async def scenario():
+        collection = MemoryCollection("ordered")
+        await collection.create_indexes([IndexModel([("group", ASCENDING)])])
+        await collection.insert_many([{"id": str(i), "group": i % 2} for i in range(6)])
+        return [doc["id"] async for doc in collection.find({"group": {"$in": [0, 1]}})]
+    assert run(scenario()) == [str(i) for i in range(6)]
+
+def test_bulk_write_and_delete():
+    async def scenario():
+        collection = await filled_collection()
+        result = await collection.bulk_write([
+            UpdateOne({"id": "a"}, {"$inc": {"n": 1}}),
+            UpdateOne({"id": "missing"}, {"$inc": {"n": 1}}),
+        ], ordered=False)
+        deleted = await collection.delete_many({"status": "published"})
+        return result.modified_count, deleted.deleted_count, await collection.estimated_document_count()
+    assert run(scenario()) == (1, 2, 1)
+
+def test_text_search_scores_by_weight():
+    async def scenario():
+        collection = MemoryCollection("text")
+        await collection.create_indexes([
+            IndexModel([("title", "text"), ("body", "text")], weights={"title": 10, "body": 1}, name="text_search")
+        ])
+        await collection.insert_many([
+            {"id": "body", "title": "Other", "body": "report on security"},
+            {"id": "title", "title": "Security report", "body": "text"},
+        ])
+        cursor = collection.find({"$text": {"$search": "security"}}, {"score": {"$meta": "textScore"}})
+        return [doc["id"] for doc in await cursor.sort([("score", {"$meta": "textScore"})]).to_list(None)]
+    assert run(scenario()) == ["title", "body"]
@@ -0,0 +1,40 @@
+from metrics import Registry
+
+def test_counter_and_gauge_render_with_escaped_labels():
+    registry = Registry()
+    requests = registry.counter("requests_total", "Requests", ("route", "status"))
+    in_flight = registry.gauge("in_flight", "In flight")
+    requests.inc(('/a"b\\c\n', "200"))
+    requests.inc(('/a"b\\c\n', "200"), 2)
+    in_flight.inc()
+    in_flight.inc()
+    in_flight.dec()
+    assert registry.render().decode().splitlines() == [
+        "# HELP requests_total Requests",
+        "# TYPE requests_total counter",
+        'requests_total{route="/a\\"b\\\\c\\n",status="200"} 3',
+        "# HELP in_flight In flight",
+        "# TYPE in_flight gauge",
+        "in_flight 1",
+    ]
+
+def test_histogram_buckets_are_cumulative_and_upper_inclusive():
+    registry = Registry()
+    latency = registry.histogram("latency_seconds", "Latency", ("route",), buckets=(0.5, 0.1))
+    for value in (0.05, 0.1, 0.3, 2.0):
+        latency.observe(("/a",), value)
+    assert registry.render().decode().splitlines()[2:] == [
+        'latency_seconds_bucket{route="/a",le="0.1"} 2',
+        'latency_seconds_bucket{route="/a",le="0.5"} 3',
+        'latency_seconds_bucket{route="/a",le="+Inf"} 4',
+        'latency_seconds_sum{route="/a"} 2.45',
+        'latency_seconds_count{route="/a"} 4',
+    ]
+
+def test_callback_gauge_is_read_at_scrape_time():
+    registry = Registry()
+    depth = [3]
+    registry.callback_gauge("queue_depth", "Queue depth", lambda: depth[0])
+    assert registry.render().endswith(b"queue_depth 3\n")
+    depth[0] = 0.25
+    assert registry.render().endswith(b"queue_depth 0.25\n")
@@ -0,0 +1,81 @@
+import asyncio
+import base64
+from datetime import datetime, timedelta
+
+import pytest
+from bson import json_util
+
+from database import CRUDBase, decode_cursor, encode_cursor, keyset_filter, sort_spec
+
+def test_cursor_round_trip_keeps_bson_types():
+    published = datetime(2024, 5, 1, 12, 30)
+    token = encode_cursor({"publishedDate": published, "id": "abc"}, "publishedDate", 2)
+    assert decode_cursor(token) == {"k": published, "id": "abc", "p": 2}
+
+@pytest.mark.parametrize("token", ["not base64!", "e30=", "WzEsMl0="])  # garbage, {}, [1,2]
+def test_malformed_cursor_is_rejected(token):
+    with pytest.raises(ValueError):
+        decode_cursor(token)
+
+@pytest.mark.parametrize("position", [
+    {"k": 1, "id": "a", "p": "a"},
+    {"k": 1, "id": "a", "p": True},
+    {"k": 1, "id": "a", "p": -1},
+    {"k": 1, "id": "a", "p": 1, "t": "9"},
+])
+def test_forged_cursor_fields_are_rejected(position):
+    token = base64.urlsafe_b64encode(json_util.dumps(position).encode()).decode()
+    with pytest.raises(ValueError):
+        decode_cursor(token)
+
+def test_sort_spec_adds_id_tie_breaker():
+    assert sort_spec("publishedDate", -1) == [("publishedDate", -1), ("id", -1)]
+    assert sort_spec("_id", 1) == [("_id", 1)]
+
+def test_keyset_filter():
+    position = {"k": 5, "id": "m", "p": 1}
+    assert keyset_filter("n", 1, position) == {"$or": [{"n": {"$gt": 5}}, {"n": 5, "id": {"$gt": "m"}}]}
+    assert keyset_filter("id", -1, position) == {"id": {"$lt": 5}}
+
+def test_pages_cover_ties_without_gaps_or_repeats():
+    async def scenario():
+        crud = CRUDBase("pagination_test")
+        base = datetime(2024, 1, 1)
+        # Pairs of documents share a date, so page boundaries fall inside ties
+        await crud.collection.insert_many([
+            {"id": f"doc-{i:02d}", "publishedDate": base + timedelta(days=i // 2)} for i in range(11)
+        ])
+        pages, after = [], ""
+        while after is not None:
+            page = await crud.get_page(limit=3, sort_by="publishedDate", sort_order=-1, after=after)
+            pages.append(page)
+            after = page["nextCursor"]
+        return pages
+    pages = asyncio.run(scenario())
+    ids = [item["id"] for page in pages for item in page["items"]]
+    assert ids == sorted(ids, key=lambda doc_id: (int(doc_id[-2:]) // 2, doc_id), reverse=True)
+    assert len(set(ids)) == 11
+    assert [page["page"] for page in pages] == [1, 2, 3, 4]
+    assert pages[0]["total"] == 11 and pages[0]["totalPages"] == 4
+
+def test_only_the_first_filtered_page_is_counted(monkeypatch):
+    async def scenario():
+        crud = CRUDBase("pagination_count_test")
+        await crud.collection.insert_many([{"id": f"doc-{i}", "kind": i % 2} for i in range(9)])
+        counts = []
+        original = crud.collection.count_documents
+
+        async def counting(*args, **kwargs):
+            counts.append(args)
+            return await original(*args, **kwargs)
+        monkeypatch.setattr(crud.collection, "count_documents", counting)
+
+        pages, after = [], ""
+        while after is not None:
+            page = await crud.get_page({"kind": 0}, limit=2, sort_by="id", sort_order=1, after=after)
+            pages.append(page)
+            after = page["nextCursor"]
+        return pages, counts
+    pages, counts = asyncio.run(scenario())
+    assert len(counts) == 1
+    assert [page["total"] for page in pages] == [5, 5, 5]
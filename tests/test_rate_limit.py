@@ -0,0 +1,54 @@
+import pytest
+
+from rate_limit import SlidingWindowLimiter, parse_rate_limits, retry_after_header
+
+def exhaust(limiter: SlidingWindowLimiter, key: str, now: float):
+    while limiter.hit(key, now)[0]:
+        pass
+
+@pytest.mark.parametrize("first_burst, second_burst, rejected_at", [
+    (10.0, None, 10.0),    # rejected in the window it filled
+    (10.0, None, 65.0),    # previous window still overlaps
+    (0.0, 70.0, 70.0),     # both windows partly used
+    (50.0, 90.0, 92.0),
+])
+def test_retry_after_is_the_earliest_allowed_moment(first_burst, second_burst, rejected_at):
+    limiter = SlidingWindowLimiter(limit=5, window=60)
+    exhaust(limiter, "ip", first_burst)
+    if second_burst is not None:
+        exhaust(limiter, "ip", second_burst)
+    allowed, retry_after = limiter.hit("ip", rejected_at)
+    assert not allowed and retry_after > 0
+
+    # A copy of the counters checks the moments around the prediction without counting a hit
+    def allowed_at(moment: float) -> bool:
+        probe = SlidingWindowLimiter(limit=5, window=60)
+        probe._counters["ip"] = list(limiter._counters["ip"])
+        return probe.hit("ip", moment)[0]
+
+    assert allowed_at(rejected_at + retry_after + 1e-6)
+    assert not allowed_at(rejected_at + retry_after - 0.01)
+
+def test_retry_after_example():
+    limiter = SlidingWindowLimiter(limit=5, window=60)
+    exhaust(limiter, "ip", 10.0)
+    assert limiter.hit("ip", 10.0) == (False, pytest.approx(62.0))
+    assert limiter.hit("ip", 65.0) == (False, pytest.approx(7.0))
+
+def test_keys_are_evicted_least_recently_used():
+    limiter = SlidingWindowLimiter(limit=1, window=60, max_keys=2)
+    limiter.hit("a", 0)
+    limiter.hit("b", 0)
+    limiter.hit("a", 1)
+    limiter.hit("c", 1)
+    assert len(limiter) == 2
+    assert limiter.hit("b", 2)[0]       # forgotten, so allowed again
+    assert not limiter.hit("c", 2)[0]
+
+def test_parse_rate_limits():
+    assert parse_rate_limits("POST /api/contact=5/60; post *=30/10;") == {
+        ("POST", "/api/contact"): (5, 60.0),
+        ("POST", "*"): (30, 10.0),
+    }
+    assert parse_rate_limits("") == {}
+    assert retry_after_header(0.2) == "1" and retry_after_header(61.5) == "62"
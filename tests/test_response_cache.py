@@ -0,0 +1,104 @@
+import gzip
+
+import pytest
+
+import response_cache
+from response_cache import SUPPORTED_ENCODINGS, ResponseCache, compress, negotiate_encoding
+
+def test_hit_miss_and_ttl_expiry(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(response_cache.time, "monotonic", lambda: now[0])
+    cache = ResponseCache(ttl=10)
+    assert cache.get("/a") is None
+    cache.set("/a", b"body", "application/json", ("faq",))
+    assert cache.get("/a").body == b"body"
+    now[0] += 10
+    assert cache.get("/a") is None and cache.size == 0
+    assert (cache.hits, cache.misses) == (1, 2)
+
+def test_least_recently_used_entries_are_evicted_by_size():
+    cache = ResponseCache(max_bytes=10)
+    cache.set("/a", b"aaaa", "application/json", ("faq",))
+    cache.set("/b", b"bbbb", "application/json", ("faq",))
+    cache.get("/a")  # /b is now the oldest
+    cache.set("/c", b"cccc", "application/json", ("faq",))
+    assert cache.get("/b") is None and cache.get("/a") and cache.get("/c")
+    assert cache.size == 8 and cache.evictions == 1
+    # Bodies larger than the whole cache are returned but never stored
+    entry = cache.set("/big", b"x" * 11, "application/json", ("faq",))
+    assert entry.body == b"x" * 11 and cache.get("/big") is None
+
+def test_replacing_a_key_keeps_the_byte_count():
+    cache = ResponseCache()
+    cache.set("/a", b"old body", "application/json", ("faq",))
+    cache.set("/a", b"new", "application/json", ("faq",))
+    assert cache.size == 3 and cache.get("/a").body == b"new"
+
+def test_invalidation_drops_only_dependent_entries():
+    cache = ResponseCache()
+    cache.set("/home", b"home", "application/json", ("faq", "news_articles"))
+    cache.set("/faq", b"faq", "application/json", ("faq",))
+    cache.set("/news", b"news", "application/json", ("news_articles",))
+    cache.invalidate("faq")
+    assert cache.get("/home") is None and cache.get("/faq") is None
+    assert cache.get("/news").body == b"news"
+    assert cache.invalidations == 2 and cache.size == 4
+    cache.clear()
+    assert cache.get("/news") is None and cache.size == 0
+
+def test_response_built_across_a_write_is_not_stored():
+    cache = ResponseCache()
+    generation = cache.generation(("faq",))
+    cache.invalidate("faq")  # a write lands while the response is being built
+    cache.set("/faq", b"stale", "application/json", ("faq",), generation=generation)
+    assert cache.get("/faq") is None
+    cache.set("/faq", b"fresh", "application/json", ("faq",), generation=cache.generation(("faq",)))
+    assert cache.get("/faq").body == b"fresh"
+
+@pytest.mark.parametrize("header, expected", [
+    (None, None),
+    ("", None),
+    ("gzip", "gzip"),
+    ("deflate, GZIP;q=0.5", "gzip"),
+    ("gzip;q=0", None),
+    ("gzip;q=bogus", None),
+    ("identity", None),
+    ("*", SUPPORTED_ENCODINGS[0]),
+    ("*, gzip;q=0", "br" if "br" in SUPPORTED_ENCODINGS else None),
+])
+def test_negotiate_encoding(header, expected):
+    assert negotiate_encoding(header) == expected
+
+def test_negotiate_encoding_prefers_brotli_when_available(monkeypatch):
+    monkeypatch.setattr(response_cache, "SUPPORTED_ENCODINGS", ("br", "gzip"))
+    assert negotiate_encoding("gzip, br") == "br"
+    assert negotiate_encoding("gzip, br;q=0") == "gzip"
+
+def test_compressed_variants_count_towards_the_size_bound():
+    cache = ResponseCache(max_bytes=1000)
+    body = b'{"items": [' + b'"same", ' * 8 + b'"end"]}'
+    entry = cache.set("/a", body, "application/json", ("faq",))
+    data = compress(body, "gzip")
+    assert gzip.decompress(data) == body
+    assert cache.add_variant("/a", entry, "gzip", data) is data
+    assert cache.size == len(body) + len(data)
+    # A second request that compressed concurrently gets the recorded variant
+    assert cache.add_variant("/a", entry, "gzip", compress(body, "gzip")) is data
+    assert cache.size == len(body) + len(data)
+    cache.invalidate("faq")
+    assert cache.size == 0
+
+def test_variant_that_overflows_the_cache_evicts_older_entries():
+    cache = ResponseCache(max_bytes=25)
+    cache.set("/old", b"o" * 10, "application/json", ("faq",))
+    entry = cache.set("/new", b"n" * 10, "application/json", ("faq",))
+    cache.add_variant("/new", entry, "gzip", b"z" * 10)
+    assert cache.get("/old") is None and cache.get("/new") is entry and cache.size == 20
+
+def test_variant_of_an_entry_that_was_not_kept_is_not_counted():
+    cache = ResponseCache()
+    generation = cache.generation(("faq",))
+    cache.invalidate("faq")
+    entry = cache.set("/a", b"body", "application/json", ("faq",), generation=generation)
+    assert cache.add_variant("/a", entry, "gzip", b"zz") == b"zz"
+    assert cache.size == 0
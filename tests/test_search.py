@@ -0,0 +1,17 @@
+from search import build_snippet
+
+def test_terms_are_not_matched_inside_entities():
+    assert build_snippet('Tom & Jerry "quoted"', 'amp quot') == 'Tom &amp; Jerry &quot;<mark>quoted</mark>&quot;'
+
+def test_markup_in_text_is_escaped_around_marks():
+    assert build_snippet('<b>Ukraine</b> report', 'ukraine') == '&lt;b&gt;<mark>Ukraine</mark>&lt;/b&gt; report'
+
+def test_window_is_cut_around_the_first_match():
+    text = "filler " * 30 + "security analysis" + " tail" * 30
+    snippet = build_snippet(text, "security", radius=20)
+    assert snippet.startswith("…") and snippet.endswith("…")
+    assert "<mark>security</mark>" in snippet
+
+def test_no_query_terms_returns_the_escaped_start():
+    assert build_snippet("a < b", "") == "a &lt; b"
+    assert build_snippet(None, "x") == ""
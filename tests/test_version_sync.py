@@ -0,0 +1,45 @@
+from database import WORKER_ID, collection_versions, faqs_crud, version_sync
+
+def test_local_write_gets_a_worker_unique_stamp_until_pushed(live_app):
+    async def scenario():
+        await version_sync.sync()
+        before = version_sync.stamp("faq")
+        faqs_crud._notify()
+        unpublished = version_sync.stamp("faq")
+        await version_sync.sync()
+        return before, unpublished, version_sync.stamp("faq")
+    before, unpublished, published = live_app.run(scenario())
+    assert WORKER_ID in unpublished and unpublished != before
+    assert published == str(int(before) + 1)
+
+def test_concurrent_writes_on_two_workers_get_distinct_counters(live_app):
+    invalidated = []
+
+    async def scenario():
+        from database import change_listeners
+        await version_sync.sync()
+        start = collection_versions["faq"]
+        change_listeners.append(invalidated.append)
+        try:
+            # Another worker pushes its write first, then this worker pushes its own
+            await version_sync.collection.find_one_and_update({"_id": "faq"}, {"$inc": {"version": 1}})
+            faqs_crud._notify()
+            invalidated.clear()
+            await version_sync.sync()
+        finally:
+            change_listeners.remove(invalidated.append)
+        return start
+    start = live_app.run(scenario())
+    # Both writes are counted, and the skipped value means a foreign write to invalidate for
+    assert version_sync.stamp("faq") == str(start + 2)
+    assert invalidated == ["faq"]
+
+def test_foreign_write_is_adopted_on_pull(live_app):
+    async def scenario():
+        await version_sync.sync()
+        before = version_sync.stamp("faq")
+        await version_sync.collection.find_one_and_update({"_id": "faq"}, {"$inc": {"version": 1}})
+        await version_sync.sync()
+        return before, version_sync.stamp("faq")
+    before, after = live_app.run(scenario())
+    assert int(after) == int(before) + 1
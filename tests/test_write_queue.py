@@ -0,0 +1,121 @@
+import asyncio
+
+import pytest
+from pymongo.errors import AutoReconnect, DocumentTooLarge
+
+from write_queue import QueueFull, SubmissionQueue
+
+class FakeCRUD:
+    """create_many stand-in: 'big' documents are rejected by the driver, 'dup' ones by the server"""
+
+    collection_name = "submissions"
+
+    def __init__(self, outages: int = 0):
+        self.outages = outages
+        self.calls = []
+        self.stored = []
+
+    async def create_many(self, docs):
+        self.calls.append([doc["id"] for doc in docs])
+        if self.outages:
+            self.outages -= 1
+            raise AutoReconnect("connection refused")
+        if any(doc.get("big") for doc in docs):
+            raise DocumentTooLarge("BSON document too large")
+        errors = [{"index": index, "message": "E11000 duplicate key error index: email_1 dup key"}
+                  for index, doc in enumerate(docs) if doc.get("dup")]
+        failed = {error["index"] for error in errors}
+        self.stored.extend(doc["id"] for index, doc in enumerate(docs) if index not in failed)
+        return {"inserted": len(docs) - len(failed), "errors": errors}
+
+def test_submit_applies_backpressure():
+    queue = SubmissionQueue(max_size=2)
+    crud = FakeCRUD()
+    assert queue.submit(crud, {"id": "given"}) == "given"
+    assert queue.submit(crud, {})  # an id is generated
+    with pytest.raises(QueueFull):
+        queue.submit(crud, {})
+    assert queue.stats()["depth"] == 2
+
+def test_drain_writes_in_batches_and_reports_latency():
+    async def scenario():
+        queue = SubmissionQueue(batch_size=2)
+        crud = FakeCRUD()
+        seen = []
+        queue.drain_listeners.append(lambda name, seconds: seen.append(name))
+        for i in range(5):
+            queue.submit(crud, {"id": str(i)})
+        return await queue.drain(), crud.calls, seen, queue.depth
+    written, calls, seen, depth = asyncio.run(scenario())
+    assert written == 5 and depth == 0
+    assert calls == [["0", "1"], ["2", "3"], ["4"]]
+    assert seen == ["submissions"] * 5
+
+def test_transient_failure_requeues_the_batch_in_order():
+    async def scenario():
+        queue = SubmissionQueue(batch_size=10)
+        crud = FakeCRUD(outages=1)
+        for i in range(3):
+            queue.submit(crud, {"id": str(i)})
+        with pytest.raises(AutoReconnect):
+            await queue.drain()
+        requeued = queue.depth, queue.retries
+        await queue.drain()
+        return requeued, crud.stored, queue.retries
+    requeued, stored, retries = asyncio.run(scenario())
+    assert requeued == (3, 1)
+    assert stored == ["0", "1", "2"] and retries == 0
+
+def test_retries_are_capped():
+    async def scenario():
+        queue = SubmissionQueue(max_retries=2)
+        crud = FakeCRUD(outages=10)
+        queue.submit(crud, {"id": "lost"})
+        for _ in range(2):
+            with pytest.raises(AutoReconnect):
+                await queue.drain()
+        await queue.drain()
+        return queue.stats()
+    stats = asyncio.run(scenario())
+    assert (stats["depth"], stats["failed"], stats["written"]) == (0, 1, 0)
+
+def test_rejected_document_is_isolated_and_dropped():
+    async def scenario():
+        queue = SubmissionQueue(batch_size=10)
+        crud = FakeCRUD()
+        for i in range(5):
+            queue.submit(crud, {"id": str(i), "big": i == 3, "dup": i == 1})
+        await queue.drain()
+        return queue.stats(), sorted(crud.stored)
+    stats, stored = asyncio.run(scenario())
+    assert stored == ["0", "2", "4"]
+    assert (stats["depth"], stats["failed"], stats["written"]) == (0, 2, 3)
+
+def test_background_task_drains_and_stop_flushes():
+    async def scenario():
+        queue = SubmissionQueue(batch_size=100, flush_interval=0.01)
+        crud = FakeCRUD()
+        queue.start()
+        queue.submit(crud, {"id": "a"})
+        await asyncio.sleep(0.05)
+        drained = list(crud.stored)
+        queue.submit(crud, {"id": "b"})
+        await queue.stop()
+        return drained, crud.stored, queue.task
+    drained, stored, task = asyncio.run(scenario())
+    assert drained == ["a"] and stored == ["a", "b"] and task is None
+
+def test_duplicate_id_counts_as_already_written():
+    class Retried(FakeCRUD):
+        async def create_many(self, docs):
+            return {"inserted": 0, "errors": [
+                {"index": 0, "message": "E11000 duplicate key error collection: db.c index: id_1 dup key: { id: \"a\" }"}
+            ]}
+
+    async def scenario():
+        queue = SubmissionQueue()
+        queue.submit(Retried(), {"id": "a"})
+        await queue.drain()
+        return queue.stats()
+    stats = asyncio.run(scenario())
+    assert (stats["written"], stats["failed"]) == (1, 0)